@@ -0,0 +1,166 @@
+"""Headless batch evaluation of estimation scenarios
+
+Usage: python batch.py SCENARIOS.jsonl [--csv effort_data.csv] [--workers N] [--modules]
+
+Each input line is one JSON scenario; every key except "id" is optional:
+
+    {"id": "lean",
+     "ratios": {"A Core": {"Kernel": {"Porting": 50}}},
+     "subsystems": {"M85": false},
+     "modules": {"A Core": {"VIO": false}},
+     "other": {"A Core": 120, "M Core": {"effort": 40, "comment": "reviews"}}}
+
+One JSON result line per scenario is written to stdout in input order, with
+the project total and per-subsystem totals (per-module totals with --modules).
+A line that is not a JSON object, holds NaN, Infinity or a number too large
+for a float, or names an unknown subsystem, module or task yields an "error"
+line; the other lines are still evaluated.
+
+The catalog is loaded once. Worker processes are forked from the loaded
+parent and share its catalog pages; where fork is unavailable each worker
+loads it once from the binary cache.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+
+from estimator import EffortEstimator
+from instrumentation import configure
+
+_estimator = None  # Catalog of this process, shared by forked workers
+
+
+def _finite_float(text):
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"number out of range: {text}")
+    return value
+
+
+def _non_finite(name):
+    raise ValueError(f"{name} is not a valid number")
+
+
+# Built once: json.loads/dumps with options build a new decoder/encoder per call
+_decoder = json.JSONDecoder(parse_float=_finite_float, parse_constant=_non_finite)
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False)
+
+
+def loads_scenarios(text):
+    """Decode scenario JSON, rejecting NaN, Infinity and numbers that only fit as infinity"""
+    try:
+        return _decoder.decode(text)
+    except RecursionError:
+        raise ValueError("nested too deeply")
+
+
+def evaluate_scenario(estimator, scenario, modules=False):
+    """Totals of an estimator with a scenario applied; the estimator is left unchanged
+
+    The scenario is evaluated as a copy-on-write overlay, so only the modules
+    it edits are recomputed and everything else comes from the base rollup.
+    Results are memoized in the estimator's scenario cache, so repeated
+    scenarios are answered without recomputing any totals.
+    """
+    result = {'id': scenario.get('id')}
+    try:
+        overlay = estimator.create_scenario(scenario)
+        totals = estimator.scenario_cache.get(overlay, _scenario_totals, modules)
+    except (KeyError, TypeError, ValueError, AttributeError, OverflowError) as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+    result.update(totals)
+    return result
+
+
+def _scenario_totals(overlay, modules=False):
+    """Project, subsystem and optionally module totals of an overlay"""
+    subsystems = overlay._estimator.subsystems
+    totals = {
+        'total': overlay.get_total_effort(),
+        'subsystems': {subsystem.name: overlay.subsystem_total(subsystem.name) for subsystem in subsystems},
+    }
+    finite = math.isfinite(totals['total']) and all(map(math.isfinite, totals['subsystems'].values()))
+    if modules:
+        totals['modules'] = {
+            subsystem.name: {module.key: overlay.module_total(subsystem.name, module.key)
+                             for module in subsystem.modules}
+            for subsystem in subsystems
+        }
+        finite = finite and all(all(map(math.isfinite, values.values())) for values in totals['modules'].values())
+    if not finite:
+        raise OverflowError("total out of range")
+    return totals
+
+
+def _init_worker(csv_file_path):
+    global _estimator
+    if _estimator is None:
+        # Not forked from a loaded parent
+        _estimator = EffortEstimator(csv_file_path, cache=True)
+
+
+def _evaluate_line(line, modules=False):
+    """Parse, evaluate and serialize one input line in the worker"""
+    try:
+        scenario = loads_scenarios(line)
+        if not isinstance(scenario, dict):
+            raise ValueError("scenario must be a JSON object")
+    except ValueError as e:
+        return json.dumps({'id': None, 'error': f"invalid scenario: {e}"}, ensure_ascii=False)
+    return _encoder.encode(evaluate_scenario(_estimator, scenario, modules))
+
+
+def _evaluate_line_with_modules(line):
+    return _evaluate_line(line, modules=True)
+
+
+def run_batch(csv_file_path, lines, output, workers=None, modules=False, chunksize=256):
+    """Evaluate JSONL scenario lines and write one result line each, in input order"""
+    global _estimator
+    _estimator = EffortEstimator(csv_file_path, cache=True)
+    lines = (line for line in lines if line.strip())
+    evaluate = _evaluate_line_with_modules if modules else _evaluate_line
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for line in lines:
+            output.write(evaluate(line) + "\n")
+        return
+
+    import multiprocessing
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        # Keep the collector from touching shared catalog objects in the children
+        gc.freeze()
+    else:
+        context = multiprocessing.get_context()
+    with context.Pool(workers, initializer=_init_worker, initargs=(csv_file_path,)) as pool:
+        for result in pool.imap(evaluate, lines, chunksize):
+            output.write(result + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', help="JSONL file of scenarios, or - for stdin")
+    parser.add_argument('--csv', default="effort_data.csv", help="catalog CSV")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count, 1 evaluates in-process)")
+    parser.add_argument('--modules', action='store_true', help="include per-module totals")
+    parser.add_argument('--profile', help="write hot-path timings here at exit (.trace.json: Chrome trace)")
+    args = parser.parse_args(argv)
+    configure(args.profile)
+
+    if args.scenarios == '-':
+        run_batch(args.csv, sys.stdin, sys.stdout, args.workers, args.modules)
+    else:
+        with open(args.scenarios, 'r', encoding='utf-8') as file:
+            run_batch(args.csv, file, sys.stdout, args.workers, args.modules)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
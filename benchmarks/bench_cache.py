@@ -0,0 +1,55 @@
+"""Cold-start comparison: CSV parsing vs. the binary catalog cache
+
+Usage: python benchmarks/bench_cache.py [--tasks N]
+
+Times three ways of getting a usable model from a synthetic catalog:
+parsing the CSV into an estimator, building the estimator from a warm
+cache, and opening columnar arrays straight over the cache (needs numpy).
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from catalog_cache import open_catalog_cache
+from estimator import EffortEstimator, read_csv_rows
+from synthetic import write_catalog
+
+
+def timed(label, func):
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}{time.perf_counter() - start:>10.3f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=500000, help="synthetic catalog size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_catalog(os.path.join(tmp, 'catalog.csv'), args.tasks)
+        print(f"{args.tasks} tasks, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'scenario':<28}{'seconds':>10}")
+
+        timed("csv -> estimator", lambda: EffortEstimator(path))
+        timed("build cache", lambda: open_catalog_cache(path, lambda: read_csv_rows(path)).close())
+        timed("cache -> estimator", lambda: EffortEstimator(path, cache=True))
+        try:
+            from columnar import TaskColumns
+        except ImportError:
+            print("numpy not installed, skipping columnar scenario")
+            return
+        cache = timed("open cache (mmap)", lambda: open_catalog_cache(path, lambda: read_csv_rows(path)))
+        columns = timed("cache -> columns", lambda: TaskColumns.from_cache(cache))
+        timed("columns total", columns.get_total_effort)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare the streaming CSV loader with the previous DictReader loader
+
+Usage: python benchmarks/bench_loader.py [--tasks N] [--repeat R]
+
+Both loaders feed the same EffortEstimator.load_rows(), so the difference is
+the ingestion pipeline only. Reports wall time and tracemalloc peak memory.
+The peak is set by the model being built, so both loaders reach about the
+same peak; the streaming loader is a speed improvement.
+"""
+import argparse
+import csv
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from estimator import EffortEstimator, read_csv_rows
+from synthetic import write_catalog
+
+
+def dictreader_rows(csv_file_path):
+    """Previous loader: one dict per row through csv.DictReader"""
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file,
+                                quoting=csv.QUOTE_MINIMAL,
+                                quotechar='"',
+                                skipinitialspace=True)
+        for row in reader:
+            yield (
+                row['subsystem'].strip(),
+                row['module'].strip(),
+                row['task'].strip(),
+                float(row['effort']),
+                row['description'].strip(),
+            )
+
+
+def measure(load, repeat):
+    """Return (best seconds, peak bytes) for a loader"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    estimator = load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del estimator
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=200000, help="synthetic catalog size")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per loader")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_catalog(os.path.join(tmp, 'catalog.csv'), args.tasks)
+        size_mb = os.path.getsize(path) / 1e6
+
+        def load_legacy():
+            estimator = EffortEstimator()
+            estimator.load_rows(dictreader_rows(path))
+            return estimator
+
+        def load_streaming():
+            return EffortEstimator(path)
+
+        print(f"{args.tasks} tasks, {size_mb:.1f} MB")
+        print(f"{'loader':<12}{'seconds':>10}{'peak MB':>10}")
+        for name, load in (("dictreader", load_legacy), ("streaming", load_streaming)):
+            seconds, peak = measure(load, args.repeat)
+            print(f"{name:<12}{seconds:>10.3f}{peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Memory per task of a loaded catalog: tracemalloc and resident set size
+
+Usage: python benchmarks/bench_memory.py [--tasks N]
+
+Each loading mode runs in a fresh interpreter against a synthetic catalog
+(the binary cache is built beforehand): parsing the CSV, loading from the
+cache, and loading from the cache with lazy task descriptions. Reported are
+Python allocations still live after the load (tracemalloc, measured in one
+child) and resident set growth (measured in another child, without
+tracemalloc), both divided by the number of tasks. Run it on an older
+revision for before/after figures; modes that revision lacks report n/a.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, REPO)
+
+from synthetic import write_catalog
+
+MODES = {
+    'csv': {},
+    'cache': {'cache': True},
+    'cache, lazy descriptions': {'cache': True, 'lazy_descriptions': True},
+}
+
+# Run in a child interpreter; prints bytes and seconds as JSON
+CHILD = """
+import gc, json, os, sys, time
+from estimator import EffortEstimator
+path, options, traced = sys.argv[1], json.loads(sys.argv[2]), sys.argv[3] == 'traced'
+
+def rss():
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+gc.collect()
+if traced:
+    import tracemalloc
+    tracemalloc.start()
+else:
+    before = rss()
+start = time.perf_counter()
+try:
+    estimator = EffortEstimator(path, **options)
+except TypeError:
+    print(json.dumps(None))  # Mode not supported by this revision
+    sys.exit()
+seconds = time.perf_counter() - start
+gc.collect()
+used = tracemalloc.get_traced_memory()[0] if traced else rss() - before
+tasks = sum(len(module.tasks) for subsystem in estimator.subsystems for module in subsystem.modules)
+print(json.dumps({'bytes': used, 'tasks': tasks, 'seconds': seconds}))
+"""
+
+
+def run_child(path, options, traced):
+    result = subprocess.run([sys.executable, '-c', CHILD, path, json.dumps(options),
+                             'traced' if traced else 'rss'],
+                            cwd=REPO, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None  # e.g. no /proc for RSS on this platform
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=200000, help="synthetic catalog size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_catalog(os.path.join(tmp, 'catalog.csv'), args.tasks)
+        run_child(path, {'cache': True}, traced=False)  # Build the binary cache
+        print(f"{args.tasks} tasks, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'mode':<28}{'traced B/task':>15}{'RSS B/task':>12}{'seconds':>10}")
+        for name, options in MODES.items():
+            traced = run_child(path, options, traced=True)
+            resident = run_child(path, options, traced=False)
+
+            def per_task(result):
+                return f"{result['bytes'] / result['tasks']:.0f}" if result else "n/a"
+
+            seconds = f"{resident['seconds']:.3f}" if resident else "n/a"
+            print(f"{name:<28}{per_task(traced):>15}{per_task(resident):>12}{seconds:>10}")
+
+
+if __name__ == "__main__":
+    main()
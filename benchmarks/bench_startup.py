@@ -0,0 +1,94 @@
+"""Startup cost: module import time and time to the first interactive window
+
+Usage: python benchmarks/bench_startup.py [--tasks N] [--repeat R]
+
+Import time comes from `python -X importtime -c "import estimator"` and also
+lists which heavy optional modules (matplotlib, numpy, tkinter) were pulled in
+at import. Time to first window is measured in a fresh interpreter from process
+start until create_ui() has returned and the window has been drawn once; it is
+skipped when Tk cannot open a display.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, REPO)
+
+from synthetic import write_catalog
+
+HEAVY_MODULES = ('matplotlib', 'numpy', 'tkinter')
+
+# Run in a child interpreter; prints the modules loaded once the window is up
+FIRST_WINDOW = """
+import sys
+from estimator import EffortEstimator
+estimator = EffortEstimator(sys.argv[1], cache=sys.argv[2] == 'cache')
+estimator.create_ui()
+estimator.root.update()
+print(' '.join(name for name in {heavy!r} if name in sys.modules), flush=True)
+estimator.root.destroy()
+"""
+
+
+def import_time():
+    """Cumulative import time of estimator in microseconds, and heavy modules imported"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import estimator'],
+                            cwd=REPO, capture_output=True, text=True, check=True)
+    cumulative, loaded = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = [field.strip() for field in line[len('import time:'):].split('|')]
+        if not fields[1].isdigit():
+            continue  # Column header
+        name = fields[2]
+        loaded.add(name.split('.')[0])
+        if name == 'estimator':
+            cumulative = int(fields[1])
+    return cumulative, sorted(loaded.intersection(HEAVY_MODULES))
+
+
+def first_window(csv_file_path, cache):
+    """Seconds from interpreter launch to a drawn main window, or None without a display"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_WINDOW.format(heavy=HEAVY_MODULES), csv_file_path,
+         'cache' if cache else 'csv'],
+        cwd=REPO, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        if 'TclError' in result.stderr:
+            return None, []
+        raise RuntimeError(result.stderr)
+    return elapsed, result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=2000, help="synthetic catalog size")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per scenario, best is reported")
+    args = parser.parse_args()
+
+    runs = [import_time() for _ in range(args.repeat)]
+    cumulative, loaded = min(runs)
+    print(f"import estimator: {cumulative / 1000:.1f} ms, "
+          f"heavy modules: {', '.join(loaded) or 'none'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_catalog(os.path.join(tmp, 'catalog.csv'), args.tasks)
+        for cache in (False, True):
+            label = f"first window ({'cache' if cache else 'csv'}, {args.tasks} tasks)"
+            runs = [first_window(path, cache) for _ in range(args.repeat)]
+            if runs[0][0] is None:
+                print(f"{label}: skipped, no display")
+                continue
+            elapsed, loaded = min(runs)
+            print(f"{label}: {elapsed:.3f} s, heavy modules: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Load generator for server.py: throughput and latency percentiles over localhost
+
+Usage: python benchmarks/load_server.py [--connections C] [--pipeline P] [--requests N]
+                                        [--port PORT] [--tasks T]
+
+Without --port a server is started on a synthetic catalog of T tasks and
+stopped afterwards. Each connection keeps P requests in flight (HTTP/1.1
+pipelining over one keep-alive socket) until N requests have completed in
+total. Every request is a POST /evaluate with a random single-task ratio
+scenario.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, REPO)
+
+from estimator import read_csv_rows
+from synthetic import write_catalog
+
+
+def make_requests(csv_file_path, count, seed=0):
+    """Encoded POST /evaluate requests, each changing one task's ratio"""
+    rng = random.Random(seed)
+    tasks = [row[:3] for row in read_csv_rows(csv_file_path)]
+    requests = []
+    for i in range(count):
+        subsystem, module, task = rng.choice(tasks)
+        body = json.dumps({'id': i, 'ratios': {subsystem: {module: {task: rng.choice([0, 25, 60])}}}})
+        body = body.encode('utf-8')
+        requests.append(b"POST /evaluate HTTP/1.1\r\nHost: localhost\r\n"
+                        b"Content-Type: application/json\r\n"
+                        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+    return requests
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = 0
+    for line in head.split(b'\r\n'):
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+    body = await reader.readexactly(length)
+    if not head.startswith(b'HTTP/1.1 200'):
+        raise RuntimeError(body.decode('utf-8', 'replace'))
+
+
+async def run_connection(host, port, requests, pipeline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = []  # Send times of requests in flight, oldest first
+    queue = iter(requests)
+
+    def send():
+        request = next(queue, None)
+        if request is not None:
+            sent.append(time.perf_counter())
+            writer.write(request)
+
+    for _ in range(pipeline):
+        send()
+    while sent:
+        await writer.drain()
+        await read_response(reader)
+        latencies.append(time.perf_counter() - sent.pop(0))
+        send()
+    writer.close()
+
+
+async def run_load(host, port, requests, connections, pipeline):
+    latencies = []
+    shares = [requests[i::connections] for i in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(host, port, share, pipeline, latencies) for share in shares))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def wait_for_port(host, port, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="existing server (default: start one)")
+    parser.add_argument('--csv', default=None, help="catalog used for request scenarios")
+    parser.add_argument('--tasks', type=int, default=10000, help="synthetic catalog size")
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--pipeline', type=int, default=8, help="requests in flight per connection")
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file_path = args.csv or write_catalog(os.path.join(tmp, 'catalog.csv'), args.tasks)
+        requests = make_requests(csv_file_path, args.requests)
+        server = None
+        port = args.port
+        if port is None:
+            with socket.socket() as probe:
+                probe.bind((args.host, 0))
+                port = probe.getsockname()[1]
+            server = subprocess.Popen(
+                [sys.executable, os.path.join(REPO, 'server.py'), '--csv', csv_file_path,
+                 '--host', args.host, '--port', str(port)], stdout=subprocess.DEVNULL)
+        try:
+            if server is not None:
+                wait_for_port(args.host, port, server)
+            elapsed, latencies = asyncio.run(
+                run_load(args.host, port, requests, args.connections, args.pipeline))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+    print(f"{len(latencies)} requests, {args.connections} connections x {args.pipeline} pipelined")
+    print(f"throughput {len(latencies) / elapsed:.0f} req/s, latency p50 {percentile(50):.2f} ms, "
+          f"p99 {percentile(99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
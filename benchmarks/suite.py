@@ -0,0 +1,251 @@
+"""Benchmark suite: timed estimator scenarios over synthetic catalogs, as JSON
+
+Usage: python benchmarks/suite.py [--tasks N [N ...]] [--repeat R] [--output FILE]
+                                  [--compare BASELINE] [--threshold T] [--no-ui]
+
+For every catalog size a synthetic catalog is generated (see synthetic.py)
+and these scenarios are timed; each reports the best and mean seconds per
+operation over R runs:
+
+    load_csv            load_data_from_csv, parsing the CSV
+    load_cache          load_data_from_csv with a warm binary cache
+    total_full          get_total_effort after invalidating every cached total
+    total_cached        get_total_effort with nothing changed
+    toggle_module       store module switch + get_total_effort (the per-click model path)
+    set_ratio           store task ratio + get_total_effort
+    display_summary     display_summary, printing to a discarded stream
+    tree_load           EffortTree.from_csv of a five-level path-style catalog
+    tree_set_effort     task effort edit + project total in that tree
+    tree_toggle         switch of a non-task node at any depth + project total
+    tree_subtree_total  total of a random non-task node
+    ui_toggle_module    toggle_module + Tk update, labels included      (needs Tk)
+                        also checks the worst change-to-labels latency
+                        against EffortEstimator.UI_LATENCY_TARGET
+    ui_get_summary      get_summary + Tk update, every label refreshed  (needs Tk)
+
+Results are written as JSON (to stdout, or FILE with --output). With
+--compare, scenarios more than T times slower than in a baseline file are
+listed and the exit status is 1, so the suite can gate releases. The exit
+status is 1 as well when ui_toggle_module misses the latency target. Tk
+scenarios are skipped with --no-ui or when no display is available; run the
+suite under a virtual display (e.g. xvfb-run) to include them.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from estimator import EffortEstimator
+from hierarchy import EffortTree
+from synthetic import write_catalog, write_path_catalog
+
+OPERATIONS = 100  # Operations per timed run of the per-click scenarios
+
+
+def measure(func, repeat, number=1, setup=None):
+    """Best and mean seconds per call of func over repeat runs of number calls"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {'best': min(times), 'mean': sum(times) / len(times), 'runs': repeat, 'number': number}
+
+
+def click_targets(estimator, seed=0):
+    """Random (subsystem, module, task) targets for the per-click scenarios"""
+    rng = random.Random(seed)
+    modules = [module for subsystem in estimator.subsystems for module in subsystem.modules
+               if module.tasks]
+    picks = [rng.choice(modules) for _ in range(OPERATIONS)]
+    return [(module._subsystem.name, module.key, rng.choice(module.tasks).name) for module in picks]
+
+
+def model_scenarios(path, repeat):
+    """Headless scenarios; returns {name: timing}"""
+    results = {}
+    results['load_csv'] = measure(lambda: EffortEstimator().load_data_from_csv(path), repeat)
+    EffortEstimator(path, cache=True)  # Build the cache once
+    results['load_cache'] = measure(lambda: EffortEstimator().load_data_from_csv(path, cache=True), repeat)
+
+    estimator = EffortEstimator(path, cache=True)
+    results['total_full'] = measure(estimator.get_total_effort, repeat,
+                                    setup=estimator.rollup.invalidate_all)
+    results['total_cached'] = measure(estimator.get_total_effort, repeat, number=OPERATIONS)
+
+    store = estimator.store
+    targets = iter(click_targets(estimator) * (2 * repeat))
+
+    def toggle_module():
+        subsystem_name, module_name, _ = next(targets)
+        enabled = estimator._is_module_enabled(subsystem_name, module_name)
+        store.set_module_state(subsystem_name, module_name, not enabled)
+        estimator.get_total_effort()
+    results['toggle_module'] = measure(toggle_module, repeat, number=OPERATIONS)
+
+    ratios = iter([25, 60, 0, 100] * (repeat * OPERATIONS))
+    targets = iter(click_targets(estimator, seed=1) * repeat)
+
+    def set_ratio():
+        store.set_ratio(*next(targets), next(ratios))
+        estimator.get_total_effort()
+    results['set_ratio'] = measure(set_ratio, repeat, number=OPERATIONS)
+
+    def display_summary():
+        with contextlib.redirect_stdout(io.StringIO()):
+            estimator.display_summary()
+    results['display_summary'] = measure(display_summary, repeat)
+    return results
+
+
+def tree_scenarios(path, repeat):
+    """Arbitrary-depth tree scenarios; returns {name: timing}"""
+    results = {'tree_load': measure(lambda: EffortTree.from_csv(path), repeat)}
+    tree = EffortTree.from_csv(path)
+    rng = random.Random(0)
+    tasks = [node for node in range(len(tree)) if tree.is_task(node)]
+    groups = [node for node in range(1, len(tree)) if not tree.is_task(node)]
+    edits = iter([(rng.choice(tasks), rng.randint(1, 200)) for _ in range(OPERATIONS * repeat)])
+
+    def set_effort():
+        tree.set_effort(*next(edits))
+        tree.total()
+    results['tree_set_effort'] = measure(set_effort, repeat, number=OPERATIONS)
+
+    switches = iter([rng.choice(groups) for _ in range(OPERATIONS * repeat)])
+
+    def toggle():
+        node = next(switches)
+        tree.set_enabled(node, not tree.enabled[node])
+        tree.total()
+    results['tree_toggle'] = measure(toggle, repeat, number=OPERATIONS)
+
+    queries = iter([rng.choice(groups) for _ in range(OPERATIONS * repeat)])
+    results['tree_subtree_total'] = measure(lambda: tree.total(next(queries)), repeat, number=OPERATIONS)
+    return results
+
+
+def ui_scenarios(path, repeat):
+    """Tk scenarios; returns {name: timing}, or None when Tk cannot open a display"""
+    import tkinter as tk
+
+    estimator = EffortEstimator(path, cache=True)
+    try:
+        estimator.create_ui()
+    except tk.TclError:
+        return None
+    try:
+        root = estimator.root
+        targets = iter(click_targets(estimator) * (2 * repeat))
+
+        def toggle_module():
+            subsystem_name, module_name, _ = next(targets)
+            enabled = estimator._is_module_enabled(subsystem_name, module_name)
+            estimator.toggle_module(subsystem_name, module_name, not enabled)
+            root.update()  # Runs the idle-time label flush
+
+        def get_summary():
+            estimator.get_summary()
+            root.update()
+        estimator.max_ui_latency = 0.0
+        toggles = measure(toggle_module, repeat, number=OPERATIONS)
+        toggles.update(max_latency=estimator.max_ui_latency, latency_target=estimator.UI_LATENCY_TARGET,
+                       within_target=estimator.max_ui_latency <= estimator.UI_LATENCY_TARGET)
+        return {
+            'ui_toggle_module': toggles,
+            'ui_get_summary': measure(get_summary, repeat),
+        }
+    finally:
+        estimator.root.destroy()
+
+
+def compare(results, baseline, threshold):
+    """Scenarios slower than threshold times their baseline, as (scenario, tasks, ratio)"""
+    previous = {(entry['scenario'], entry['tasks']): entry['best'] for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry['scenario'], entry['tasks']))
+        if before and entry['best'] / before > threshold:
+            regressions.append((entry['scenario'], entry['tasks'], entry['best'] / before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[10000, 100000],
+                        help="synthetic catalog sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per scenario")
+    parser.add_argument('--output', help="write JSON results here instead of stdout")
+    parser.add_argument('--compare', help="baseline JSON results to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="slowdown factor against the baseline that counts as a regression")
+    parser.add_argument('--no-ui', action='store_true', help="skip the Tk scenarios")
+    args = parser.parse_args()
+
+    results = []
+    skipped = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for tasks in args.tasks:
+            path = write_catalog(os.path.join(tmp, f'catalog_{tasks}.csv'), tasks)
+            timings = model_scenarios(path, args.repeat)
+            tree_path = write_path_catalog(os.path.join(tmp, f'tree_{tasks}.csv'), tasks)
+            timings.update(tree_scenarios(tree_path, args.repeat))
+            if args.no_ui:
+                skipped.append({'tasks': tasks, 'reason': "--no-ui"})
+            else:
+                ui = ui_scenarios(path, args.repeat)
+                if ui is None:
+                    skipped.append({'tasks': tasks, 'reason': "no display"})
+                else:
+                    timings.update(ui)
+            for scenario, timing in timings.items():
+                results.append({'scenario': scenario, 'tasks': tasks, **timing})
+                print(f"{scenario:<20}{tasks:>10}{timing['best'] * 1000:>12.4f} ms", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'repeat': args.repeat,
+        'results': results,
+        'skipped': skipped,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    failed = False
+    for entry in results:
+        if entry.get('within_target') is False:
+            print(f"latency: {entry['scenario']} at {entry['tasks']} tasks took up to "
+                  f"{entry['max_latency'] * 1000:.1f} ms (target {entry['latency_target'] * 1000:.0f} ms)",
+                  file=sys.stderr)
+            failed = True
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for scenario, tasks, ratio in regressions:
+            print(f"regression: {scenario} at {tasks} tasks is {ratio:.2f}x slower", file=sys.stderr)
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Synthetic catalog generator for benchmarks
+
+Usage: python benchmarks/synthetic.py OUTPUT.csv [--tasks N] [--modules-per-subsystem M]
+                                     [--tasks-per-module T] [--estimates] [--seed S]
+                                     [--depth D [--fanout F]]
+
+With --depth, a path-style catalog (see hierarchy.py) is written instead,
+with D levels of F children each above the tasks.
+
+Rows are generated and written one at a time, so catalogs of millions of
+tasks need no more memory than small ones.
+"""
+import argparse
+import csv
+import random
+
+TASK_NAMES = ["Design", "Development", "QA", "Release", "Integration", "Documentation"]
+
+
+def iter_catalog_rows(tasks, modules_per_subsystem=25, tasks_per_module=4, seed=0):
+    """Yield (subsystem, module, task, effort, description) rows for a synthetic catalog"""
+    rng = random.Random(seed)
+    tasks_per_subsystem = modules_per_subsystem * tasks_per_module
+    for i in range(tasks):
+        subsystem = f"Subsystem {i // tasks_per_subsystem}"
+        module = f"Module {i // tasks_per_module % modules_per_subsystem}"
+        task_index = i % tasks_per_module
+        # Repeat the usual task names, numbering them once they run out
+        task = TASK_NAMES[task_index] if task_index < len(TASK_NAMES) else f"Task {task_index}"
+        effort = rng.randint(1, 200)
+        yield subsystem, module, task, effort, f"{task} work for {subsystem} / {module}"
+
+
+def iter_path_rows(tasks, depth=5, fanout=10, tasks_per_node=4, seed=0):
+    """Yield (path, effort, description) rows for a catalog with depth levels above the tasks"""
+    rng = random.Random(seed)
+    for i in range(tasks):
+        group = i // tasks_per_node
+        levels = []
+        for level in range(depth, 0, -1):
+            # The top level takes whatever the lower levels do not hold
+            index = group if level == 1 else group % fanout
+            group //= fanout
+            levels.append(f"Level {level}.{index}")
+        levels.reverse()
+        task_index = i % tasks_per_node
+        task = TASK_NAMES[task_index] if task_index < len(TASK_NAMES) else f"Task {task_index}"
+        yield "/".join(levels + [task]), rng.randint(1, 200), f"{task} work for {levels[-1]}"
+
+
+def write_path_catalog(path, tasks, **kwargs):
+    """Write a synthetic path-style catalog CSV (path, effort, description)"""
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["path", "effort", "description"])
+        writer.writerows(iter_path_rows(tasks, **kwargs))
+    return path
+
+
+def write_catalog(path, tasks, estimates=False, **kwargs):
+    """Write a synthetic catalog CSV in the effort_data.csv format
+
+    With estimates=True, optimistic/most_likely/pessimistic columns are added
+    around each task's effort.
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        header = ["subsystem", "module", "task", "effort", "description"]
+        if not estimates:
+            writer.writerow(header)
+            writer.writerows(iter_catalog_rows(tasks, **kwargs))
+            return path
+        writer.writerow(header + ["optimistic", "most_likely", "pessimistic"])
+        for row in iter_catalog_rows(tasks, **kwargs):
+            effort = row[3]
+            writer.writerow(row + (round(effort * 0.7, 1), effort, round(effort * 1.8, 1)))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help="CSV file to write")
+    parser.add_argument('--tasks', type=int, default=100000, help="number of task rows")
+    parser.add_argument('--modules-per-subsystem', type=int, default=25)
+    parser.add_argument('--tasks-per-module', type=int, default=4)
+    parser.add_argument('--estimates', action='store_true',
+                        help="add optimistic/most_likely/pessimistic columns")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, help="write a path-style catalog with this many levels above tasks")
+    parser.add_argument('--fanout', type=int, default=10, help="children per level of a path-style catalog")
+    args = parser.parse_args()
+    if args.depth:
+        write_path_catalog(args.output, args.tasks, depth=args.depth, fanout=args.fanout,
+                           tasks_per_node=args.tasks_per_module, seed=args.seed)
+        return
+    write_catalog(args.output, args.tasks, estimates=args.estimates,
+                  modules_per_subsystem=args.modules_per_subsystem,
+                  tasks_per_module=args.tasks_per_module, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Binary, memory-mappable cache of a parsed catalog CSV
+
+The cache sits next to the CSV (effort_data.csv -> effort_data.csv.eecache) and
+holds the catalog in hierarchy order:
+
+    header        magic, version, CSV path/size/mtime and content hash, counts
+    string table  uint64 offsets + one UTF-8 blob; every name is stored once
+    subsystems    name id, offset of first module
+    modules       name id, offset of first task
+    tasks         name id, description id, float64 effort column
+
+A cache is reused while the CSV's path, size and mtime match. When only the
+mtime changed (file touched or rewritten with the same bytes) the content hash
+decides, so identical content never triggers a rebuild. Anything else rebuilds
+the cache automatically.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+CACHE_SUFFIX = '.eecache'
+MAGIC = b'EECACHE1'
+VERSION = 1
+# magic, version, byte order, CSV size, CSV mtime (ns), content hash, path length,
+# string/subsystem/module/task counts
+HEADER = struct.Struct('<8sII Qq 32s I IIII')
+BYTE_ORDER = 0 if sys.byteorder == 'little' else 1
+
+
+def cache_path_for(csv_file_path):
+    return csv_file_path + CACHE_SUFFIX
+
+
+def file_digest(path):
+    """Content hash of a file, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+class StringColumn:
+    """Sequence of strings decoded on demand from the cache's string table"""
+    def __init__(self, cache, ids):
+        self._cache = cache
+        self._ids = ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        return self._cache.string(self._ids[index])
+
+    def __iter__(self):
+        string = self._cache.string
+        return (string(i) for i in self._ids)
+
+
+class CatalogCache:
+    """Read-only view of a cache file through mmap"""
+    def __init__(self, cache_path):
+        self.path = cache_path
+        with open(cache_path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    def _parse(self):
+        # The sections below keep their own views; this one must not outlive parsing,
+        # or a failed parse could not close the map
+        with memoryview(self._mmap) as buffer:
+            self._parse_sections(buffer)
+
+    def _parse_sections(self, buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError("truncated catalog cache")
+        (magic, version, byte_order, self.csv_size, self.csv_mtime_ns, self.digest,
+         path_length, n_strings, n_subsystems, n_modules, n_tasks) = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION or byte_order != BYTE_ORDER:
+            raise ValueError("incompatible catalog cache")
+
+        offset = HEADER.size
+        self.csv_path = bytes(buffer[offset:offset + path_length]).decode('utf-8')
+        offset = _align(offset + path_length)
+
+        def take(typecode, count):
+            nonlocal offset
+            size = count * struct.calcsize(typecode)
+            if offset + size > len(buffer):
+                raise ValueError("truncated catalog cache")
+            view = buffer[offset:offset + size].cast(typecode)
+            offset = _align(offset + size)
+            return view
+
+        self._string_offsets = take('Q', n_strings + 1)
+        self._blob = take('B', self._string_offsets[-1] if n_strings else 0)
+        self.subsystem_names = take('I', n_subsystems)
+        self.subsystem_modules = take('I', n_subsystems + 1)
+        self.module_names = take('I', n_modules)
+        self.module_tasks = take('I', n_modules + 1)
+        self.task_names = take('I', n_tasks)
+        self.task_descriptions = take('I', n_tasks)
+        self.effort_offset = offset  # Byte offset of the effort column, for zero-copy arrays
+        self.effort = take('d', n_tasks)
+        self._strings = [None] * n_strings
+
+    @property
+    def task_count(self):
+        return len(self.task_names)
+
+    def string(self, index):
+        """Decode an interned string once; later lookups share the same object"""
+        value = self._strings[index]
+        if value is None:
+            value = self._strings[index] = sys.intern(self._decode(index))
+        return value
+
+    def _decode(self, index):
+        return str(self._blob[self._string_offsets[index]:self._string_offsets[index + 1]], 'utf-8')
+
+    @property
+    def buffer(self):
+        """The underlying mmap, for zero-copy array views"""
+        return self._mmap
+
+    def matches(self, csv_file_path, stat):
+        """True when the cache was built from this exact path, size and mtime"""
+        return (self.csv_path == os.path.abspath(csv_file_path)
+                and self.csv_size == stat.st_size
+                and self.csv_mtime_ns == stat.st_mtime_ns)
+
+    def rows(self, descriptions=True):
+        """Yield (subsystem, module, task, effort, description) tuples in hierarchy order
+
+        With descriptions=False every description is None.
+        """
+        string, decode = self.string, self._decode
+        # Equal descriptions and efforts share one object, without interning descriptions for good
+        decoded = {}
+        efforts = {}
+        for s in range(len(self.subsystem_names)):
+            subsystem_name = string(self.subsystem_names[s])
+            for m in range(self.subsystem_modules[s], self.subsystem_modules[s + 1]):
+                module_name = string(self.module_names[m])
+                for t in range(self.module_tasks[m], self.module_tasks[m + 1]):
+                    description = None
+                    if descriptions:
+                        description_id = self.task_descriptions[t]
+                        description = decoded.get(description_id)
+                        if description is None:
+                            description = decoded[description_id] = decode(description_id)
+                    effort = self.effort[t]
+                    yield (subsystem_name, module_name, string(self.task_names[t]),
+                           efforts.setdefault(effort, effort), description)
+
+    def close(self):
+        # Drop exported views before closing the map
+        for name in ('_string_offsets', '_blob', 'subsystem_names', 'subsystem_modules',
+                     'module_names', 'module_tasks', 'task_names', 'task_descriptions', 'effort'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+
+class LazyDescriptions:
+    """Task descriptions left in an open cache and decoded when read
+
+    Holds one cache row number per estimator node (4 bytes) instead of a
+    string per task. The cache stays mapped for as long as tasks refer to it.
+    """
+    def __init__(self, cache, first_node):
+        self._cache = cache
+        self._first_node = first_node  # ID of the first node created by the lazy load
+        self._rows = array('I')  # Node ID - first_node -> cache task row
+
+    def index(self, nodes):
+        """Number the tasks created by the load in cache order, which is the order rows() yielded them"""
+        self._rows = array('I', bytes(4 * (len(nodes) - self._first_node)))
+        row = 0
+        for node_id in range(self._first_node, len(nodes)):
+            if getattr(type(nodes[node_id]), '_descriptions', None) is self:
+                self._rows[node_id - self._first_node] = row
+                row += 1
+
+    def description(self, node_id):
+        cache = self._cache
+        return cache._decode(cache.task_descriptions[self._rows[node_id - self._first_node]])
+
+
+def write_catalog_cache(cache_path, csv_file_path, rows, stat=None, digest=None):
+    """Write the cache for a CSV from its parsed rows; the file is replaced atomically"""
+    stat = stat or os.stat(csv_file_path)
+    digest = digest or file_digest(csv_file_path)
+
+    # Group rows into hierarchy order, keeping first-appearance order at every level
+    hierarchy = {}
+    for subsystem_name, module_name, task_name, effort, description in rows:
+        hierarchy.setdefault(subsystem_name, {}).setdefault(module_name, []).append(
+            (task_name, effort, description))
+
+    string_ids = {}
+    blob = bytearray()
+    string_offsets = array('Q', [0])
+
+    def intern_string(value):
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(string_offsets) - 1
+            blob.extend(value.encode('utf-8'))
+            string_offsets.append(len(blob))
+        return index
+
+    subsystem_names, subsystem_modules = array('I'), array('I', [0])
+    module_names, module_tasks = array('I'), array('I', [0])
+    task_names, task_descriptions, effort = array('I'), array('I'), array('d')
+    for subsystem_name, modules in hierarchy.items():
+        subsystem_names.append(intern_string(subsystem_name))
+        for module_name, tasks in modules.items():
+            module_names.append(intern_string(module_name))
+            for task_name, task_effort, description in tasks:
+                task_names.append(intern_string(task_name))
+                task_descriptions.append(intern_string(description))
+                effort.append(task_effort)
+            module_tasks.append(len(task_names))
+        subsystem_modules.append(len(module_names))
+
+    path_bytes = os.path.abspath(csv_file_path).encode('utf-8')
+    header = HEADER.pack(MAGIC, VERSION, BYTE_ORDER, stat.st_size, stat.st_mtime_ns, digest,
+                         len(path_bytes), len(string_offsets) - 1, len(subsystem_names),
+                         len(module_names), len(task_names))
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        def write_aligned(data):
+            file.write(data)
+            file.write(b'\0' * (_align(file.tell()) - file.tell()))
+
+        file.write(header)
+        write_aligned(path_bytes)
+        for section in (string_offsets, blob, subsystem_names, subsystem_modules, module_names,
+                        module_tasks, task_names, task_descriptions, effort):
+            write_aligned(bytes(section) if isinstance(section, bytearray) else section.tobytes())
+    os.replace(temp_path, cache_path)
+
+
+def open_catalog_cache(csv_file_path, read_rows, cache_path=None):
+    """Return a CatalogCache for a CSV, rebuilding it from read_rows() when stale"""
+    cache_path = cache_path or cache_path_for(csv_file_path)
+    stat = os.stat(csv_file_path)
+
+    try:
+        cache = CatalogCache(cache_path)
+    except (OSError, ValueError):
+        cache = None  # Missing, truncated or from another version
+
+    digest = None
+    if cache is not None:
+        if cache.matches(csv_file_path, stat):
+            return cache
+        # Same size at the same path: only a content change warrants a rebuild
+        if cache.csv_path == os.path.abspath(csv_file_path) and cache.csv_size == stat.st_size:
+            digest = file_digest(csv_file_path)
+            if digest == cache.digest:
+                cache.close()
+                _update_cache_mtime(cache_path, stat)
+                return CatalogCache(cache_path)
+        cache.close()
+
+    write_catalog_cache(cache_path, csv_file_path, read_rows(), stat=stat, digest=digest)
+    return CatalogCache(cache_path)
+
+
+def _update_cache_mtime(cache_path, stat):
+    """Record a new CSV mtime in place after the content hash matched"""
+    with open(cache_path, 'r+b') as file:
+        fields = list(HEADER.unpack(file.read(HEADER.size)))
+        fields[4] = stat.st_mtime_ns
+        file.seek(0)
+        file.write(HEADER.pack(*fields))
@@ -0,0 +1,158 @@
+"""Catalogs split across several CSV files (shards), loaded in parallel
+
+A catalog path naming a directory (all *.csv files in it) or a glob pattern
+(e.g. catalogs/*-lines.csv) is a sharded catalog. Shards are read in sorted
+path order, each in file order, so the merged hierarchy is the same however
+many processes parse them: subsystems, modules and tasks appear in the order
+they are first seen. A subsystem or module may span shards, but a
+(subsystem, module, task) key defined in two different shards is a conflict
+and fails the load; duplicates inside one shard keep the single-file rule
+(the first row wins). Conflicts are found while the shards are read, before
+the first row is handed out, so a failed load builds nothing.
+
+Shards are parsed by a process pool. With cache=True each worker brings its
+shard's binary cache (see catalog_cache.py) up to date and the parent reads
+the caches through mmap; otherwise workers send the parsed rows back.
+"""
+import glob
+import os
+import sys
+
+MAX_REPORTED_CONFLICTS = 10
+
+
+def is_sharded(path):
+    """Whether a catalog path names shards; an existing file is one catalog whatever its name"""
+    if os.path.isfile(path):
+        return False
+    return os.path.isdir(path) or glob.has_magic(path)
+
+
+def shard_paths(path):
+    """Sorted CSV files of a sharded catalog path"""
+    pattern = os.path.join(path, '*.csv') if os.path.isdir(path) else path
+    paths = sorted(name for name in glob.glob(pattern) if os.path.isfile(name))
+    if not paths:
+        raise FileNotFoundError(f"找不到CSV文件: {path}")
+    return paths
+
+
+def _parse_shard(path):
+    """Worker: the rows of one shard as string tables plus array columns
+
+    Sending unique strings once and rows as integer codes keeps pickling far
+    cheaper than sending row tuples.
+    """
+    from array import array
+    from estimator import read_csv_rows
+
+    names, name_ids = [], {}
+    descriptions, description_ids = [], {}
+    codes, efforts = array('I'), array('d')
+    for row in read_csv_rows(path):
+        for value in row[:3]:
+            code = name_ids.get(value)
+            if code is None:
+                code = name_ids[value] = len(names)
+                names.append(value)
+            codes.append(code)
+        code = description_ids.get(row[4])
+        if code is None:
+            code = description_ids[row[4]] = len(descriptions)
+            descriptions.append(row[4])
+        codes.append(code)
+        efforts.append(row[3])
+    return names, descriptions, codes, efforts
+
+
+def _decode_shard(shard):
+    """Rows of a shard encoded by _parse_shard, with names interned in this process"""
+    names, descriptions, codes, efforts = shard
+    names = [sys.intern(name) for name in names]
+    shared = {}  # Equal efforts share one float, as read_csv_rows does
+    for row, effort in enumerate(efforts):
+        base = 4 * row
+        yield (names[codes[base]], names[codes[base + 1]], names[codes[base + 2]],
+               shared.setdefault(effort, effort), descriptions[codes[base + 3]])
+
+
+def _refresh_shard_cache(path):
+    """Worker: rebuild one shard's binary cache if it is stale; False if it cannot be written"""
+    from catalog_cache import open_catalog_cache
+    from estimator import read_csv_rows
+    try:
+        open_catalog_cache(path, lambda: read_csv_rows(path)).close()
+    except OSError:
+        return False
+    return True
+
+
+def _shard_rows(paths, workers, cache):
+    """Yield (shard index, rows of that shard) in shard order"""
+    from estimator import read_csv_rows
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if cache:
+        from catalog_cache import open_catalog_cache
+        if workers > 1:
+            import multiprocessing
+            with multiprocessing.Pool(workers) as pool:
+                pool.map(_refresh_shard_cache, paths, chunksize=1)
+        for index, path in enumerate(paths):
+            try:
+                catalog = open_catalog_cache(path, lambda: read_csv_rows(path))
+            except OSError:
+                yield index, read_csv_rows(path)  # Cache not writable here
+                continue
+            try:
+                yield index, catalog.rows()
+            finally:
+                catalog.close()
+        return
+
+    if workers == 1:
+        for index, path in enumerate(paths):
+            yield index, read_csv_rows(path)
+        return
+    import multiprocessing
+    with multiprocessing.Pool(workers) as pool:
+        # imap keeps shard order while later shards are still being parsed
+        for index, shard in enumerate(pool.imap(_parse_shard, paths)):
+            yield index, _decode_shard(shard)
+
+
+def read_sharded_rows(path, workers=None, cache=False, progress=None):
+    """Stream (subsystem, module, task, effort, description) rows of a sharded catalog
+
+    Every shard is read before the first row is yielded: ValueError listing
+    the conflicting keys and their shards is raised before any row comes out.
+    If given, progress(bytes_done, total_bytes, rows_read) is called after
+    every shard.
+    """
+    paths = shard_paths(path)
+    sizes = [os.path.getsize(name) for name in paths]
+    owners = {}  # (subsystem, module) -> {task: shard index}
+    conflicts = []
+    accepted = []  # Rows held back until every shard is known to be conflict-free
+    for index, rows in _shard_rows(paths, workers, cache):
+        for row in rows:
+            subsystem_name, module_name, task_name = row[:3]
+            tasks = owners.get((subsystem_name, module_name))
+            if tasks is None:
+                tasks = owners[(subsystem_name, module_name)] = {}
+            owner = tasks.setdefault(task_name, index)
+            if owner != index:
+                conflicts.append((subsystem_name, module_name, task_name, paths[owner], paths[index]))
+                continue
+            accepted.append(row)
+        if progress:
+            progress(sum(sizes[:index + 1]), sum(sizes), len(accepted))
+
+    if conflicts:
+        listed = "; ".join(f"{s}/{m}/{t} ({first}, {second})"
+                           for s, m, t, first, second in conflicts[:MAX_REPORTED_CONFLICTS])
+        more = len(conflicts) - MAX_REPORTED_CONFLICTS
+        raise ValueError(f"分片中存在重复的任务 ({len(conflicts)}): {listed}"
+                         + (f"; 另有 {more} 个" if more > 0 else ""))
+    del owners
+    yield from accepted
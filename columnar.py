@@ -0,0 +1,332 @@
+"""Columnar NumPy representation of an effort catalog
+
+Tasks are stored as parallel arrays (effort, ratio, enabled mask, module index,
+subsystem index) and every total is a segment sum computed with np.bincount.
+Subsystem, module and task objects are available as lightweight views over the
+arrays, so code written against the object API keeps working.
+
+NumPy is an optional dependency; estimator.py does not import this module.
+"""
+import numpy as np
+
+from estimator import read_csv_rows
+
+
+class TaskView:
+    """Read-only Task-like view of one row of a TaskColumns store"""
+    __slots__ = ('_columns', '_row')
+
+    def __init__(self, columns, row):
+        self._columns = columns
+        self._row = row
+
+    @property
+    def name(self):
+        return self._columns.task_names[self._row]
+
+    @property
+    def effort(self):
+        return float(self._columns.effort[self._row])
+
+    @property
+    def description(self):
+        return self._columns.descriptions[self._row]
+
+    @property
+    def ratio(self):
+        return float(self._columns.ratio[self._row])
+
+
+class ModuleView:
+    """Module-like view over the rows of one module"""
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def name(self):
+        return self._columns.module_names[self._index]
+
+    @property
+    def tasks(self):
+        return [TaskView(self._columns, row) for row in self._columns.module_rows(self._index)]
+
+    @property
+    def manual_effort(self):
+        return float(self._columns.manual_effort[self._index])
+
+    def get_total_effort(self):
+        return float(self._columns.module_totals()[self._index])
+
+
+class SubsystemView:
+    """Subsystem-like view over the modules of one subsystem"""
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def name(self):
+        return self._columns.subsystem_names[self._index]
+
+    @property
+    def modules(self):
+        columns = self._columns
+        return [ModuleView(columns, m) for m in np.flatnonzero(columns.module_subsystem == self._index)]
+
+    def get_total_effort(self):
+        return float(self._columns.subsystem_totals()[self._index])
+
+
+class TaskColumns:
+    """Parallel-array task store with vectorized module, subsystem and project totals
+
+    Per-task arrays: effort, ratio (percent), enabled (task's module switched on),
+    module_index and subsystem_index. Per-module arrays: module_subsystem,
+    module_enabled and manual_effort ("Other" modules). Per-subsystem array:
+    subsystem_enabled. Totals are recomputed with bincount only when something
+    changed, summing in catalog order so results match EffortEstimator exactly.
+
+    Columns tracking an estimator go stale when its catalog is hot-reloaded
+    (a 'catalog' change); every array is rebuilt from the estimator on the next
+    method call, or with refresh().
+    """
+    def __init__(self, rows):
+        subsystem_ids = {}
+        module_ids = {}
+        self.subsystem_names = []
+        self.module_names = []
+        module_subsystem = []
+        self.task_names = []
+        self.descriptions = []
+        effort = []
+        module_index = []
+
+        for subsystem_name, module_name, task_name, task_effort, description in rows:
+            s = subsystem_ids.get(subsystem_name)
+            if s is None:
+                s = subsystem_ids[subsystem_name] = len(self.subsystem_names)
+                self.subsystem_names.append(subsystem_name)
+            m = module_ids.get((s, module_name))
+            if m is None:
+                m = module_ids[(s, module_name)] = len(self.module_names)
+                self.module_names.append(module_name)
+                module_subsystem.append(s)
+            self.task_names.append(task_name)
+            self.descriptions.append(description)
+            effort.append(task_effort)
+            module_index.append(m)
+
+        # Every subsystem gets an "Other" module for manual effort, as in the estimator
+        for s, subsystem_name in enumerate(self.subsystem_names):
+            module_ids[(s, "Other")] = len(self.module_names)
+            self.module_names.append("Other")
+            module_subsystem.append(s)
+
+        self._subsystem_ids = subsystem_ids
+        self._module_ids = module_ids
+        self._task_ids = None
+        self._module_order = None
+        self._estimator = None
+        self.stale = False  # Catalog reloaded since the arrays were built
+
+        self.effort = np.asarray(effort, dtype=np.float64)
+        self.ratio = np.full(len(effort), 100.0)
+        self.enabled = np.ones(len(effort), dtype=bool)
+        self.module_index = np.asarray(module_index, dtype=np.intp)
+        self.module_subsystem = np.asarray(module_subsystem, dtype=np.intp)
+        self.subsystem_index = self.module_subsystem[self.module_index]
+        self.module_enabled = np.ones(len(self.module_names), dtype=bool)
+        self.manual_effort = np.zeros(len(self.module_names))
+        self.subsystem_enabled = np.ones(len(self.subsystem_names), dtype=bool)
+        self._totals = None
+
+    @classmethod
+    def from_csv(cls, csv_file_path):
+        """Build columns straight from a catalog CSV without creating node objects"""
+        return cls(read_csv_rows(csv_file_path))
+
+    @classmethod
+    def from_cache(cls, cache):
+        """Build columns over a CatalogCache; the effort column is a zero-copy mmap view
+
+        Names are decoded lazily from the cache's string table, so opening a
+        large catalog costs only the index arrays. The cache must stay open for
+        the lifetime of the columns.
+        """
+        from catalog_cache import StringColumn
+
+        columns = cls(())
+        module_tasks = np.frombuffer(cache.module_tasks, dtype=np.uint32).astype(np.intp)
+        subsystem_modules = np.frombuffer(cache.subsystem_modules, dtype=np.uint32).astype(np.intp)
+        n_subsystems = len(cache.subsystem_names)
+        n_modules = len(cache.module_names)
+        n_tasks = cache.task_count
+
+        columns.subsystem_names = [cache.string(i) for i in cache.subsystem_names]
+        module_subsystem = np.repeat(np.arange(n_subsystems), np.diff(subsystem_modules))
+        # CSV modules first, then one "Other" module per subsystem as in __init__
+        columns.module_names = [cache.string(i) for i in cache.module_names] + ["Other"] * n_subsystems
+        columns.module_subsystem = np.concatenate((module_subsystem, np.arange(n_subsystems)))
+        columns._subsystem_ids = {name: s for s, name in enumerate(columns.subsystem_names)}
+        columns._module_ids = {
+            (int(s), name): m for m, (s, name) in enumerate(zip(columns.module_subsystem, columns.module_names))
+        }
+        columns.task_names = StringColumn(cache, cache.task_names)
+        columns.descriptions = StringColumn(cache, cache.task_descriptions)
+
+        columns.effort = np.frombuffer(cache.buffer, dtype=np.float64, count=n_tasks,
+                                       offset=cache.effort_offset)
+        columns.ratio = np.full(n_tasks, 100.0)
+        columns.enabled = np.ones(n_tasks, dtype=bool)
+        columns.module_index = np.repeat(np.arange(n_modules), np.diff(module_tasks))
+        columns.subsystem_index = columns.module_subsystem[columns.module_index]
+        columns.module_enabled = np.ones(len(columns.module_names), dtype=bool)
+        columns.manual_effort = np.zeros(len(columns.module_names))
+        columns.subsystem_enabled = np.ones(n_subsystems, dtype=bool)
+        columns._cache = cache
+        return columns
+
+    @classmethod
+    def from_estimator(cls, estimator, track=True):
+        """Build columns from a loaded estimator, optionally following its model store"""
+        columns = cls(
+            (subsystem.name, module.key, task.name, task.effort, task.description)
+            for subsystem in estimator.subsystems
+            for module in subsystem.modules
+            for task in module.tasks
+        )
+        columns._estimator = estimator
+        columns.sync_from_estimator(estimator)
+        if track:
+            estimator.store.add_observer(columns._on_model_change)
+        return columns
+
+    def sync_from_estimator(self, estimator):
+        """Copy every ratio, switch and manual effort from an estimator"""
+        store = estimator.store
+        for row, (s, m) in enumerate(zip(self.subsystem_index, self.module_index)):
+            self.ratio[row] = store.get_ratio(
+                self.subsystem_names[s], self.module_names[m], self.task_names[row])
+        for subsystem in estimator.subsystems:
+            s = self._subsystem_ids.get(subsystem.name)
+            if s is None:
+                continue  # Subsystem without tasks
+            self.subsystem_enabled[s] = estimator.subsystem_states[subsystem.name]
+            for module in subsystem.modules:
+                if module.key == "Other":
+                    self.manual_effort[self._module_ids[(s, "Other")]] = module.manual_effort
+        for subsystem_name in self.subsystem_names:
+            self._sync_module_states(estimator, subsystem_name)
+        self.enabled = self.module_enabled[self.module_index]
+        self._totals = None
+
+    def _sync_module_states(self, estimator, subsystem_name):
+        # Resolve switches the way the estimator does, including renamed "Other" modules
+        s = self._subsystem_ids[subsystem_name]
+        for m in np.flatnonzero(self.module_subsystem == s):
+            self.module_enabled[m] = estimator._is_module_enabled(subsystem_name, self.module_names[m])
+        self._totals = None
+
+    def refresh(self):
+        """Rebuild every array from the tracked estimator if its catalog was reloaded"""
+        if self.stale:
+            fresh = TaskColumns.from_estimator(self._estimator, track=False)
+            self.__dict__.update(fresh.__dict__)
+
+    def _on_model_change(self, kind, subsystem_name, *args):
+        """Store observer: apply a single change to the arrays"""
+        if kind == 'catalog':
+            # One change per reloaded module: rebuild once, when next used
+            self.stale = True
+        elif self.stale:
+            return  # The rebuild copies every setting from the estimator
+        elif kind == 'ratio':
+            module_name, task_name, ratio = args
+            self.set_ratio(subsystem_name, module_name, task_name, ratio)
+        elif kind == 'subsystem':
+            self.set_subsystem_state(subsystem_name, args[0])
+        elif kind == 'module':
+            s = self._subsystem_ids[subsystem_name]
+            self._sync_module_states(self._estimator, subsystem_name)
+            rows = self.subsystem_index == s
+            self.enabled[rows] = self.module_enabled[self.module_index[rows]]
+        elif kind == 'manual':
+            module = self._estimator.find_node(subsystem_name, args[0])
+            self.set_manual_effort(subsystem_name, module.manual_effort)
+
+    def task_row(self, subsystem_name, module_name, task_name):
+        """Row of a task in the parallel arrays"""
+        self.refresh()
+        if self._task_ids is None:
+            self._task_ids = {
+                (self.subsystem_names[s], self.module_names[m], name): row
+                for row, (s, m, name) in enumerate(
+                    zip(self.subsystem_index.tolist(), self.module_index.tolist(), self.task_names))
+            }
+        return self._task_ids[(subsystem_name, module_name, task_name)]
+
+    def module_rows(self, module_index):
+        """Rows of a module's tasks, in catalog order"""
+        self.refresh()
+        if self._module_order is None:
+            # Stable sort keeps catalog order inside each module
+            order = np.argsort(self.module_index, kind='stable')
+            counts = np.bincount(self.module_index, minlength=len(self.module_names))
+            self._module_order = (order, np.concatenate(([0], np.cumsum(counts))))
+        order, offsets = self._module_order
+        return order[offsets[module_index]:offsets[module_index + 1]]
+
+    def set_ratio(self, subsystem_name, module_name, task_name, ratio):
+        self.ratio[self.task_row(subsystem_name, module_name, task_name)] = ratio
+        self._totals = None
+
+    def set_module_state(self, subsystem_name, module_name, enabled):
+        self.refresh()
+        m = self._module_ids[(self._subsystem_ids[subsystem_name], module_name)]
+        self.module_enabled[m] = enabled
+        self.enabled[self.module_index == m] = enabled
+        self._totals = None
+
+    def set_subsystem_state(self, subsystem_name, enabled):
+        self.refresh()
+        self.subsystem_enabled[self._subsystem_ids[subsystem_name]] = enabled
+        self._totals = None
+
+    def set_manual_effort(self, subsystem_name, effort):
+        self.refresh()
+        self.manual_effort[self._module_ids[(self._subsystem_ids[subsystem_name], "Other")]] = effort
+        self._totals = None
+
+    def _compute_totals(self):
+        self.refresh()
+        if self._totals is None:
+            # Same operation order as Module.get_total_effort: effort * (ratio / 100)
+            weights = np.where(self.enabled, self.effort * (self.ratio / 100), 0.0)
+            module_totals = np.bincount(self.module_index, weights=weights,
+                                        minlength=len(self.module_names))
+            module_totals += np.where(self.module_enabled, self.manual_effort, 0.0)
+            subsystem_totals = np.bincount(self.module_subsystem, weights=module_totals,
+                                           minlength=len(self.subsystem_names))
+            # Few subsystems: sequential sum keeps parity with the object API
+            project_total = sum(subsystem_totals[self.subsystem_enabled].tolist())
+            self._totals = (module_totals, subsystem_totals, project_total)
+        return self._totals
+
+    def module_totals(self):
+        return self._compute_totals()[0]
+
+    def subsystem_totals(self):
+        return self._compute_totals()[1]
+
+    def get_total_effort(self):
+        return self._compute_totals()[2]
+
+    @property
+    def subsystems(self):
+        self.refresh()
+        return [SubsystemView(self, s) for s in range(len(self.subsystem_names))]
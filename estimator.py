@@ -1,60 +1,84 @@
 class Task:
+    # Slotted: a catalog holds one Task per row, so per-instance dicts dominate memory
+    __slots__ = ('id', 'name', 'effort', '_description')
+    _descriptions = None  # LazyDescriptions of the catalog cache, set on lazily loaded task types
+    
     def __init__(self, name, effort, description=""):
+        self.id = None  # Stable node ID, assigned by the estimator
         self.name = name
         self.effort = effort
-        self.description = description
+        self._description = description
+        
+    @property
+    def description(self):
+        if self._description is None and self._descriptions is not None:
+            # Not kept in memory: decoded from the catalog cache on every access
+            return self._descriptions.description(self.id)
+        return self._description
+        
+    @description.setter
+    def description(self, description):
+        self._description = description
 
 class Module:
+    __slots__ = ('id', 'name', 'key', 'tasks', '_estimator', '_subsystem', 'manual_effort', 'manual_comment')
+    
     def __init__(self, name):
+        self.id = None  # Stable node ID, assigned by the estimator
         self.name = name
+        self.key = name  # Lookup key; stays fixed when "Other" is renamed for display
         self.tasks = []
         self._estimator = None
+        self._subsystem = None  # Owning subsystem, set when attached
         self.manual_effort = 0  # Add manual effort field
         self.manual_comment = ""  # Add manual comment field
         
     def add_task(self, task_name, effort, description=""):
-        task = Task(task_name, effort, description)
+        task = (self._estimator.task_type if self._estimator else Task)(task_name, effort, description)
         self.tasks.append(task)
+        if self._estimator:
+            self._estimator._register_node(task, (self._subsystem.name, self.key, task_name))
         return task
         
     def get_total_effort(self):
+        # Served from the estimator's rollup cache when attached
+        if self._estimator:
+            return self._estimator.rollup.module_total(self)
+        return self._compute_total_effort()
+        
+    def _compute_total_effort(self):
         total = 0
-        if hasattr(self, '_estimator') and self._estimator:
-            # Find the subsystem that contains this module
-            for subsystem in self._estimator.subsystems:
-                if self in subsystem.modules:
-                    subsystem_name = subsystem.name
-                    
-                    # Check if module is disabled using the actual module name
-                    module_enabled = False
-                    for mod_name, enabled in self._estimator.module_states[subsystem_name].items():
-                        if self.name.startswith(mod_name) or mod_name.startswith(self.name):
-                            module_enabled = enabled
-                            break
-                    
-                    # If module is disabled, return 0
-                    if not module_enabled:
-                        return 0
-                    
-                    # Calculate effort for all tasks
-                    for task in self.tasks:
-                        ratio = float(self._estimator.ui_vars[subsystem_name]['modules'][self.name]['tasks'][task.name]['ratio'].get()) / 100
-                        total += task.effort * ratio
-                    
-                    # Add manual effort for "Other" module only if it's enabled
-                    if self.name.startswith("Other"):
-                        total += self.manual_effort
-                    break
+        if self._estimator:
+            subsystem = self._subsystem
+            if subsystem is not None:
+                subsystem_name = subsystem.name
+                
+                # If module is disabled, return 0
+                if not self._estimator._is_module_enabled(subsystem_name, self.key):
+                    return 0
+                
+                # Calculate effort for all tasks
+                ratios = self._estimator.store.ratios[subsystem_name].get(self.key, {})
+                for task in self.tasks:
+                    ratio = ratios[task.name] / 100
+                    total += task.effort * ratio
+                
+                # Add manual effort for "Other" module only if it's enabled
+                if self.key == "Other":
+                    total += self.manual_effort
         else:
             # If no estimator reference, return raw sum plus manual effort
             total = sum(task.effort for task in self.tasks)
-            if self.name.startswith("Other"):
+            if self.key == "Other":
                 total += self.manual_effort
         
         return total
 
 class Subsystem:
+    __slots__ = ('id', 'name', 'modules', '_estimator')
+    
     def __init__(self, name):
+        self.id = None  # Stable node ID, assigned by the estimator
         self.name = name
         self.modules = []
         self._estimator = None
@@ -62,17 +86,943 @@ class Subsystem:
     def add_module(self, module_name):
         module = Module(module_name)
         module._estimator = self._estimator  # Pass estimator reference
+        module._subsystem = self
         self.modules.append(module)
+        if self._estimator:
+            self._estimator._register_node(module, (self.name, module.key))
+            self._estimator.rollup.invalidate_subsystem(self)
         return module
         
     def get_total_effort(self):
+        if not self._estimator:
+            return 0
+        return self._estimator.rollup.subsystem_total(self)
+        
+    def _compute_total_effort(self):
         if not self._estimator or not self._estimator.module_states.get(self.name):
             return 0
         return sum(module.get_total_effort() for module in self.modules 
-                  if self._estimator.module_states[self.name].get(module.name, True))
+                  if self._estimator.module_states[self.name].get(module.key, True))
+
+# Catalog CSV columns, in the order read_csv_rows yields them
+CSV_COLUMNS = ('subsystem', 'module', 'task', 'effort', 'description')
+
+def read_csv_rows(csv_file_path, chunk_size=10000, progress=None, extra_columns=()):
+    """Stream (subsystem, module, task, effort, description) tuples from a catalog CSV file
+    
+    The file is read through a generator pipeline (byte-counted buffered reads
+    -> csv reader -> positional parsing), one row at a time, with column
+    positions resolved once from the header. This is what makes loading faster
+    than csv.DictReader; peak memory is set by the model being built, which
+    this does not shrink. Subsystem, module and task names are interned, and
+    equal descriptions and efforts share one object, so the loaded model keeps
+    one object per distinct value. If given,
+    progress(bytes_read, total_bytes, rows_read) is called every chunk_size rows.
+    
+    Optional numeric columns named in extra_columns are appended to each tuple
+    as floats, or None where the column is absent or the cell is empty.
+    """
+    import csv
+    import io
+    import os
+    import sys
+    
+    if not os.path.exists(csv_file_path):
+        raise FileNotFoundError(f"找不到CSV文件: {csv_file_path}")
+    
+    total_bytes = os.path.getsize(csv_file_path)
+    
+    class CountingReader(io.RawIOBase):
+        # Count bytes per buffered read, for progress reporting
+        def __init__(self, raw):
+            self.raw = raw
+            self.bytes_read = 0
+        def readable(self):
+            return True
+        def readinto(self, buffer):
+            size = self.raw.readinto(buffer)
+            self.bytes_read += size or 0
+            return size
+    
+    with open(csv_file_path, 'rb', buffering=0) as raw:
+        counter = CountingReader(raw)
+        text = io.TextIOWrapper(io.BufferedReader(counter, 1 << 16), encoding='utf-8', newline='')
+        reader = csv.reader(text, 
+                            quoting=csv.QUOTE_MINIMAL,  # Use standard quote processing
+                            quotechar='"',             # Specify quote character
+                            skipinitialspace=True)     # Skip spaces before fields
+        
+        # Resolve column positions once from the header
+        header = [name.strip().lstrip('\ufeff') for name in next(reader, [])]
+        missing = [name for name in CSV_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"CSV文件缺少列: {', '.join(missing)}")
+        s_col, m_col, t_col, e_col, d_col = (header.index(name) for name in CSV_COLUMNS)
+        extra_cols = [header.index(name) if name in header else None for name in extra_columns]
+        
+        def parse_extra(row):
+            return tuple(
+                float(row[col]) if col is not None and col < len(row) and row[col].strip() else None
+                for col in extra_cols
+            )
+        
+        intern = sys.intern
+        # Descriptions often repeat within a module; dedupe them without interning for good
+        descriptions = {}
+        efforts = {}
+        rows_read = 0
+        for row in reader:
+            rows_read += 1
+            if progress and rows_read % chunk_size == 0:
+                progress(counter.bytes_read, total_bytes, rows_read)
+            if not row:
+                continue  # Skip blank lines
+            description = row[d_col].strip()
+            effort = float(row[e_col])
+            parsed = (
+                intern(row[s_col].strip()),
+                intern(row[m_col].strip()),
+                intern(row[t_col].strip()),
+                efforts.setdefault(effort, effort),
+                descriptions.setdefault(description, description),
+            )
+            yield parsed + parse_extra(row) if extra_cols else parsed
+        if progress and rows_read % chunk_size:
+            progress(counter.bytes_read, total_bytes, rows_read)
+
+class ModelStore:
+    """Plain-Python store for effort ratios and switch states
+    
+    The store has no Tk dependency, so totals can be computed in services and
+    batch jobs. Widgets built by create_ui register as observers and mirror
+    every change; observers are called as callback(kind, subsystem_name, *args)
+    with kind one of 'ratio', 'module', 'subsystem', 'task' or 'manual', or
+    'catalog' (args: module name, None for the whole subsystem) when a catalog
+    reload added, removed or changed nodes.
+    """
+    def __init__(self):
+        self.subsystem_states = {}  # subsystem -> enabled
+        self.module_states = {}     # subsystem -> module -> enabled
+        self.task_states = {}       # subsystem -> module -> task -> enabled
+        self.ratios = {}            # subsystem -> module -> task -> ratio in percent
+        self._observers = []
+        
+    def add_observer(self, callback):
+        self._observers.append(callback)
+        
+    def remove_observer(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+            
+    def notify(self, kind, subsystem_name, *args):
+        for callback in list(self._observers):
+            callback(kind, subsystem_name, *args)
+            
+    def register_subsystem(self, subsystem_name):
+        """Initialize state for a new subsystem (default on)"""
+        self.subsystem_states[subsystem_name] = True
+        self.module_states[subsystem_name] = {}
+        self.task_states[subsystem_name] = {}
+        self.ratios[subsystem_name] = {}
+        
+    def register_task(self, subsystem_name, module_name, task_name, ratio=100):
+        """Initialize state for a new task and its module (default on, 100%)"""
+        module_tasks = self.task_states[subsystem_name].get(module_name)
+        if module_tasks is None:
+            # First task of this module
+            self.module_states[subsystem_name].setdefault(module_name, True)
+            module_tasks = self.task_states[subsystem_name][module_name] = {}
+            self.ratios[subsystem_name][module_name] = {}
+        module_tasks[task_name] = True
+        self.ratios[subsystem_name][module_name][task_name] = ratio
+        
+    def unregister_task(self, subsystem_name, module_name, task_name):
+        """Forget the state of a task removed from the catalog"""
+        self.task_states[subsystem_name][module_name].pop(task_name, None)
+        self.ratios[subsystem_name][module_name].pop(task_name, None)
+        
+    def unregister_module(self, subsystem_name, module_name):
+        """Forget the state of a module removed from the catalog"""
+        for states in (self.module_states, self.task_states, self.ratios):
+            states[subsystem_name].pop(module_name, None)
+        
+    def unregister_subsystem(self, subsystem_name):
+        """Forget the state of a subsystem removed from the catalog"""
+        for states in (self.subsystem_states, self.module_states, self.task_states, self.ratios):
+            states.pop(subsystem_name, None)
+        
+    def get_ratio(self, subsystem_name, module_name, task_name):
+        return self.ratios[subsystem_name][module_name][task_name]
+        
+    def set_ratio(self, subsystem_name, module_name, task_name, ratio):
+        tasks = self.ratios[subsystem_name][module_name]
+        if tasks.get(task_name) == ratio:
+            return
+        tasks[task_name] = ratio
+        self.notify('ratio', subsystem_name, module_name, task_name, ratio)
+        
+    def set_module_state(self, subsystem_name, module_name, enabled):
+        if self.module_states[subsystem_name].get(module_name) == enabled:
+            return
+        self.module_states[subsystem_name][module_name] = enabled
+        self.notify('module', subsystem_name, module_name, enabled)
+        
+    def set_subsystem_state(self, subsystem_name, enabled):
+        if self.subsystem_states.get(subsystem_name) == enabled:
+            return
+        self.subsystem_states[subsystem_name] = enabled
+        self.notify('subsystem', subsystem_name, enabled)
+        
+    def set_task_state(self, subsystem_name, module_name, task_name, enabled):
+        tasks = self.task_states[subsystem_name].setdefault(module_name, {})
+        if tasks.get(task_name) == enabled:
+            return
+        tasks[task_name] = enabled
+        self.notify('task', subsystem_name, module_name, task_name, enabled)
+
+class EffortRollup:
+    """Cache module, subsystem and project totals, recomputing only dirty paths
+    
+    A ratio change, toggle or manual effort edit invalidates the affected module,
+    its subsystem and the project total; everything else is served from cache.
+    Totals are rebuilt by summing cached children in the same order as a full
+    recompute, so the numbers are identical to recomputing from scratch.
+    """
+    def __init__(self, estimator):
+        self._estimator = estimator
+        self._module_totals = {}     # Module -> cached total
+        self._subsystem_totals = {}  # Subsystem -> cached total
+        self._project_total = None
+        self.version = 0  # Bumped on every invalidation, so dependents can tell totals moved
+        
+    def module_total(self, module):
+        total = self._module_totals.get(module)
+        if total is None:
+            total = module._compute_total_effort()
+            self._module_totals[module] = total
+        return total
+        
+    def subsystem_total(self, subsystem):
+        total = self._subsystem_totals.get(subsystem)
+        if total is None:
+            total = subsystem._compute_total_effort()
+            self._subsystem_totals[subsystem] = total
+        return total
+        
+    def project_total(self):
+        if self._project_total is None:
+            self._project_total = self._estimator._compute_total_effort()
+        return self._project_total
+        
+    def invalidate_module(self, module):
+        """Mark a module and every ancestor total dirty"""
+        self.version += 1
+        self._module_totals.pop(module, None)
+        if module._subsystem is not None:
+            self._subsystem_totals.pop(module._subsystem, None)
+        self._project_total = None
+        
+    def invalidate_subsystem(self, subsystem, modules=False):
+        """Mark a subsystem (optionally with all its modules) and the project total dirty"""
+        self.version += 1
+        if modules:
+            for module in subsystem.modules:
+                self._module_totals.pop(module, None)
+        self._subsystem_totals.pop(subsystem, None)
+        self._project_total = None
+        
+    def invalidate_project(self):
+        """Mark only the project total dirty, e.g. after a subsystem switch"""
+        self.version += 1
+        self._project_total = None
+        
+    def invalidate_all(self):
+        self.version += 1
+        self._module_totals.clear()
+        self._subsystem_totals.clear()
+        self._project_total = None
+
+class ScenarioOverlay:
+    """Copy-on-write what-if scenario over an estimator's catalog
+    
+    A scenario records only its edits (task ratios, module and subsystem
+    switches, "Other" manual efforts) and never modifies the estimator. Modules
+    and subsystems it does not touch are served from the estimator's rollup;
+    touched modules, their subsystems and the project total are recomputed in
+    the same order as the rollup and cached until the scenario or the base
+    model changes. Memory grows with the number of edits, not catalog size.
+    
+    Every edit made is kept, even one equal to the current base value, so the
+    scenario holds on to it when the base model changes later; the revert_*
+    methods drop edits, after which the base value shows through again.
+    """
+    def __init__(self, estimator):
+        self._estimator = estimator
+        self.ratios = {}            # (subsystem, module, task) -> ratio in percent
+        self.module_states = {}     # (subsystem, module) -> enabled
+        self.subsystem_states = {}  # subsystem -> enabled
+        self.manual = {}            # subsystem -> (effort, comment) of its "Other" module
+        self._touched = {}          # subsystem -> keys of modules with edits
+        self._module_totals = {}
+        self._subsystem_totals = {}
+        self._project_total = None
+        self._base_version = estimator.rollup.version
+        
+    def __len__(self):
+        """Number of edits held by the scenario"""
+        return len(self.ratios) + len(self.module_states) + len(self.subsystem_states) + len(self.manual)
+        
+    def _touch(self, subsystem_name, module_name):
+        self._touched.setdefault(subsystem_name, set()).add(module_name)
+        self._module_totals.pop((subsystem_name, module_name), None)
+        self._subsystem_totals.pop(subsystem_name, None)
+        self._project_total = None
+        
+    def _check_base(self):
+        # Cached totals embed base values; drop them once the base model moved
+        if self._base_version != self._estimator.rollup.version:
+            self._base_version = self._estimator.rollup.version
+            self._module_totals.clear()
+            self._subsystem_totals.clear()
+            self._project_total = None
+            
+    def set_ratio(self, subsystem_name, module_name, task_name, ratio):
+        self._estimator.store.get_ratio(subsystem_name, module_name, task_name)  # KeyError if unknown
+        self.ratios[(subsystem_name, module_name, task_name)] = ratio
+        self._touch(subsystem_name, module_name)
+        
+    def set_module_state(self, subsystem_name, module_name, enabled):
+        if module_name not in self._estimator.module_states[subsystem_name]:
+            raise KeyError(module_name)
+        self.module_states[(subsystem_name, module_name)] = enabled
+        self._touch(subsystem_name, module_name)
+        
+    def set_subsystem_state(self, subsystem_name, enabled):
+        if subsystem_name not in self._estimator.subsystem_states:
+            raise KeyError(subsystem_name)
+        self.subsystem_states[subsystem_name] = enabled
+        self._project_total = None
+        
+    def set_manual_effort(self, subsystem_name, effort, comment=""):
+        if self._estimator.find_node(subsystem_name, "Other") is None:
+            raise KeyError(subsystem_name)
+        self.manual[subsystem_name] = (effort, comment)
+        self._touch(subsystem_name, "Other")
+        
+    def revert_ratio(self, subsystem_name, module_name, task_name):
+        """Drop a ratio edit, so the task follows the base model again"""
+        if self.ratios.pop((subsystem_name, module_name, task_name), None) is not None:
+            self._touch(subsystem_name, module_name)
+        
+    def revert_module_state(self, subsystem_name, module_name):
+        if self.module_states.pop((subsystem_name, module_name), None) is not None:
+            self._touch(subsystem_name, module_name)
+        
+    def revert_subsystem_state(self, subsystem_name):
+        if self.subsystem_states.pop(subsystem_name, None) is not None:
+            self._project_total = None
+        
+    def revert_manual_effort(self, subsystem_name):
+        if self.manual.pop(subsystem_name, None) is not None:
+            self._touch(subsystem_name, "Other")
+        
+    def update(self, changes):
+        """Apply edits in the scenario format of batch.py; returns the scenario"""
+        for subsystem_name, modules in changes.get('ratios', {}).items():
+            for module_name, tasks in modules.items():
+                for task_name, ratio in tasks.items():
+                    self.set_ratio(subsystem_name, module_name, task_name, float(ratio))
+        for subsystem_name, modules in changes.get('modules', {}).items():
+            for module_name, enabled in modules.items():
+                self.set_module_state(subsystem_name, module_name, bool(enabled))
+        for subsystem_name, enabled in changes.get('subsystems', {}).items():
+            self.set_subsystem_state(subsystem_name, bool(enabled))
+        for subsystem_name, other in changes.get('other', {}).items():
+            if not isinstance(other, dict):
+                other = {'effort': other}
+            self.set_manual_effort(subsystem_name, float(other.get('effort', 0)),
+                                   str(other.get('comment', "")))
+        return self
+        
+    def get_ratio(self, subsystem_name, module_name, task_name):
+        ratio = self.ratios.get((subsystem_name, module_name, task_name))
+        if ratio is None:
+            return self._estimator.store.get_ratio(subsystem_name, module_name, task_name)
+        return ratio
+        
+    def is_module_enabled(self, subsystem_name, module_name):
+        enabled = self.module_states.get((subsystem_name, module_name))
+        if enabled is None:
+            return self._estimator._is_module_enabled(subsystem_name, module_name)
+        return enabled
+        
+    def is_subsystem_enabled(self, subsystem_name):
+        enabled = self.subsystem_states.get(subsystem_name)
+        if enabled is None:
+            return self._estimator.subsystem_states.get(subsystem_name, True)
+        return enabled
+        
+    def module_total(self, subsystem_name, module_name):
+        self._check_base()
+        module = self._estimator.find_node(subsystem_name, module_name)
+        if module_name not in self._touched.get(subsystem_name, ()):
+            return module.get_total_effort()
+        total = self._module_totals.get((subsystem_name, module_name))
+        if total is None:
+            # Same computation as Module._compute_total_effort, reading the overlay first
+            total = 0
+            if self.is_module_enabled(subsystem_name, module_name):
+                ratios = self._estimator.store.ratios[subsystem_name].get(module_name, {})
+                for task in module.tasks:
+                    ratio = self.ratios.get((subsystem_name, module_name, task.name))
+                    ratio = (ratios[task.name] if ratio is None else ratio) / 100
+                    total += task.effort * ratio
+                if module.key == "Other":
+                    manual = self.manual.get(subsystem_name)
+                    total += module.manual_effort if manual is None else manual[0]
+            self._module_totals[(subsystem_name, module_name)] = total
+        return total
+        
+    def subsystem_total(self, subsystem_name):
+        self._check_base()
+        subsystem = self._estimator.find_node(subsystem_name)
+        if subsystem_name not in self._touched:
+            return subsystem.get_total_effort()
+        total = self._subsystem_totals.get(subsystem_name)
+        if total is None:
+            # Same computation as Subsystem._compute_total_effort
+            total = 0
+            if self._estimator.module_states.get(subsystem_name):
+                total = sum(self.module_total(subsystem_name, module.key) for module in subsystem.modules
+                            if self.is_module_enabled(subsystem_name, module.key))
+            self._subsystem_totals[subsystem_name] = total
+        return total
+        
+    def get_total_effort(self):
+        self._check_base()
+        if not self._touched and not self.subsystem_states:
+            return self._estimator.get_total_effort()
+        if self._project_total is None:
+            # Summed in subsystem order like the rollup; untouched subsystems are cache hits
+            base_states = self._estimator.subsystem_states
+            total = 0
+            for subsystem in self._estimator.subsystems:
+                name = subsystem.name
+                enabled = self.subsystem_states.get(name)
+                if enabled is None:
+                    enabled = base_states.get(name, True)
+                if enabled:
+                    total += self.subsystem_total(name) if name in self._touched else subsystem.get_total_effort()
+            self._project_total = total
+        return self._project_total
+
+class ScenarioCache:
+    """Bounded LRU cache of scenario results
+    
+    Entries are keyed on a canonical form of a scenario: the estimator's rollup
+    version (bumped by every catalog load and base model change) plus the
+    scenario's effective ratios, switches and manual efforts. Edits that equal
+    the base at that version are left out of the key and key order does not
+    matter, so equivalent scenarios share one entry. Once the rollup version
+    moves, every entry is stale and the cache is emptied. Callers get a deep
+    copy of the stored result, so changing one never alters later hits.
+    """
+    def __init__(self, estimator, maxsize=1024):
+        from collections import OrderedDict
+        
+        self._estimator = estimator
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> result, least recently used first
+        self._version = estimator.rollup.version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        
+    def __len__(self):
+        return len(self._entries)
+        
+    def key(self, scenario, *extra):
+        """Canonical, hashable key of an overlay; extra values distinguish result variants"""
+        estimator = self._estimator
+        get_ratio = estimator.store.get_ratio
+        # The version pins the base, so edits equal to it do not change any total;
+        # comments never do, so only manual efforts are part of the key
+        return (estimator.rollup.version,
+                frozenset(item for item in scenario.ratios.items() if item[1] != get_ratio(*item[0])),
+                frozenset(item for item in scenario.module_states.items()
+                          if item[1] != estimator._is_module_enabled(*item[0])),
+                frozenset(item for item in scenario.subsystem_states.items()
+                          if item[1] != estimator.subsystem_states.get(item[0], True)),
+                frozenset((name, manual[0]) for name, manual in scenario.manual.items()
+                          if manual[0] != estimator.find_node(name, "Other").manual_effort),
+                extra)
+        
+    def get(self, scenario, compute, *extra):
+        """Cached result of compute(scenario, *extra); compute only runs on a miss"""
+        import copy
+        
+        if self._version != self._estimator.rollup.version:
+            self._version = self._estimator.rollup.version
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+        key = self.key(scenario, *extra)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(result)
+        self.misses += 1
+        result = compute(scenario, *extra)
+        if self.maxsize > 0:
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            result = copy.deepcopy(result)  # The caller's copy; the entry stays as computed
+        return result
+        
+    def clear(self):
+        self._entries.clear()
+        
+    def info(self):
+        """Counters and occupancy, e.g. for a status endpoint"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+class VirtualTaskList:
+    """Scrollable Task Details list that only creates widgets for the rows in view
+    
+    Module headers and tasks are laid out as fixed-height rows on a canvas. A
+    pool of row widgets just large enough to fill the viewport is positioned
+    over the visible rows and rebound to other rows as the view scrolls, so
+    widget count does not grow with the number of tasks.
+    
+    A description too long for its row is cut with an ellipsis; hovering
+    over it shows the full text, wrapped as in the original layout.
+    """
+    ROW_HEIGHT = 28
+    DESCRIPTION_WRAP = 800  # Wrap length of the full description shown on hover
+    RATIOS = [("100", "100%"), ("60", "60%"), ("25", "25%"), ("0", "0%")]
+    
+    def __init__(self, parent, estimator, subsystem):
+        import tkinter as tk
+        from tkinter import ttk
+        
+        self.estimator = estimator
+        self.subsystem = subsystem
+        self.task_filter = None  # IDs of the tasks to show, None for all; see set_filter
+        self._slots = []
+        self._font = None  # Font of the description labels, for measuring text
+        self._tooltip = None  # Popup with the full description under the pointer
+        
+        self.rows = self._build_rows()
+        
+        container = ttk.Frame(parent)
+        container.pack(fill=tk.BOTH, expand=True)
+        
+        self.canvas = tk.Canvas(container, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(container, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(
+            yscrollcommand=self._on_scroll,
+            yscrollincrement=self.ROW_HEIGHT,
+            scrollregion=(0, 0, 0, len(self.rows) * self.ROW_HEIGHT)
+        )
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        
+    def _build_rows(self):
+        """Flattened rows: (module, None) for a module header, (module, task) for a task"""
+        rows = []
+        task_ids = self.task_filter
+        for module in self.subsystem.modules:
+            if task_ids is None:
+                rows.append((module, None))
+                rows.extend((module, task) for task in module.tasks)
+                continue
+            tasks = [task for task in module.tasks if task.id in task_ids]
+            if tasks:  # Modules without matching tasks are left out
+                rows.append((module, None))
+                rows.extend((module, task) for task in tasks)
+        return rows
+        
+    def _on_configure(self, event):
+        # Rows follow the canvas width; a taller canvas may need more slots
+        for slot in self._slots:
+            self.canvas.itemconfigure(slot['item'], width=event.width)
+        self.render()
+        
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render()
+        
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        
+    def _create_slot(self):
+        """Create one reusable row widget"""
+        import tkinter as tk
+        from tkinter import ttk
+        
+        frame = ttk.Frame(self.canvas, height=self.ROW_HEIGHT)
+        slot = {'frame': frame, 'row': None, 'ratio': tk.StringVar(value="100")}
+        
+        # Module header
+        slot['header'] = ttk.Label(frame, font=('Arial', 10, 'bold'))
+        
+        # Task name label
+        slot['name'] = ttk.Label(frame)
+        
+        # Create radiobutton frame with four radiobuttons
+        slot['radios'] = ttk.Frame(frame)
+        for ratio, text in self.RATIOS:
+            ttk.Radiobutton(
+                slot['radios'],
+                text=text,
+                variable=slot['ratio'],
+                value=ratio,
+                command=lambda: self._on_ratio(slot)
+            ).pack(side=tk.LEFT, padx=2)
+        
+        # Effort label, separator and description text
+        slot['effort'] = ttk.Label(frame)
+        slot['separator'] = ttk.Label(frame, text="-")
+        slot['description'] = ttk.Label(frame, justify=tk.LEFT)
+        
+        # Configure column widths and weights
+        frame.grid_columnconfigure(0, minsize=150)  # Task name column
+        frame.grid_columnconfigure(1, minsize=150)  # Radiobutton column
+        frame.grid_columnconfigure(2, minsize=100)  # Effort column
+        frame.grid_columnconfigure(3, minsize=20)   # Separator column
+        frame.grid_columnconfigure(4, weight=1)     # Description text column expandable
+        frame.grid_propagate(False)  # Keep the fixed row height
+        
+        for widget in (frame, slot['header'], slot['name'], slot['effort'], slot['description']):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+        # The label gets whatever width the other columns leave; refit the text when that changes
+        slot['description'].bind("<Configure>", lambda event: self._fit_description(slot, event.width))
+        slot['description'].bind("<Enter>", lambda event: self._show_description(slot, event))
+        slot['description'].bind("<Leave>", lambda event: self._hide_description())
+        
+        slot['item'] = self.canvas.create_window(
+            (0, 0), window=frame, anchor="nw",
+            width=max(self.canvas.winfo_width(), 1), height=self.ROW_HEIGHT
+        )
+        self._slots.append(slot)
+        return slot
+        
+    def _bind(self, slot, row):
+        """Show a row in a slot"""
+        module, task = self.rows[row]
+        slot['row'] = row
+        self.canvas.coords(slot['item'], 0, row * self.ROW_HEIGHT)
+        self.canvas.itemconfigure(slot['item'], state='normal')
+        
+        if task is None:
+            for name in ('name', 'radios', 'effort', 'separator', 'description'):
+                slot[name].grid_remove()
+            slot['header'].configure(text=module.name)
+            slot['header'].grid(row=0, column=0, columnspan=5, sticky='w', padx=5)
+            return
+        
+        slot['header'].grid_remove()
+        slot['name'].configure(text=task.name)
+        slot['name'].grid(row=0, column=0, sticky='w', padx=(20, 10))
+        slot['radios'].grid(row=0, column=1, padx=(0, 10))
+        slot['ratio'].set(self.estimator._format_ratio(
+            self.estimator.store.get_ratio(self.subsystem.name, module.key, task.name)))
+        slot['effort'].configure(text=f"(Effort: {task.effort})")
+        slot['effort'].grid(row=0, column=2, padx=(0, 10))
+        slot['separator'].grid(row=0, column=3, padx=5)
+        slot['full_description'] = task.description or ""
+        self._fit_description(slot, slot['description'].winfo_width())
+        slot['description'].grid(row=0, column=4, sticky='w', padx=5)
+        
+    def _fit_description(self, slot, width):
+        """Helper method: show as much of a slot's description as fits in width pixels"""
+        import tkinter.font as tkfont
+        
+        text = slot.get('full_description', "")
+        if "\n" in text:
+            text = " ".join(text.split())  # One line per row
+        if self._font is None:
+            self._font = tkfont.Font(root=self.canvas, name='TkDefaultFont', exists=True)
+        measure = self._font.measure
+        width -= 4  # Label padding
+        # Before the label is laid out its width is unknown; the <Configure> that follows refits it
+        if width > 0 and measure(text) > width:
+            # Longest prefix that still fits with the ellipsis
+            low, high = 0, len(text)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if measure(text[:middle] + "…") <= width:
+                    low = middle
+                else:
+                    high = middle - 1
+            text = text[:low].rstrip() + "…"
+        if slot['description'].cget('text') != text:
+            slot['description'].configure(text=text)
+        
+    def _show_description(self, slot, event):
+        """Helper method: pop up the full description of a slot whose text was cut"""
+        import tkinter as tk
+        from tkinter import ttk
+        
+        full = slot.get('full_description', "")
+        if slot['row'] is None or slot['description'].cget('text') == full:
+            return
+        if self._tooltip is None:
+            self._tooltip = tk.Toplevel(self.canvas)
+            self._tooltip.wm_overrideredirect(True)
+            self._tooltip.withdraw()
+            self._tooltip_label = ttk.Label(self._tooltip, justify=tk.LEFT, wraplength=self.DESCRIPTION_WRAP,
+                                            background="#ffffe0", relief='solid', borderwidth=1, padding=4)
+            self._tooltip_label.pack()
+        self._tooltip_label.configure(text=full)
+        self._tooltip.geometry(f"+{event.x_root + 12}+{event.y_root + 12}")
+        self._tooltip.deiconify()
+        self._tooltip.lift()
+        
+    def _hide_description(self):
+        if self._tooltip is not None:
+            self._tooltip.withdraw()
+        
+    def _on_ratio(self, slot):
+        # Write to the store; the estimator's UI observer refreshes the labels
+        module, task = self.rows[slot['row']]
+        self.estimator.store.set_ratio(self.subsystem.name, module.key, task.name, float(slot['ratio'].get()))
+        
+    def render(self, force=False):
+        """Bind the slot pool to the rows currently in view"""
+        self._hide_description()  # Rows may move out from under the pointer
+        height = self.canvas.winfo_height()
+        first = max(int(self.canvas.canvasy(0)) // self.ROW_HEIGHT, 0)
+        last = min(first + height // self.ROW_HEIGHT + 2, len(self.rows))
+        
+        while len(self._slots) < last - first:
+            self._create_slot()
+        
+        # Keep slots already showing a visible row; recycle the rest
+        visible = range(first, last)
+        free, shown = [], set()
+        for slot in self._slots:
+            if force or slot['row'] not in visible:
+                free.append(slot)
+            else:
+                shown.add(slot['row'])
+        for row in visible:
+            if row not in shown:
+                self._bind(free.pop(), row)
+        for slot in free:
+            slot['row'] = None
+            self.canvas.itemconfigure(slot['item'], state='hidden')
+        
+    def refresh(self):
+        """Rebind every visible row, e.g. after a module was renamed"""
+        self.render(force=True)
+        
+    def reload(self):
+        """Rebuild the rows after the catalog changed, keeping the scroll position"""
+        self.rows = self._build_rows()
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.rows) * self.ROW_HEIGHT))
+        self.render(force=True)
+        
+    def set_filter(self, task_ids):
+        """Show only the tasks whose IDs are in task_ids (None shows all), scrolled to the top"""
+        self.task_filter = task_ids
+        self.canvas.yview_moveto(0)
+        self.reload()
+        
+    def refresh_task(self, module_key, task_name):
+        """Update the ratio shown for a task if its row is in view"""
+        for slot in self._slots:
+            if slot['row'] is None:
+                continue
+            module, task = self.rows[slot['row']]
+            if task is not None and module.key == module_key and task.name == task_name:
+                slot['ratio'].set(self.estimator._format_ratio(
+                    self.estimator.store.get_ratio(self.subsystem.name, module_key, task_name)))
+
+class EffortCharts:
+    """Subsystem pie and module bar charts, drawn once and updated in place
+    
+    One wedge per subsystem and one bar per module are created up front.
+    Updates move and resize them, hide the ones without effort and redraw with
+    draw_idle, so no figure or canvas is rebuilt. Model changes trigger an
+    update at most once per REFRESH_INTERVAL, and only while the charts are
+    on screen.
+    """
+    REFRESH_INTERVAL = 250  # Minimum milliseconds between automatic redraws
+    
+    def __init__(self, parent, estimator):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        import tkinter as tk
+        from tkinter import ttk
+        
+        self.estimator = estimator
+        self.colormap = plt.cm.Set3
+        self.stale = False
+        self._pending = None
+        self._tick_labels = None
+        self._rebuild = False  # Set when the catalog gained or lost subsystems or modules
+        
+        # Create left and right columns
+        left_frame = ttk.Frame(parent)
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        right_frame = ttk.Frame(parent)
+        right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Subsystem pie and module bar axes; the artists are made by _create_artists
+        self.pie_figure = Figure(figsize=(6, 4))
+        self.pie_ax = self.pie_figure.add_subplot(111)
+        self.pie_ax.set_aspect('equal', adjustable='box')
+        self.pie_ax.set_axis_off()
+        self.pie_ax.set_xlim(-1.25, 1.25)
+        self.pie_ax.set_ylim(-1.25, 1.25)
+        self.pie_ax.set_title('Subsystem Effort Distribution')
+        
+        self.bar_figure = Figure(figsize=(6, 4))
+        self.bar_ax = self.bar_figure.add_subplot(111)
+        self.bar_ax.set_title('Module Effort Comparison')
+        self.bar_ax.set_ylabel('Effort')
+        self.wedges = []
+        self.bars = []
+        self._create_artists()
+        
+        # Create chart display area
+        self.pie_canvas = FigureCanvasTkAgg(self.pie_figure, left_frame)
+        self.pie_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.bar_canvas = FigureCanvasTkAgg(self.bar_figure, right_frame)
+        self.bar_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self.update()
+        estimator.store.add_observer(self._on_model_change)
+        
+    def _create_artists(self):
+        """Replace the wedges and bars with one per current subsystem and module"""
+        from matplotlib.patches import Wedge
+        
+        for subsystem, wedge, label, percent in self.wedges:
+            for artist in (wedge, label, percent):
+                artist.remove()
+        for subsystem, module, bar, text in self.bars:
+            bar.remove()
+            text.remove()
+        
+        # Subsystem pie: a wedge, a label and a percentage per subsystem
+        self.wedges = []
+        for index, subsystem in enumerate(self.estimator.subsystems):
+            wedge = Wedge((0, 0), 1, 90, 90, facecolor=f"C{index % 10}")
+            self.pie_ax.add_patch(wedge)
+            label = self.pie_ax.text(0, 0, subsystem.name, va='center')
+            percent = self.pie_ax.text(0, 0, '', ha='center', va='center')
+            self.wedges.append((subsystem, wedge, label, percent))
+        
+        # Module bars: one bar and value label per module
+        modules = [(subsystem, module) for subsystem in self.estimator.subsystems
+                   for module in subsystem.modules]
+        bars = self.bar_ax.bar(range(len(modules)), [0] * len(modules))
+        self.bars = [
+            (subsystem, module, bar, self.bar_ax.text(0, 0, '', ha='center', va='bottom'))
+            for (subsystem, module), bar in zip(modules, bars)
+        ]
+        self._tick_labels = None
+        self._rebuild = False
+        
+    def _on_model_change(self, kind, subsystem_name, *args):
+        """Store observer: schedule a throttled redraw"""
+        if kind == 'catalog':
+            self._rebuild = True
+        self.stale = True
+        if self._pending is None:
+            self._pending = self.pie_canvas.get_tk_widget().after(self.REFRESH_INTERVAL, self._on_timer)
+            
+    def _on_timer(self):
+        self._pending = None
+        # Hidden charts are updated when their tab is selected again
+        if self.pie_canvas.get_tk_widget().winfo_ismapped():
+            self.update()
+        
+    def update(self):
+        """Recompute chart data and redraw when idle"""
+        self.stale = False
+        if self._rebuild:
+            self._create_artists()
+        self._update_pie()
+        self._update_bar()
+        self.pie_canvas.draw_idle()
+        self.bar_canvas.draw_idle()
+        
+    def _update_pie(self):
+        import math
+        
+        states = self.estimator.subsystem_states
+        sizes = [subsystem.get_total_effort() if states.get(subsystem.name, True) else 0
+                 for subsystem, wedge, label, percent in self.wedges]
+        total = sum(size for size in sizes if size > 0)  # Only show non-zero effort
+        theta = 90.0
+        for (subsystem, wedge, label, percent), size in zip(self.wedges, sizes):
+            visible = size > 0
+            for artist in (wedge, label, percent):
+                artist.set_visible(visible)
+            if not visible:
+                continue
+            fraction = size / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + 360 * fraction)
+            middle = math.radians(theta + 180 * fraction)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            percent.set_position((0.6 * x, 0.6 * y))
+            percent.set_text(f'{100 * fraction:.1f}%')
+            theta += 360 * fraction
+            
+    def _update_bar(self):
+        subsystem_states = self.estimator.subsystem_states
+        module_states = self.estimator.module_states
+        tick_labels = []
+        top = 0
+        for subsystem, module, bar, text in self.bars:
+            effort = 0
+            if subsystem_states.get(subsystem.name, True) and module_states[subsystem.name].get(module.key, True):
+                effort = module.get_total_effort()
+            visible = effort > 0  # Only show non-zero effort
+            bar.set_visible(visible)
+            text.set_visible(visible)
+            if not visible:
+                continue
+            # Visible bars are packed left to right in hierarchy order
+            position = len(tick_labels)
+            tick_labels.append(f"{subsystem.name}\n{module.name}")
+            bar.set_x(position - bar.get_width() / 2)
+            bar.set_height(effort)
+            bar.set_color(self.colormap(len(tick_labels) % 12))
+            text.set_position((position, effort))
+            text.set_text(f'{int(effort)}')
+            top = max(top, effort)
+        
+        self.bar_ax.set_xlim(-0.5, max(len(tick_labels), 1) - 0.5)
+        self.bar_ax.set_ylim(0, top * 1.1 or 1)
+        # Tick labels and layout only change when the set of shown modules does
+        if tick_labels != self._tick_labels:
+            self._tick_labels = tick_labels
+            self.bar_ax.set_xticks(range(len(tick_labels)))
+            self.bar_ax.set_xticklabels(tick_labels, rotation=45, ha='right')
+            self.bar_figure.tight_layout()
 
 class EffortEstimator:
-    def __init__(self, csv_file_path):
+    UI_LATENCY_TARGET = 0.05  # Seconds from a model change to the labels showing it (checked by benchmarks/suite.py)
+    TEXT_WIDGET_CLASSES = ('Entry', 'TEntry', 'Spinbox', 'TSpinbox', 'TCombobox', 'Text')  # Keep their own Ctrl+Z
+    
+    def __init__(self, csv_file_path=None, progress=None, cache=False, lazy_descriptions=False, workers=None):
         self.subsystems = []
         self.subsystem_names = []
         self.subsystem_vars = {}
@@ -81,150 +1031,404 @@ class EffortEstimator:
         self.task_labels = {}
         self.subsys_effort_labels = {}
         self.mod_effort_labels = {}
-        self.subsystem_states = {}  # Store subsystem switch states
-        self.module_states = {}     # Store module switch states
-        self.task_states = {}       # Store task switch states
+        self.store = ModelStore()   # Headless ratio and switch state store
+        self.subsystem_states = self.store.subsystem_states  # Store subsystem switch states
+        self.module_states = self.store.module_states        # Store module switch states
+        self.task_states = self.store.task_states            # Store task switch states
+        self.rollup = EffortRollup(self)  # Cached effort totals
+        self.scenario_cache = ScenarioCache(self)  # Memoized scenario results
+        self.session = None  # SessionJournal persisting settings, see open_session
+        self.catalog_watcher = None  # CatalogWatcher hot-reloading the CSV, see watch_catalog
+        self.search_index = None  # TaskIndex behind the Task Details search box, see create_ui
+        self.store.add_observer(self._on_model_change)
+        self.nodes = []       # Node ID -> Subsystem/Module/Task
+        self.node_index = {}  # (subsystem,) / (subsystem, module) / (subsystem, module, task) -> node
+        self.task_type = Task  # Class of new tasks; a lazy-description subclass after such a load
         
         # Load data from CSV file
-        self.load_data_from_csv(csv_file_path)
+        if csv_file_path is not None:
+            self.load_data_from_csv(csv_file_path, progress=progress, cache=cache,
+                                    lazy_descriptions=lazy_descriptions, workers=workers)
         
-    def load_data_from_csv(self, csv_file_path):
-        """Load system structure and effort data from CSV file"""
-        import csv
-        import os
+    def load_data_from_csv(self, csv_file_path, progress=None, cache=False, lazy_descriptions=False,
+                           workers=None):
+        """Load system structure and effort data from CSV file
         
-        if not os.path.exists(csv_file_path):
-            raise FileNotFoundError(f"找不到CSV文件: {csv_file_path}")
+        With cache=True the parsed catalog is kept in a binary sidecar file
+        (see catalog_cache.py) and later loads skip CSV parsing entirely.
+        With lazy_descriptions=True as well, task descriptions are not loaded:
+        the cache stays mapped and each description is decoded when read.
+        
+        A directory or glob pattern loads a sharded catalog (see
+        catalog_shards.py), parsed by up to `workers` processes (default: CPU
+        count); lazy_descriptions does not apply to it.
+        """
+        from catalog_shards import is_sharded, read_sharded_rows
+        
+        if is_sharded(csv_file_path):
+            self.load_rows(read_sharded_rows(csv_file_path, workers=workers, cache=cache, progress=progress))
+            return
+        if cache:
+            import os
+            from catalog_cache import open_catalog_cache
             
+            if not os.path.exists(csv_file_path):
+                raise FileNotFoundError(f"找不到CSV文件: {csv_file_path}")
+            try:
+                catalog = open_catalog_cache(
+                    csv_file_path, lambda: read_csv_rows(csv_file_path, progress=progress))
+            except OSError:
+                catalog = None  # Cache not writable here: fall back to parsing the CSV
+            if catalog is not None:
+                if lazy_descriptions:
+                    self._load_lazy_descriptions(catalog)
+                    return
+                try:
+                    self.load_rows(catalog.rows())
+                finally:
+                    catalog.close()
+                return
+        self.load_rows(read_csv_rows(csv_file_path, progress=progress))
+        
+    def _load_lazy_descriptions(self, catalog):
+        """Helper method: load a cached catalog whose tasks read their descriptions from it"""
+        from catalog_cache import LazyDescriptions
+        
+        descriptions = LazyDescriptions(catalog, len(self.nodes))
+        # Tasks of this load share a subclass whose descriptions come from this cache
+        self.task_type = type('Task', (Task,), {'__slots__': (), '_descriptions': descriptions})
+        try:
+            self.load_rows(catalog.rows(descriptions=False))
+        except BaseException:
+            catalog.close()
+            raise
+        descriptions.index(self.nodes)
+        
+    def load_rows(self, rows):
+        """Build the hierarchy from (subsystem, module, task, effort, description) tuples"""
+        import gc
+        
+        # Bulk loading only allocates long-lived objects, so cyclic GC passes are wasted work
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._load_rows(rows)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        
+    def _load_rows(self, rows):
         # Use dictionary to track created subsystems and modules
         subsystem_dict = {}
         module_dict = {}
         
-        with open(csv_file_path, 'r', encoding='utf-8', newline='') as file:
-            reader = csv.DictReader(file, 
-                                  quoting=csv.QUOTE_MINIMAL,  # Use standard quote processing
-                                  quotechar='"',             # Specify quote character
-                                  skipinitialspace=True)     # Skip spaces before fields
-            for row in reader:
-                subsystem_name = row['subsystem'].strip()
-                module_name = row['module'].strip()
-                task_name = row['task'].strip()
-                effort = float(row['effort'])
-                description = row['description'].strip()
+        for subsystem_name, module_name, task_name, effort, description in rows:
+            # If subsystem does not exist, create new subsystem
+            if subsystem_name not in subsystem_dict:
+                subsystem = self.add_subsystem(subsystem_name)
+                subsystem._estimator = self
+                subsystem_dict[subsystem_name] = subsystem
                 
-                # If subsystem does not exist, create new subsystem
-                if subsystem_name not in subsystem_dict:
-                    subsystem = self.add_subsystem(subsystem_name)
-                    subsystem._estimator = self
-                    subsystem_dict[subsystem_name] = subsystem
-                    
-                # Get current subsystem
-                subsystem = subsystem_dict[subsystem_name]
-                
-                # If module does not exist, create new module
-                module_key = f"{subsystem_name}_{module_name}"
-                if module_key not in module_dict:
-                    module = subsystem.add_module(module_name)
-                    module_dict[module_key] = module
-                    
-                # Get current module
-                module = module_dict[module_key]
+            # Get current subsystem
+            subsystem = subsystem_dict[subsystem_name]
+            
+            # If module does not exist, create new module
+            module_key = (subsystem_name, module_name)
+            if module_key not in module_dict:
+                module = subsystem.add_module(module_name)
+                module_dict[module_key] = module
                 
-                # Create task with description
-                task = module.add_task(task_name, effort, description)
-                # Initialize task state
-                if subsystem_name not in self.task_states:
-                    self.task_states[subsystem_name] = {}
-                if module_name not in self.task_states[subsystem_name]:
-                    self.task_states[subsystem_name][module_name] = {}
-                self.task_states[subsystem_name][module_name][task_name] = True
+            # Get current module
+            module = module_dict[module_key]
+            
+            # Create task with description
+            task = module.add_task(task_name, effort, description)
+            # Initialize task state and ratio
+            self.store.register_task(subsystem_name, module_name, task_name)
+        
+        # Add "Other" module for manual effort to every subsystem
+        for subsystem in self.subsystems:
+            self._add_other_module(subsystem)
+        
+        self.rollup.invalidate_all()
         
     def add_subsystem(self, subsystem_name):
         subsystem = Subsystem(subsystem_name)
         subsystem._estimator = self  # Set estimator reference
+        self._register_node(subsystem, (subsystem_name,))
         self.subsystems.append(subsystem)
         self.subsystem_names.append(subsystem_name)
-        self.subsystem_states[subsystem_name] = True  # Default on
-        self.module_states[subsystem_name] = {}       # Initialize module state dictionary for this subsystem
-        self.task_states[subsystem_name] = {}         # Initialize task state dictionary for this subsystem
+        self.store.register_subsystem(subsystem_name)  # Default on, empty module/task states
+        self.rollup.invalidate_project()
         return subsystem
         
+    def _add_other_module(self, subsystem):
+        """Helper method: add the "Other" module that holds manual effort"""
+        other_module = Module("Other")
+        other_module._estimator = self
+        other_module._subsystem = subsystem
+        subsystem.modules.append(other_module)
+        self._register_node(other_module, (subsystem.name, "Other"))
+        self.module_states[subsystem.name]["Other"] = True
+        self.rollup.invalidate_subsystem(subsystem)
+        return other_module
+        
+    def apply_catalog_changes(self, added=(), removed=(), changed=()):
+        """Apply tasks added to, removed from or changed in the catalog, keeping every setting
+        
+        added and changed hold ((subsystem, module, task), effort, description)
+        tuples, removed holds (subsystem, module, task) keys. Tasks that stay
+        keep their ratios and switches, and "Other" modules their manual
+        effort. New tasks go at the end of their module, new modules before
+        "Other" and new subsystems after the last one. A module left without
+        tasks is dropped, and so is a subsystem left with only "Other".
+        
+        Observers get one 'catalog' change per affected module, with module
+        None when a whole subsystem was added or dropped. Returns the number
+        of those changes.
+        """
+        touched = {}  # (subsystem, module or None) -> None, in order of change
+        for key in removed:
+            self._remove_task(key, touched)
+        for key, effort, description in changed:
+            task = self.node_index.get(key)
+            if task is None:
+                continue
+            if task.effort != effort:
+                task.effort = effort
+                self.rollup.invalidate_module(self.find_node(*key[:2]))
+            task.description = description
+            touched[key[:2]] = None
+        for key, effort, description in added:
+            if key not in self.node_index:  # First row wins, as on load
+                self._add_task(key, effort, description, touched)
+        for subsystem_name, module_name in touched:
+            self.store.notify('catalog', subsystem_name, module_name)
+        return len(touched)
+        
+    def _add_task(self, key, effort, description, touched):
+        """Helper method: add a task, creating its subsystem and module when new"""
+        subsystem_name, module_name, task_name = key
+        subsystem = self.find_node(subsystem_name)
+        if subsystem is None:
+            subsystem = self.add_subsystem(subsystem_name)
+            self._add_other_module(subsystem)
+            touched[(subsystem_name, None)] = None
+        module = self.find_node(subsystem_name, module_name)
+        if module is None:
+            module = subsystem.add_module(module_name)
+            # "Other" stays the last module
+            if len(subsystem.modules) > 1 and subsystem.modules[-2].key == "Other":
+                subsystem.modules.insert(-1, subsystem.modules.pop())
+        module.add_task(task_name, effort, description)
+        self.store.register_task(subsystem_name, module_name, task_name)
+        self.rollup.invalidate_module(module)
+        touched[(subsystem_name, module_name)] = None
+        
+    def _remove_task(self, key, touched):
+        """Helper method: drop a task, then its module and subsystem once nothing else is left"""
+        subsystem_name, module_name, task_name = key
+        module = self.find_node(subsystem_name, module_name)
+        if module is None or self.node_index.pop(key, None) is None:
+            return
+        self.rollup.invalidate_module(module)
+        for task in module.tasks:
+            if task.name == task_name:
+                self.nodes[task.id] = None  # IDs stay stable; removed nodes leave a hole
+        module.tasks = [task for task in module.tasks if task.name != task_name]
+        self.store.unregister_task(subsystem_name, module_name, task_name)
+        touched[(subsystem_name, module_name)] = None
+        if module.tasks or module.key == "Other":
+            return
+        
+        subsystem = module._subsystem
+        subsystem.modules.remove(module)
+        self.nodes[module.id] = None
+        del self.node_index[(subsystem_name, module_name)]
+        self.store.unregister_module(subsystem_name, module_name)
+        if any(module.key != "Other" for module in subsystem.modules):
+            return
+        
+        self.rollup.invalidate_subsystem(subsystem, modules=True)
+        for module in subsystem.modules:
+            self.nodes[module.id] = None
+            self.node_index.pop((subsystem_name, module.key), None)
+        self.nodes[subsystem.id] = None
+        del self.node_index[(subsystem_name,)]
+        index = self.subsystems.index(subsystem)
+        del self.subsystems[index]
+        del self.subsystem_names[index]
+        self.store.unregister_subsystem(subsystem_name)
+        touched[(subsystem_name, None)] = None
+        
+    def watch_catalog(self, csv_file_path, interval=1000):
+        """Poll the catalog CSV every interval ms and apply its changes in place (after create_ui)"""
+        from tkinter import messagebox
+        from catalog_watch import CatalogWatcher
+        
+        self.catalog_watcher = CatalogWatcher(
+            self, csv_file_path, on_error=lambda message: messagebox.showerror("Error", message))
+        
+        def poll():
+            self.catalog_watcher.poll()
+            self.root.after(interval, poll)
+        self.root.after(interval, poll)
+        return self.catalog_watcher
+        
     def get_total_effort(self):
         """Calculate total effort"""
+        return self.rollup.project_total()
+        
+    def _compute_total_effort(self):
         return sum(
             subsystem.get_total_effort()
             for subsystem in self.subsystems
             if self.subsystem_states.get(subsystem.name, True)
         )
         
+    def open_session(self, path):
+        """Restore settings saved in a session journal and journal every later change"""
+        from session import SessionJournal
+        if self.session is not None:
+            self.session.close()
+        self.session = SessionJournal(self, path).open()
+        return self.session
+        
+    def undo(self):
+        """Revert the last action recorded by the session journal"""
+        return self.session is not None and self.session.undo()
+        
+    def redo(self):
+        """Repeat the last action reverted by undo"""
+        return self.session is not None and self.session.redo()
+        
+    def create_scenario(self, changes=None):
+        """Start a what-if scenario that shares this catalog and stores only its edits"""
+        scenario = ScenarioOverlay(self)
+        if changes:
+            scenario.update(changes)
+        return scenario
+        
+    def to_columns(self, track=True):
+        """Build a columnar NumPy view of the catalog (requires numpy)"""
+        from columnar import TaskColumns
+        return TaskColumns.from_estimator(self, track=track)
+        
+    def to_tree(self):
+        """Build an EffortTree of the catalog and its settings, with O(log n) subtree totals"""
+        from hierarchy import EffortTree
+        return EffortTree.from_estimator(self)
+        
+    def _register_node(self, node, key):
+        """Helper method: assign a stable node ID and index the node by its key"""
+        node.id = len(self.nodes)
+        self.nodes.append(node)
+        # First node wins on duplicate keys, matching the order tasks are summed in
+        self.node_index.setdefault(key, node)
+        
+    def get_node(self, node_id):
+        """Return the subsystem, module or task with the given ID"""
+        return self.nodes[node_id]
+        
+    def find_node(self, subsystem_name, module_name=None, task_name=None):
+        """Constant-time lookup of a subsystem, module or task by key; None if absent"""
+        if module_name is None:
+            return self.node_index.get((subsystem_name,))
+        if task_name is None:
+            return self.node_index.get((subsystem_name, module_name))
+        return self.node_index.get((subsystem_name, module_name, task_name))
+        
+    def _is_module_enabled(self, subsystem_name, module_name):
+        """Helper method: look up a module switch state by module key"""
+        return self.module_states[subsystem_name].get(module_name, True)
+        
+    def _on_model_change(self, kind, subsystem_name, *args):
+        """Store observer: invalidate the rollup path affected by a change"""
+        if kind in ('ratio', 'module', 'manual'):
+            module = self.find_node(subsystem_name, args[0])
+            if module is not None:
+                self.rollup.invalidate_module(module)
+        elif kind == 'subsystem':
+            self.rollup.invalidate_project()
+        
+    def set_manual_effort(self, subsystem_name, effort, comment=""):
+        """Set manual effort and comment on a subsystem's "Other" module"""
+        module = self.find_node(subsystem_name, "Other")
+        if module is None:
+            return None
+        module.manual_effort = effort
+        module.manual_comment = comment
+        # Display name carries the comment; the key stays "Other"
+        module.name = f"Other - {comment}" if comment else "Other"
+        self.store.notify('manual', subsystem_name, "Other")
+        return module
+        
     def display_summary(self):
+        """Print the enabled subsystems, modules and tasks with ratio-weighted efforts and totals"""
+        from report import iter_report
+        
         print("\n软件工作量估算汇总:")
         print("-" * 50)
         
-        for subsystem in self.subsystems:
-            if not self.subsystem_states.get(subsystem.name, True):
+        # Totals come from the same single pass as the rows
+        task_states = self.store.task_states
+        subsystem_name = module_name = None
+        for row in iter_report(self):
+            if row.level == 'project':
+                print(f"\n总工作量: {row.effective}")
                 continue
-                
-            print(f"\n子系统: {subsystem.name}")
-            subsystem_effort = 0
-            
-            for module in subsystem.modules:
-                if not self.module_states[subsystem.name].get(module.name, True):
-                    continue
-                    
-                print(f"  模块: {module.name}")
-                module_effort = 0
-                
-                for task in module.tasks:
-                    if not self.task_states[subsystem.name].get(module.name, {}).get(task.name, True):
-                        continue
-                    
-                    task_effort = task.effort
-                    module_effort += task_effort
-                    print(f"    任务: {task.name} - 工作量: {task_effort}")
-                
-                print(f"  模块总工作量: {module_effort}")
-                subsystem_effort += module_effort
-                
-            print(f"子系统总工作量: {subsystem_effort}")
-            
-        print(f"\n总工作量: {self.get_total_effort()}")
+            if not row.included:
+                continue
+            if row.level == 'task' and not task_states[row.subsystem].get(row.module, {}).get(row.task, True):
+                continue  # Switched-off tasks are not listed
+            if row.subsystem != subsystem_name:
+                subsystem_name, module_name = row.subsystem, None
+                print(f"\n子系统: {row.subsystem}")
+            if row.level == 'subsystem':
+                print(f"子系统总工作量: {row.effective}")
+                continue
+            if row.module != module_name:
+                module_name = row.module
+                print(f"  模块: {row.module}")
+            if row.level == 'task':
+                ratio = f" ({self._format_ratio(row.ratio)}%)" if row.ratio != 100 else ""
+                print(f"    任务: {row.task} - 工作量: {row.effective}{ratio}")
+            elif row.level == 'other':
+                comment = f" - {row.comment}" if row.comment else ""
+                print(f"    其他工作量: {row.effort}{comment}")
+            else:
+                print(f"  模块总工作量: {row.effective}")
 
     def create_ui(self):
         import tkinter as tk
         from tkinter import ttk, messagebox
+        from search import TaskIndex
         
         self.root = tk.Tk()
         self.root.title("Effort Estimation Control Panel")
         
         # Initialize all needed dictionaries
-        self.ui_vars = {subsystem_name: {} for subsystem_name in self.subsystem_names}
+        self.ui_vars = {}  # Tk variables mirroring the model store, see _create_subsystem_column
         self.task_labels = {}
         self.mod_effort_labels = {}
         
-        # Ensure all module states are properly initialized
-        for subsystem_name in self.subsystem_names:
-            self.mod_effort_labels[subsystem_name] = {}
-            # Initialize subsystem variables
-            self.ui_vars[subsystem_name]['var'] = tk.BooleanVar(value=True)
-            self.ui_vars[subsystem_name]['modules'] = {}
-            
-            # Pre-initialize all module and task variables
-            subsystem = next(s for s in self.subsystems if s.name == subsystem_name)
-            for module in subsystem.modules:
-                # Initialize module state
-                if subsystem_name not in self.module_states:
-                    self.module_states[subsystem_name] = {}
-                self.module_states[subsystem_name][module.name] = True
-                
-                self.ui_vars[subsystem_name]['modules'][module.name] = {
-                    'var': tk.BooleanVar(value=True),
-                    'tasks': {}
-                }
-                for task in module.tasks:
-                    self.ui_vars[subsystem_name]['modules'][module.name]['tasks'][task.name] = {
-                        'ratio': tk.StringVar(value="100")
-                    }
+        # Effort labels are refreshed by one idle-time flush per event loop turn
+        self._label_texts = {}  # Label -> text last configured
+        self._dirty_modules = set()  # (subsystem name, module key) paths to refresh
+        self._dirty_subsystems = set()
+        self._catalog_changes = {}  # (subsystem name, module key or None) -> None, from catalog reloads
+        self._refresh_pending = None  # perf_counter() of the first change since the last flush
+        self.last_ui_latency = 0.0
+        self.max_ui_latency = 0.0
+        
+        # Search index over task names and descriptions, built once; it follows catalog reloads
+        if self.search_index is not None:
+            self.search_index.close()
+        self.search_index = TaskIndex(self)
+        self._search_ids = None  # IDs of the tasks matching the search box, None when it is empty
+        self._hidden_modules = {}  # Subsystem name -> module keys hidden by the search
+        self._hidden_columns = set()  # Subsystems hidden by the search
+        self.last_search_latency = 0.0
         
         # Create main frame
         main_frame = ttk.Frame(self.root)
@@ -252,260 +1456,58 @@ class EffortEstimator:
         self.total_effort_value.pack(side=tk.LEFT, padx=5)
         
         # Create horizontally arranged subsystem container
-        subsystems_container = ttk.Frame(system_frame)
-        subsystems_container.pack(fill=tk.X, padx=5, pady=2)
+        self._subsystems_container = ttk.Frame(system_frame)
+        self._subsystems_container.pack(fill=tk.X, padx=5, pady=2)
         
         # Add a new dictionary to store checkbox references
         self.module_checkbuttons = {}
+        self._subsystem_columns = {}  # Subsystem name -> (subsystem ID, column frame, modules frame)
+        self._module_rows = {}  # Subsystem name -> module key -> (module ID, row frame)
         
         # Create a vertical frame for each subsystem
-        for subsystem_name, subsystem in zip(self.subsystem_names, self.subsystems):
-            # Create vertical frame for subsystem
-            subsys_column = ttk.Frame(subsystems_container)
-            subsys_column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
-            
-            # Subsystem title frame
-            subsys_header = ttk.Frame(subsys_column)
-            subsys_header.pack(fill=tk.X)
-            
-            def make_subsystem_callback(s_name):
-                return lambda: self.toggle_subsystem(s_name, self.ui_vars[s_name]['var'].get())
-            
-            # Subsystem checkbox and label
-            subsys_cb = ttk.Checkbutton(
-                subsys_header,
-                text=f"{subsystem_name}",
-                variable=self.ui_vars[subsystem_name]['var'],
-                command=make_subsystem_callback(subsystem_name)
-            )
-            subsys_cb.pack(side=tk.LEFT)
-            
-            self.subsys_effort_labels[subsystem_name] = ttk.Label(
-                subsys_header,
-                text=f"(Total Effort: {subsystem.get_total_effort()})"
-            )
-            self.subsys_effort_labels[subsystem_name].pack(side=tk.LEFT, padx=5)
-            
-            # Initialize dictionary for this subsystem
-            self.module_checkbuttons[subsystem_name] = {}
-            
-            # Add "Other" module for manual effort
-            other_module = Module("Other")
-            other_module._estimator = self
-            subsystem.modules.append(other_module)
-            
-            self.module_states[subsystem_name]["Other"] = True
-            self.ui_vars[subsystem_name]['modules']["Other"] = {
-                'var': tk.BooleanVar(value=True),
-                'tasks': {}
-            }
-            
-            # Module frame with indent
-            modules_frame = ttk.Frame(subsys_column)
-            modules_frame.pack(fill=tk.X, padx=(20, 0))  # Left indent 20 pixels
-            
-            self.task_labels[subsystem_name] = {}
-            
-            # Vertically arrange modules
-            for module in subsystem.modules:
-                mod_name = module.name
-                self.task_labels[subsystem_name][mod_name] = {}
-                
-                mod_var = tk.BooleanVar(value=True)
-                self.ui_vars[subsystem_name]['modules'][mod_name]['var'] = mod_var
-                
-                def make_module_callback(s_name, m_name):
-                    return lambda: self.toggle_module(s_name, m_name, 
-                                                    self.ui_vars[s_name]['modules'][m_name]['var'].get())
-                
-                mod_frame = ttk.Frame(modules_frame)
-                mod_frame.pack(fill=tk.X, pady=1)
-                
-                mod_cb = ttk.Checkbutton(
-                    mod_frame,
-                    text=f"{mod_name}",
-                    variable=mod_var,
-                    command=make_module_callback(subsystem_name, mod_name)
-                )
-                mod_cb.pack(side=tk.LEFT)
-                
-                # Store the checkbox reference
-                self.module_checkbuttons[subsystem_name][mod_name] = mod_cb
-                
-                self.mod_effort_labels[subsystem_name][mod_name] = ttk.Label(
-                    mod_frame,
-                    text=f"(Effort: {module.get_total_effort()})"
-                )
-                self.mod_effort_labels[subsystem_name][mod_name].pack(side=tk.LEFT)
-                
-                # Add double-click event for "Other" module
-                if mod_name == "Other":
-                    def make_edit_callback(s_name, module):
-                        return lambda event: self.edit_other_effort(s_name, module)
-                    
-                    mod_frame.bind('<Double-Button-1>', 
-                                 make_edit_callback(subsystem_name, module))
-                    mod_cb.bind('<Double-Button-1>', 
-                              make_edit_callback(subsystem_name, module))
-                    self.mod_effort_labels[subsystem_name][mod_name].bind(
-                        '<Double-Button-1>', 
-                        make_edit_callback(subsystem_name, module))
+        for subsystem in self.subsystems:
+            self._create_subsystem_column(subsystem)
         
         # Bottom frame: task details
         bottom_frame = ttk.LabelFrame(main_frame, text="Task Details")
         bottom_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # Search box: filters the task lists on every keystroke
+        search_frame = ttk.Frame(bottom_frame)
+        search_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        search_entry.bind('<Escape>', lambda event: self.search_var.set(""))
+        self.search_hierarchy_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            search_frame,
+            text="Filter hierarchy view",
+            variable=self.search_hierarchy_var,
+            command=self._apply_search
+        ).pack(side=tk.LEFT, padx=5)
+        self.search_count_label = ttk.Label(search_frame)
+        self.search_count_label.pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add('write', lambda *args: self._apply_search())
+        
         # Create tab control
         self.notebook = ttk.Notebook(bottom_frame)  # Save as instance variable for other methods to access
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Save tab references for later use
         self.tabs = {}  # Add this dictionary to store tab references
+        self.task_lists = {}  # Subsystem name -> VirtualTaskList, created on first selection
+        self._tab_subsystems = {}  # Tab widget path -> subsystem ID
+        self.viz_tab = None  # Visualization tab, charts built on first selection
+        self.charts = None
         
-        def create_scrollable_frame(parent):
-            """Create a scrollable frame"""
-            # Create container frame
-            container = ttk.Frame(parent)
-            container.pack(fill=tk.BOTH, expand=True)
-            
-            # Create canvas and scrollbar
-            canvas = tk.Canvas(container)
-            scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-            scrollable_frame = ttk.Frame(canvas)
-            
-            # Configure scrolling
-            def configure_scroll_region(event):
-                canvas.configure(scrollregion=canvas.bbox("all"))
-            
-            scrollable_frame.bind("<Configure>", configure_scroll_region)
-            
-            # Create canvas window
-            canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            
-            # Configure canvas size to follow window size
-            def configure_canvas(event):
-                canvas.itemconfig(canvas_window, width=event.width)
-            
-            canvas.bind("<Configure>", configure_canvas)
-            
-            # Place canvas and scrollbar
-            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            # Configure canvas scrolling
-            canvas.configure(yscrollcommand=scrollbar.set)
-            
-            # Configure mouse wheel
-            def on_mousewheel(event):
-                canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-            
-            # Bind mouse wheel event
-            scrollable_frame.bind("<MouseWheel>", on_mousewheel)
-            canvas.bind("<MouseWheel>", on_mousewheel)
-            
-            return scrollable_frame, container
-        
-        # Create a tab for each subsystem
+        # Create an empty tab for each subsystem; contents are built when first selected
         for subsystem in self.subsystems:
-            # Create tab
-            tab = ttk.Frame(self.notebook)
-            self.notebook.add(tab, text=subsystem.name)
-            self.tabs[subsystem.name] = tab  # Save tab reference
-            
-            # Create scrollable frame
-            scrollable_frame, _ = create_scrollable_frame(tab)
-            
-            # Display all modules and tasks in this subsystem on this tab
-            for module in subsystem.modules:
-                module_frame = ttk.LabelFrame(scrollable_frame, text=module.name)
-                module_frame.pack(fill=tk.X, padx=5, pady=2, expand=True)
-                
-                self.task_labels[subsystem.name][module.name] = {}
-                
-                for task in module.tasks:
-                    task_frame = ttk.Frame(module_frame)
-                    task_frame.pack(fill=tk.X, padx=20, pady=1)
-                    
-                    # Remove checkbox variable, use only radiobutton variable
-                    effort_ratio_var = tk.StringVar(value="100")  # Default select 100%
-                    self.ui_vars[subsystem.name]['modules'][module.name]['tasks'][task.name] = {
-                        'ratio': effort_ratio_var
-                    }
-                    
-                    def make_ratio_callback(s_name, m_name, t_name):
-                        def update_effort():
-                            # Only update effort when module is enabled
-                            if self.module_states[s_name].get(m_name, True):
-                                # Update total effort display
-                                total = self.get_total_effort()
-                                self.total_effort_value.configure(text=str(total))
-                                
-                                # Update subsystem effort display
-                                subsystem = self.subsystems[self._get_subsystem_index(s_name)]
-                                subsystem_effort = subsystem.get_total_effort()
-                                self.subsys_effort_labels[s_name].configure(
-                                    text=f"(Total Effort: {subsystem_effort})"
-                                )
-                            
-                            # Always update module effort display (but will show 0 when module is disabled)
-                            module = self.subsystems[self._get_subsystem_index(s_name)].modules[self._get_module_index(s_name, m_name)]
-                            module_effort = module.get_total_effort()
-                            self.mod_effort_labels[s_name][m_name].configure(
-                                text=f"(Effort: {module_effort})"
-                            )
-                        return update_effort
-                    
-                    # Task name label
-                    ttk.Label(
-                        task_frame,
-                        text=task.name
-                    ).grid(row=0, column=0, sticky='w', padx=(0, 10))
-                    
-                    # Create radiobutton frame
-                    radio_frame = ttk.Frame(task_frame)
-                    radio_frame.grid(row=0, column=1, padx=(0, 10))
-                    
-                    # Add four radiobuttons
-                    for ratio, text in [("100", "100%"), ("60", "60%"), ("25", "25%"), ("0", "0%")]:
-                        ttk.Radiobutton(
-                            radio_frame,
-                            text=text,
-                            variable=effort_ratio_var,
-                            value=ratio,
-                            command=make_ratio_callback(subsystem.name, module.name, task.name)
-                        ).pack(side=tk.LEFT, padx=2)
-                    
-                    # Effort label
-                    effort_label = ttk.Label(
-                        task_frame,
-                        text=f"(Effort: {task.effort})"
-                    )
-                    effort_label.grid(row=0, column=2, padx=(0, 10))
-                    
-                    # Separator
-                    ttk.Label(task_frame, text="-").grid(row=0, column=3, padx=5)
-                    
-                    # Description text
-                    description_label = ttk.Label(
-                        task_frame,
-                        text=task.description,
-                        justify=tk.LEFT,
-                        wraplength=800
-                    )
-                    description_label.grid(row=0, column=4, sticky='w', padx=5)
-                    
-                    # Configure column widths and weights
-                    task_frame.grid_columnconfigure(0, minsize=150)  # Task name column
-                    task_frame.grid_columnconfigure(1, minsize=150)  # Radiobutton column
-                    task_frame.grid_columnconfigure(2, minsize=100)  # Effort column
-                    task_frame.grid_columnconfigure(3, minsize=20)   # Separator column
-                    task_frame.grid_columnconfigure(4, weight=1)     # Description text column expandable
-                    
-                    # Save effort label reference
-                    self.task_labels[subsystem.name][module.name][task.name] = effort_label
-                    effort_label.bind('<Double-Button-1>',
-                        lambda e, s=subsystem.name, m=module.name, t=task:
-                        self.edit_other_effort(s, m))
+            self._create_subsystem_tab(subsystem)
+        
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self._build_selected_tab())
+        self._build_selected_tab()
         
         # Set minimum size for main window
         self.root.update()
@@ -516,236 +1518,455 @@ class EffortEstimator:
         # Set initial window size
         self.root.geometry(f"{min_width}x{min_height}")
         
+        # Widgets follow the model store from here on
+        self.store.remove_observer(self._sync_ui)
+        self.store.add_observer(self._sync_ui)
+        
+        # One click or key press is one undo step; the session is compacted on close
+        if self.session is not None:
+            self.session.auto_group(self.root)
+        self.root.bind('<Control-z>', lambda event: self._on_undo_key(event, self.undo))
+        self.root.bind('<Control-y>', lambda event: self._on_undo_key(event, self.redo))
+        self.root.bind('<Control-Shift-Z>', lambda event: self._on_undo_key(event, self.redo))
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # Add visualization tab
         self.create_visualization_tab()
     
+    def _on_undo_key(self, event, action):
+        """Helper method: undo or redo a model change, unless the keys were typed into a text field"""
+        winfo_class = getattr(event.widget, 'winfo_class', None)
+        if winfo_class is not None and winfo_class() in self.TEXT_WIDGET_CLASSES:
+            return
+        action()
+    
+    def _on_close(self):
+        if self.session is not None:
+            self.session.close()
+        self.root.destroy()
+    
+    def _create_subsystem_column(self, subsystem):
+        """Helper method: build the hierarchy view column of a subsystem and its modules"""
+        import tkinter as tk
+        from tkinter import ttk
+        
+        subsystem_name = subsystem.name
+        self.mod_effort_labels[subsystem_name] = {}
+        # Tk variables mirror the model store
+        self.ui_vars[subsystem_name] = {
+            'var': tk.BooleanVar(value=self.subsystem_states[subsystem_name]),
+            'modules': {},
+        }
+        
+        # Create vertical frame for subsystem
+        subsys_column = ttk.Frame(self._subsystems_container)
+        subsys_column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+        
+        # Subsystem title frame
+        subsys_header = ttk.Frame(subsys_column)
+        subsys_header.pack(fill=tk.X)
+        
+        def make_subsystem_callback(subsystem_id):
+            def on_toggle():
+                s_name = self.nodes[subsystem_id].name
+                self.toggle_subsystem(s_name, self.ui_vars[s_name]['var'].get())
+            return on_toggle
+        
+        # Subsystem checkbox and label
+        subsys_cb = ttk.Checkbutton(
+            subsys_header,
+            text=f"{subsystem_name}",
+            variable=self.ui_vars[subsystem_name]['var'],
+            command=make_subsystem_callback(subsystem.id)
+        )
+        subsys_cb.pack(side=tk.LEFT)
+        
+        self.subsys_effort_labels[subsystem_name] = ttk.Label(
+            subsys_header,
+            text=f"(Total Effort: {subsystem.get_total_effort()})"
+        )
+        self.subsys_effort_labels[subsystem_name].pack(side=tk.LEFT, padx=5)
+        
+        # Initialize dictionary for this subsystem
+        self.module_checkbuttons[subsystem_name] = {}
+        self._module_rows[subsystem_name] = {}
+        
+        # Module frame with indent
+        modules_frame = ttk.Frame(subsys_column)
+        modules_frame.pack(fill=tk.X, padx=(20, 0))  # Left indent 20 pixels
+        self._subsystem_columns[subsystem_name] = (subsystem.id, subsys_column, modules_frame)
+        
+        # Vertically arrange modules
+        for module in subsystem.modules:
+            self._create_module_row(subsystem_name, module)
+    
+    def _create_module_row(self, subsystem_name, module, before=None):
+        """Helper method: build a module's checkbox and effort label, optionally before another row"""
+        import tkinter as tk
+        from tkinter import ttk
+        
+        mod_name = module.key
+        # Task ratio variables belong to the visible rows of each task list
+        mod_var = tk.BooleanVar(value=self._is_module_enabled(subsystem_name, mod_name))
+        self.ui_vars[subsystem_name]['modules'][mod_name] = {'var': mod_var}
+        
+        def make_module_callback(module_id):
+            def on_toggle():
+                module = self.nodes[module_id]
+                s_name, m_name = module._subsystem.name, module.key
+                self.toggle_module(s_name, m_name, self.ui_vars[s_name]['modules'][m_name]['var'].get())
+            return on_toggle
+        
+        mod_frame = ttk.Frame(self._subsystem_columns[subsystem_name][2])
+        if before is None:
+            mod_frame.pack(fill=tk.X, pady=1)
+        else:
+            mod_frame.pack(fill=tk.X, pady=1, before=before)
+        self._module_rows[subsystem_name][mod_name] = (module.id, mod_frame)
+        
+        mod_cb = ttk.Checkbutton(
+            mod_frame,
+            text=f"{module.name}",
+            variable=mod_var,
+            command=make_module_callback(module.id)
+        )
+        mod_cb.pack(side=tk.LEFT)
+        
+        # Store the checkbox reference
+        self.module_checkbuttons[subsystem_name][mod_name] = mod_cb
+        
+        self.mod_effort_labels[subsystem_name][mod_name] = ttk.Label(
+            mod_frame,
+            text=f"(Effort: {module.get_total_effort()})"
+        )
+        self.mod_effort_labels[subsystem_name][mod_name].pack(side=tk.LEFT)
+        
+        # Add double-click event for "Other" module
+        if mod_name == "Other":
+            def make_edit_callback(module_id):
+                def on_edit(event):
+                    module = self.nodes[module_id]
+                    self.edit_other_effort(module._subsystem.name, module)
+                return on_edit
+            
+            mod_frame.bind('<Double-Button-1>', 
+                         make_edit_callback(module.id))
+            mod_cb.bind('<Double-Button-1>', 
+                      make_edit_callback(module.id))
+            self.mod_effort_labels[subsystem_name][mod_name].bind(
+                '<Double-Button-1>', 
+                make_edit_callback(module.id))
+    
+    def _create_subsystem_tab(self, subsystem):
+        """Helper method: add an empty Task Details tab, before the Visualization tab if it exists"""
+        from tkinter import ttk
+        
+        tab = ttk.Frame(self.notebook)
+        if self.viz_tab is None:
+            self.notebook.add(tab, text=subsystem.name)
+        else:
+            self.notebook.insert(self.viz_tab, tab, text=subsystem.name)
+        self.tabs[subsystem.name] = tab  # Save tab reference
+        self._tab_subsystems[str(tab)] = subsystem.id
+    
+    def _destroy_module_row(self, subsystem_name, module_name):
+        """Helper method: remove the widgets of a module dropped from the catalog"""
+        module_id, mod_frame = self._module_rows[subsystem_name].pop(module_name)
+        mod_frame.destroy()
+        self._label_texts.pop(self.mod_effort_labels[subsystem_name].pop(module_name), None)
+        del self.module_checkbuttons[subsystem_name][module_name]
+        del self.ui_vars[subsystem_name]['modules'][module_name]
+    
+    def _destroy_subsystem_widgets(self, subsystem_name):
+        """Helper method: remove the column and tab of a subsystem dropped from the catalog"""
+        for module_name in list(self._module_rows[subsystem_name]):
+            self._destroy_module_row(subsystem_name, module_name)
+        self._subsystem_columns.pop(subsystem_name)[1].destroy()
+        self._label_texts.pop(self.subsys_effort_labels.pop(subsystem_name), None)
+        for widgets in (self._module_rows, self.module_checkbuttons, self.mod_effort_labels,
+                        self.ui_vars, self.task_lists):
+            widgets.pop(subsystem_name, None)
+        tab = self.tabs.pop(subsystem_name)
+        self._tab_subsystems.pop(str(tab), None)
+        self.notebook.forget(tab)
+        tab.destroy()
+    
+    def _apply_catalog_to_ui(self):
+        """Helper method: add, remove and refresh the widgets of nodes changed by a catalog reload"""
+        changes, self._catalog_changes = self._catalog_changes, {}
+        # New rows are packed next to rows the search may hide: show the changed subsystems in full
+        for subsystem_name in dict.fromkeys(s_name for s_name, m_name in changes):
+            if self._hidden_modules.pop(subsystem_name, None):
+                self._pack_module_rows(subsystem_name, ())
+        for subsystem_name in dict.fromkeys(s_name for s_name, m_name in changes):
+            subsystem = self.find_node(subsystem_name)
+            column = self._subsystem_columns.get(subsystem_name)
+            if column is not None and (subsystem is None or column[0] != subsystem.id):
+                self._destroy_subsystem_widgets(subsystem_name)
+                column = None
+            if subsystem is None:
+                continue
+            if column is None:
+                self._create_subsystem_column(subsystem)
+                self._create_subsystem_tab(subsystem)
+                continue
+            
+            rows = self._module_rows[subsystem_name]
+            for s_name, module_name in changes:
+                if s_name != subsystem_name or module_name is None:
+                    continue
+                module = self.find_node(subsystem_name, module_name)
+                row = rows.get(module_name)
+                if row is not None and (module is None or row[0] != module.id):
+                    self._destroy_module_row(subsystem_name, module_name)
+                    row = None
+                if module is not None and row is None:
+                    other = rows.get("Other")
+                    self._create_module_row(subsystem_name, module, before=other[1] if other else None)
+                self._dirty_modules.add((subsystem_name, module_name))
+            self._dirty_subsystems.add(subsystem_name)
+            task_list = self.task_lists.get(subsystem_name)
+            if task_list is not None:
+                task_list.reload()
+        if self._search_ids is not None:
+            self._apply_search()  # Added or edited tasks may match now
+    
+    def _apply_search(self):
+        """Filter the task lists, and the hierarchy view if asked, by the search box"""
+        import time
+        
+        start = time.perf_counter()
+        self._search_ids = self.search_index.search(self.search_var.get())
+        # Only the selected task list is filtered now; the others when they are selected
+        self._build_selected_tab()
+        searching = self._search_ids is not None
+        self._filter_hierarchy(self.search_index.modules_of(self._search_ids)
+                               if searching and self.search_hierarchy_var.get() else None)
+        self.search_count_label.configure(text=f"{len(self._search_ids)} tasks" if searching else "")
+        self.last_search_latency = time.perf_counter() - start
+    
+    def _filter_hierarchy(self, shown):
+        """Helper method: show only the modules in shown ((subsystem, module) keys; None shows all)
+        
+        A subsystem without shown modules is hidden as a whole. Only the
+        subsystems whose hidden modules changed are packed again.
+        """
+        import tkinter as tk
+        
+        hidden = {}
+        if shown is not None:
+            shown_names = {}  # Subsystem name -> shown module keys
+            for subsystem_name, module_name in shown:
+                shown_names.setdefault(subsystem_name, set()).add(module_name)
+            for subsystem_name, rows in self._module_rows.items():
+                names = rows.keys() - shown_names.get(subsystem_name, ())
+                if names:
+                    hidden[subsystem_name] = names
+        
+        for subsystem_name in set(hidden) | set(self._hidden_modules):
+            names = hidden.get(subsystem_name, ())
+            if names != self._hidden_modules.get(subsystem_name, ()):
+                self._pack_module_rows(subsystem_name, names)
+        self._hidden_modules = hidden
+        
+        columns = {name for name, names in hidden.items() if len(names) == len(self._module_rows[name])}
+        if columns != self._hidden_columns:
+            for subsystem_name, (subsystem_id, column, modules_frame) in self._subsystem_columns.items():
+                column.pack_forget()
+            for subsystem in self.subsystems:
+                column = self._subsystem_columns.get(subsystem.name)
+                if column is not None and subsystem.name not in columns:  # Not built yet when new
+                    column[1].pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+            self._hidden_columns = columns
+    
+    def _pack_module_rows(self, subsystem_name, hidden):
+        """Helper method: pack the module rows of a subsystem but the hidden ones, in catalog order"""
+        import tkinter as tk
+        
+        rows = self._module_rows.get(subsystem_name)
+        subsystem = self.find_node(subsystem_name)
+        if rows is None or subsystem is None:
+            return  # Dropped from the catalog
+        # Forget and pack again, so rows keep their places
+        for module_id, mod_frame in rows.values():
+            mod_frame.pack_forget()
+        for module in subsystem.modules:
+            row = rows.get(module.key)
+            if row is not None and module.key not in hidden:
+                row[1].pack(fill=tk.X, pady=1)
+    
+    def _build_selected_tab(self):
+        """Build the contents of the selected tab the first time it is shown, and apply the search to it"""
+        selected = self.notebook.select()
+        if self.viz_tab is not None and selected == str(self.viz_tab):
+            if self.charts is None:
+                self.charts = EffortCharts(self.viz_tab, self)
+            elif self.charts.stale:
+                self.charts.update()
+            return
+        subsystem_id = self._tab_subsystems.get(selected)
+        if subsystem_id is None:
+            return
+        subsystem = self.nodes[subsystem_id]
+        if subsystem.name not in self.task_lists:
+            self.task_lists[subsystem.name] = VirtualTaskList(self.tabs[subsystem.name], self, subsystem)
+        task_list = self.task_lists[subsystem.name]
+        if task_list.task_filter is not self._search_ids:
+            task_list.set_filter(self._search_ids)
+    
     def toggle_subsystem(self, subsystem_name, state):
         """Handle when subsystem is selected or deselected"""
         # Update state
-        self.subsystem_states[subsystem_name] = state
+        self.store.set_subsystem_state(subsystem_name, state)
         
         # Switch to corresponding tab
         tab_id = self.notebook.tabs().index(str(self.tabs[subsystem_name]))
         self.notebook.select(tab_id)
         
         # Update module states
-        for module_name in self.module_states[subsystem_name]:
-            self.module_states[subsystem_name][module_name] = state
-            self.ui_vars[subsystem_name]['modules'][module_name]['var'].set(state)
-        
-        # Update summary information
-        self.get_summary()
+        for module_name in list(self.module_states[subsystem_name]):
+            self.store.set_module_state(subsystem_name, module_name, state)
 
     def toggle_module(self, subsystem_name, module_name, enabled):
         """Toggle module enabled/disabled state"""
-        # Update module state
-        self.module_states[subsystem_name][module_name] = enabled
+        # Update module state; the UI observer refreshes the effort displays
+        self.store.set_module_state(subsystem_name, module_name, enabled)
         
         # Switch to corresponding tab
         tab_id = self.notebook.tabs().index(str(self.tabs[subsystem_name]))
         self.notebook.select(tab_id)
-        
-        # Update effort displays
-        target_module = None
-        target_subsystem = None
-        for subsys in self.subsystems:
-            if subsys.name == subsystem_name:
-                target_subsystem = subsys
-                for mod in subsys.modules:
-                    if mod.name.startswith(module_name) or module_name.startswith(mod.name):
-                        target_module = mod
-                        break
-                break
-        
-        if target_module and target_subsystem:
-            # Calculate new efforts
-            module_effort = target_module.get_total_effort()
-            subsystem_effort = target_subsystem.get_total_effort()
-            total_effort = self.get_total_effort()
-            
-            # Update all labels
-            if module_name in self.mod_effort_labels[subsystem_name]:
-                self.mod_effort_labels[subsystem_name][module_name].configure(
-                    text=f"(Effort: {module_effort})"
-                )
-            
-            self.subsys_effort_labels[subsystem_name].configure(
-                text=f"(Total Effort: {subsystem_effort})"
-            )
-            
-            self.total_effort_value.configure(text=str(total_effort))
-        
-        # Force update the UI
-        self.root.update()
 
     def toggle_task(self, subsystem_name, module_name, task_name, state):
-        self.task_states[subsystem_name][module_name][task_name] = state
+        self.store.set_task_state(subsystem_name, module_name, task_name, state)
         
         # When task is enabled, ensure its parent module and subsystem are enabled
         if state:
-            self.subsystem_states[subsystem_name] = True
-            self.module_states[subsystem_name][module_name] = True
-            self.ui_vars[subsystem_name]['var'].set(True)
-            self.ui_vars[subsystem_name]['modules'][module_name]['var'].set(True)
+            self.store.set_subsystem_state(subsystem_name, True)
+            self.store.set_module_state(subsystem_name, module_name, True)
         # Check if module and subsystem need to be disabled
         else:
             all_tasks_disabled = all(not self.task_states[subsystem_name][module_name][task.name] 
-                                   for task in self.subsystems[self._get_subsystem_index(subsystem_name)]
-                                   .modules[self._get_module_index(subsystem_name, module_name)].tasks)
+                                   for task in self.find_node(subsystem_name, module_name).tasks)
             if all_tasks_disabled:
-                self.module_states[subsystem_name][module_name] = False
-                self.ui_vars[subsystem_name]['modules'][module_name]['var'].set(False)
+                self.store.set_module_state(subsystem_name, module_name, False)
                 
                 # Check if subsystem needs to be disabled
-                all_modules_disabled = all(not self.module_states[subsystem_name][mod.name] 
-                                         for mod in self.subsystems[self._get_subsystem_index(subsystem_name)].modules)
+                all_modules_disabled = all(not self._is_module_enabled(subsystem_name, mod.key) 
+                                         for mod in self.find_node(subsystem_name).modules)
                 if all_modules_disabled:
-                    self.subsystem_states[subsystem_name] = False
-                    self.ui_vars[subsystem_name]['var'].set(False)
-        
-        # Update summary information
-        self.get_summary()
+                    self.store.set_subsystem_state(subsystem_name, False)
 
-    def _get_subsystem_index(self, subsystem_name):
-        """Helper method: get subsystem index"""
-        for i, subsystem in enumerate(self.subsystems):
-            if subsystem.name == subsystem_name:
-                return i
-        return -1
+    def _sync_ui(self, kind, subsystem_name, *args):
+        """Store observer: mirror a model change into Tk variables and effort labels"""
+        if kind == 'ratio':
+            module_name, task_name, ratio = args
+            task_list = self.task_lists.get(subsystem_name)
+            if task_list is not None:
+                task_list.refresh_task(module_name, task_name)
+            self._refresh_module_path(subsystem_name, module_name)
+        elif kind == 'module':
+            module_name, enabled = args
+            var = self.ui_vars[subsystem_name]['modules'][module_name]['var']
+            if var.get() != enabled:
+                var.set(enabled)
+            self._refresh_module_path(subsystem_name, module_name)
+        elif kind == 'subsystem':
+            var = self.ui_vars[subsystem_name]['var']
+            if var.get() != args[0]:
+                var.set(args[0])
+            self._schedule_refresh()
+        elif kind == 'manual':
+            # Checkbox shows the renamed "Other - comment" module
+            module = self.find_node(subsystem_name, args[0])
+            self.module_checkbuttons[subsystem_name][args[0]].configure(text=module.name)
+            task_list = self.task_lists.get(subsystem_name)
+            if task_list is not None:
+                task_list.refresh()
+            self._refresh_module_path(subsystem_name, args[0])
+        elif kind == 'catalog':
+            # Widgets of added or removed nodes are reconciled by the next flush
+            self._catalog_changes[(subsystem_name, args[0])] = None
+            self._schedule_refresh()
 
-    def _get_module_index(self, subsystem_name, module_name):
-        """Helper method: get module index"""
-        subsystem = self.subsystems[self._get_subsystem_index(subsystem_name)]
-        for i, module in enumerate(subsystem.modules):
-            if module.name == module_name:
-                return i
-        return -1
+    def _refresh_module_path(self, subsystem_name, module_name):
+        """Helper method: mark module, subsystem and total effort labels for the next flush"""
+        self._dirty_modules.add((subsystem_name, module_name))
+        self._dirty_subsystems.add(subsystem_name)
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """Helper method: flush label updates once the event loop is idle"""
+        if self._refresh_pending is None:
+            import time
+            self._refresh_pending = time.perf_counter()
+            self.root.after_idle(self._flush_refresh)
+    
+    def _flush_refresh(self):
+        """Recompute dirty effort labels and reconfigure only those whose text changed"""
+        import time
+        
+        if self._catalog_changes:
+            self._apply_catalog_to_ui()
+        for subsystem_name, module_name in self._dirty_modules:
+            label = self.mod_effort_labels.get(subsystem_name, {}).get(module_name)
+            module = self.find_node(subsystem_name, module_name)
+            if label is not None and module is not None:
+                self._set_label(label, f"(Effort: {module.get_total_effort()})")
+        for subsystem_name in self._dirty_subsystems:
+            subsystem = self.find_node(subsystem_name)
+            if subsystem is not None:
+                self._set_label(self.subsys_effort_labels[subsystem_name],
+                                f"(Total Effort: {subsystem.get_total_effort()})")
+        self._set_label(self.total_effort_value, str(self.get_total_effort()))
+        self._dirty_modules.clear()
+        self._dirty_subsystems.clear()
+        
+        # Latency of this interaction: first change to labels configured
+        self.last_ui_latency = time.perf_counter() - self._refresh_pending
+        self.max_ui_latency = max(self.max_ui_latency, self.last_ui_latency)
+        self._refresh_pending = None
+    
+    def _set_label(self, label, text):
+        """Helper method: configure a label only when its text differs from what it shows"""
+        if self._label_texts.get(label) != text:
+            self._label_texts[label] = text
+            label.configure(text=text)
+
+    @staticmethod
+    def _format_ratio(ratio):
+        """Helper method: format a ratio the way the radiobutton values are written"""
+        return f"{ratio:g}"
 
     def add_module_to_subsystem(self, subsystem_name, module):
         """Initialize module state when adding module"""
-        self.module_states[subsystem_name][module.name] = True
-        self.task_states[subsystem_name][module.name] = {}
+        if module.id is None:
+            # Index a module created outside Subsystem.add_module
+            module._estimator = self
+            module._subsystem = self.find_node(subsystem_name)
+            self._register_node(module, (subsystem_name, module.key))
+        self.module_states[subsystem_name][module.key] = True
+        self.task_states[subsystem_name][module.key] = {}
+        self.store.ratios[subsystem_name][module.key] = {}
+        for task in module.tasks:
+            self.store.register_task(subsystem_name, module.key, task.name)
+        self.rollup.invalidate_module(module)
         return module
 
     def get_summary(self):
-        """Update all effort displays"""
-        # Update total effort
-        self.total_effort_value.configure(text=str(self.get_total_effort()))
-        
-        # Update effort for each subsystem
+        """Update all effort displays at the next flush"""
         for subsystem in self.subsystems:
-            self.subsys_effort_labels[subsystem.name].configure(
-                text=f"(Total Effort: {subsystem.get_total_effort()})"
-            )
-            # Update effort for each module in this subsystem
+            self._dirty_subsystems.add(subsystem.name)
             for module in subsystem.modules:
-                self.mod_effort_labels[subsystem.name][module.name].configure(
-                    text=f"(Effort: {module.get_total_effort()})"
-                )
+                self._dirty_modules.add((subsystem.name, module.key))
+        self._schedule_refresh()
 
     def create_visualization_tab(self):
-        """Create visualization tab"""
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        from matplotlib.figure import Figure
-        import tkinter as tk
-        from tkinter import ttk  # Add this line import
-        
-        # Create visualization tab
-        viz_tab = ttk.Frame(self.notebook)
-        self.notebook.add(viz_tab, text="Visualization")
-        
-        # Create left and right columns
-        left_frame = ttk.Frame(viz_tab)
-        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        """Create visualization tab; matplotlib is only imported when it is first selected"""
+        from tkinter import ttk
         
-        right_frame = ttk.Frame(viz_tab)
-        right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Create charts
-        def create_subsystem_pie():
-            # Collect data
-            labels = []
-            sizes = []
-            for subsystem in self.subsystems:
-                if self.subsystem_states.get(subsystem.name, True):
-                    effort = subsystem.get_total_effort()
-                    if effort > 0:  # Only show non-zero effort
-                        labels.append(subsystem.name)
-                        sizes.append(effort)
-            
-            # Create pie chart
-            fig = Figure(figsize=(6, 4))
-            ax = fig.add_subplot(111)
-            ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-            ax.axis('equal')
-            ax.set_title('Subsystem Effort Distribution')
-            
-            return fig
-        
-        def create_module_bar():
-            # Collect data
-            modules = []
-            efforts = []
-            colors = []
-            
-            for subsystem in self.subsystems:
-                if self.subsystem_states.get(subsystem.name, True):
-                    for module in subsystem.modules:
-                        if self.module_states[subsystem.name].get(module.name, True):
-                            effort = module.get_total_effort()
-                            if effort > 0:  # Only show non-zero effort
-                                modules.append(f"{subsystem.name}\n{module.name}")
-                                efforts.append(effort)
-                                colors.append(plt.cm.Set3(len(modules) % 12))
-            
-            # Create bar chart
-            fig = Figure(figsize=(6, 4))
-            ax = fig.add_subplot(111)
-            bars = ax.bar(range(len(modules)), efforts, color=colors)
-            ax.set_xticks(range(len(modules)))
-            ax.set_xticklabels(modules, rotation=45, ha='right')
-            ax.set_title('Module Effort Comparison')
-            ax.set_ylabel('Effort')
-            
-            # Add value labels
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}',
-                       ha='center', va='bottom')
-            
-            fig.tight_layout()
-            return fig
-        
-        # Create chart display area
-        pie_canvas = FigureCanvasTkAgg(create_subsystem_pie(), left_frame)
-        pie_canvas.draw()
-        pie_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        bar_canvas = FigureCanvasTkAgg(create_module_bar(), right_frame)
-        bar_canvas.draw()
-        bar_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Add refresh button
-        def refresh_charts():
-            # Clear old charts
-            for widget in left_frame.winfo_children():
-                widget.destroy()
-            for widget in right_frame.winfo_children():
-                widget.destroy()
-            
-            # Create new charts
-            pie_canvas = FigureCanvasTkAgg(create_subsystem_pie(), left_frame)
-            pie_canvas.draw()
-            pie_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            bar_canvas = FigureCanvasTkAgg(create_module_bar(), right_frame)
-            bar_canvas.draw()
-            bar_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        ttk.Button(viz_tab, text="Refresh Charts", command=refresh_charts).pack(pady=5)
-
+        self.viz_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.viz_tab, text="Visualization")
+    
     def edit_other_effort(self, subsystem_name, module):
         """Edit Other module effort and comment dialog"""
         import tkinter as tk
@@ -787,47 +2008,8 @@ class EffortEstimator:
                     comment_entry.focus()
                     return
                 
-                # Update module data
-                module.manual_effort = new_effort
-                module.manual_comment = comment
-                
-                # Update display text
-                display_text = f"Other - {module.manual_comment}" if module.manual_comment else "Other"
-                
-                # Update the module name and UI
-                for subsys in self.subsystems:
-                    if subsys.name == subsystem_name:
-                        for mod in subsys.modules:
-                            if mod.name.startswith("Other"):
-                                # Update the name
-                                mod.name = display_text
-                                
-                                # Update the checkbox text
-                                self.module_checkbuttons[subsystem_name]["Other"].configure(text=display_text)
-                                
-                                # Update module effort label
-                                module_effort = mod.get_total_effort()
-                                
-                                # Update effort labels
-                                self.mod_effort_labels[subsystem_name]["Other"].configure(
-                                    text=f"(Effort: {module_effort})"
-                                )
-                                
-                                # Update subsystem total
-                                subsystem_effort = subsys.get_total_effort()
-                                self.subsys_effort_labels[subsystem_name].configure(
-                                    text=f"(Total Effort: {subsystem_effort})"
-                                )
-                                
-                                # Update total project effort
-                                total_effort = self.get_total_effort()
-                                self.total_effort_value.configure(text=str(total_effort))
-                                
-                                break
-                        break
-                
-                # Force update the UI
-                self.root.update()
+                # Update module data; the UI observer renames the checkbox and refreshes labels
+                self.set_manual_effort(subsystem_name, new_effort, comment)
                 dialog.destroy()
                 
             except ValueError as e:
@@ -853,9 +2035,24 @@ class EffortEstimator:
 
 # Modify main program entry
 if __name__ == "__main__":
+    import argparse
+    import sys
+    from instrumentation import configure
+    from session import session_path_for
+    
+    parser = argparse.ArgumentParser(description="Effort Estimation Control Panel")
+    parser.add_argument('--profile', help="write hot-path timings here at exit (.trace.json: Chrome trace)")
+    args = parser.parse_args()
+    # Opt-in profiling, also enabled by the EFFORT_PROFILE environment variable
+    configure(args.profile, sys.modules[__name__])
+    
     # Initialize estimator with CSV file
-    estimator = EffortEstimator("effort_data.csv")
+    estimator = EffortEstimator("effort_data.csv", cache=True)
+    # Restore the settings of the last session
+    estimator.open_session(session_path_for("effort_data.csv"))
     # Start UI interface
     estimator.create_ui()
+    # Pick up edits of the CSV while the panel is open
+    estimator.watch_catalog("effort_data.csv")
     # Call mainloop here
     estimator.root.mainloop()
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""Effort catalogs of any depth, with subtree totals in O(log n)
+
+A path-style catalog names each task by its full path in one column:
+
+    path,effort,description
+    Program A/Payments/Gateway/Card API/Design,40,Interface design
+    Program A/Payments/Gateway/Card API/QA,25,Regression suite
+
+Catalogs in the effort_data.csv format load as well: their subsystem,
+module and task columns form three-segment paths.
+
+Nodes are numbered in depth-first preorder (an Euler tour keeping entry
+times only), so the subtree of node v is the contiguous range
+[v, v + size[v]). Each position holds the node's own effort - effort x ratio
+for a task, manual effort for any node - in a Fenwick tree, and a subtree
+total is the difference of two prefix sums. Switching a node off stores its
+current total, negated, at its own position: one point update that takes
+the subtree out of every ancestor. A later change beneath a switched-off
+node moves that compensation along, so ancestors above it do not change.
+Every edit is a fixed number of O(log n) point updates, plus a walk up to
+the nearest switched-off ancestor (O(depth)) while any node is off.
+
+Totals follow the estimator's subsystems and project: a switched-off node
+keeps its own total, and only its ancestors leave it out (a switched-off
+subsystem still reports its sum, but the project total excludes it). The
+compensation stored at the node is simply left out of its own total. The
+one difference is a switched-off module: the estimator's
+Module.get_total_effort() reports 0 for it, while total() reports its sum.
+Prefix-sum differences round differently from summing in order, so totals
+are rounded to TOTAL_DIGITS decimals.
+"""
+import sys
+
+PATH_COLUMN = 'path'
+SEPARATOR = '/'
+TOTAL_DIGITS = 6
+
+
+class FenwickTree:
+    """Prefix sums over a sequence of numbers, with O(log n) point updates and queries"""
+    __slots__ = ('tree',)
+
+    def __init__(self, values):
+        tree = [0.0]
+        tree.extend(values)
+        size = len(tree)
+        for index in range(1, size):  # Linear-time construction
+            parent = index + (index & -index)
+            if parent < size:
+                tree[parent] += tree[index]
+        self.tree = tree
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    def add(self, index, delta):
+        tree = self.tree
+        size = len(tree)
+        index += 1
+        while index < size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, end):
+        """Sum of the values before position end"""
+        tree = self.tree
+        total = 0.0
+        while end > 0:
+            total += tree[end]
+            end &= end - 1
+        return total
+
+    def range_sum(self, start, end):
+        return self.prefix_sum(end) - self.prefix_sum(start)
+
+
+def read_path_rows(csv_file_path, path_column=PATH_COLUMN, separator=SEPARATOR):
+    """Stream (path tuple, effort, description) rows from a path-style or effort_data.csv catalog"""
+    import csv
+    import os
+    from estimator import read_csv_rows
+
+    if not os.path.exists(csv_file_path):
+        raise FileNotFoundError(f"找不到CSV文件: {csv_file_path}")
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file, quoting=csv.QUOTE_MINIMAL, quotechar='"', skipinitialspace=True)
+        header = [name.strip().lstrip('\ufeff') for name in next(reader, [])]
+        if path_column not in header:
+            if not {'subsystem', 'module', 'task'} <= set(header):
+                raise ValueError(f"CSV文件缺少列: {path_column}")
+            # Three-level catalog: subsystem/module/task is the path
+            for subsystem_name, module_name, task_name, effort, description in read_csv_rows(csv_file_path):
+                yield (subsystem_name, module_name, task_name), effort, description
+            return
+        missing = [name for name in ('effort', 'description') if name not in header]
+        if missing:
+            raise ValueError(f"CSV文件缺少列: {', '.join(missing)}")
+        p_col, e_col, d_col = (header.index(name) for name in (path_column, 'effort', 'description'))
+
+        intern = sys.intern
+        descriptions = {}
+        prefixes = {}  # Parent path text -> tuple, shared by all tasks of one parent
+        for row in reader:
+            if not row:
+                continue  # Skip blank lines
+            prefix_text, _, name = row[p_col].rpartition(separator)
+            prefix = prefixes.get(prefix_text)
+            if prefix is None:
+                prefix = prefixes[prefix_text] = tuple(
+                    intern(segment.strip()) for segment in prefix_text.split(separator)) if prefix_text else ()
+            description = row[d_col].strip()
+            yield (prefix + (intern(name.strip()),), float(row[e_col]),
+                   descriptions.setdefault(description, description))
+
+
+class EffortTree:
+    """Effort hierarchy of any depth in preorder arrays, with Fenwick-tree subtree totals
+
+    Node 0 is the root (empty path). Per-node lists: names, parent, size
+    (nodes in the subtree, itself included), depth, effort (None for nodes
+    that are not tasks), ratio (percent), manual (manual effort), enabled
+    and descriptions.
+    """
+    def __init__(self, rows):
+        # Build the tree in row order first; nodes are renumbered in preorder below
+        names, parents, efforts, descriptions = [""], [-1], [None], [""]
+        children = [[]]
+        lookup = {}  # (parent, name) -> node, first node wins on duplicate paths
+        
+        def add_node(parent, name):
+            node = len(names)
+            names.append(name)
+            parents.append(parent)
+            efforts.append(None)
+            descriptions.append("")
+            children.append([])
+            children[parent].append(node)
+            lookup.setdefault((parent, name), node)
+            return node
+        
+        parent_nodes = {(): 0}  # Parent path -> node; consecutive rows mostly share one
+        for path, effort, description in rows:
+            parent = parent_nodes.get(path[:-1])
+            if parent is None:
+                parent = 0
+                for name in path[:-1]:
+                    node = lookup.get((parent, name))
+                    parent = add_node(parent, name) if node is None else node
+                parent_nodes[path[:-1]] = parent
+            node = lookup.get((parent, path[-1]))
+            # A task row whose path is taken by an earlier task becomes a sibling task
+            if node is None or (effort is not None and efforts[node] is not None):
+                node = add_node(parent, path[-1])
+            if effort is not None:
+                efforts[node] = effort
+                descriptions[node] = description
+
+        order = []  # Preorder: every subtree is a contiguous run
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(reversed(children[node]))
+        position = [0] * len(order)
+        for index, node in enumerate(order):
+            position[node] = index
+
+        self.names = [names[node] for node in order]
+        self.parent = [position[parents[node]] if node else -1 for node in order]
+        self.effort = [efforts[node] for node in order]
+        self.descriptions = [descriptions[node] for node in order]
+        self.depth = [0] * len(order)
+        for node in range(1, len(order)):
+            self.depth[node] = self.depth[self.parent[node]] + 1
+        self.size = [1] * len(order)
+        for node in range(len(order) - 1, 0, -1):
+            self.size[self.parent[node]] += self.size[node]
+        self.ratio = [100] * len(order)
+        self.manual = [0] * len(order)
+        self.enabled = [True] * len(order)
+        self._children = {(position[parent], name): position[child]
+                          for (parent, name), child in lookup.items()}
+        self._compensation = {}  # Switched-off node -> negated total stored at its position
+        # Every ratio starts at 100% and no manual effort is set yet
+        self._sums = FenwickTree(0.0 if effort is None else effort for effort in self.effort)
+
+    @classmethod
+    def from_csv(cls, csv_file_path, path_column=PATH_COLUMN, separator=SEPARATOR):
+        return cls(read_path_rows(csv_file_path, path_column, separator))
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """Tree of a loaded estimator's catalog with its ratios, switches and manual efforts
+
+        Task switches are not copied: the estimator does not count them in totals.
+        """
+        tree = cls(
+            row
+            for subsystem in estimator.subsystems
+            for module in subsystem.modules
+            for row in ([((subsystem.name, module.key, task.name), task.effort, task.description)
+                         for task in module.tasks] or [((subsystem.name, module.key), None, "")])
+        )
+        store = estimator.store
+        for subsystem in estimator.subsystems:
+            for module in subsystem.modules:
+                node = tree.find((subsystem.name, module.key))
+                for task in module.tasks:
+                    ratio = store.get_ratio(subsystem.name, module.key, task.name)
+                    if ratio != 100:
+                        tree.set_ratio(tree.find((subsystem.name, module.key, task.name)), ratio)
+                if module.manual_effort:
+                    tree.set_manual_effort(node, module.manual_effort)
+                if not estimator._is_module_enabled(subsystem.name, module.key):
+                    tree.set_enabled(node, False)
+            if not estimator.subsystem_states.get(subsystem.name, True):
+                tree.set_enabled(tree.find((subsystem.name,)), False)
+        return tree
+
+    def __len__(self):
+        return len(self.names)
+
+    def _own_value(self, node):
+        effort = self.effort[node]
+        value = self.manual[node]
+        if effort is not None:
+            value += effort * (self.ratio[node] / 100)
+        return value
+
+    def find(self, path):
+        """Node of a path (tuple or separator-joined string); None if absent"""
+        if isinstance(path, str):
+            path = tuple(path.split(SEPARATOR)) if path else ()
+        node = 0
+        for name in path:
+            node = self._children.get((node, name))
+            if node is None:
+                return None
+        return node
+
+    def path(self, node):
+        names = []
+        while node > 0:
+            names.append(self.names[node])
+            node = self.parent[node]
+        return tuple(reversed(names))
+
+    def children(self, node):
+        """Child nodes in catalog order"""
+        child = node + 1
+        end = node + self.size[node]
+        while child < end:
+            yield child
+            child += self.size[child]
+
+    def subtree(self, node):
+        """Range of the nodes in a node's subtree, the node itself first"""
+        return range(node, node + self.size[node])
+
+    def is_task(self, node):
+        return self.effort[node] is not None
+
+    def total(self, node=0):
+        """Effort of a node's subtree, switched-off descendants left out: O(log n)"""
+        total = self._sums.range_sum(node, node + self.size[node])
+        if not self.enabled[node]:
+            total -= self._compensation[node]  # Counts towards its own total, not its ancestors'
+        return round(total, TOTAL_DIGITS)
+
+    def _shift(self, node, delta, owner):
+        """Helper method: add delta at node's position, absorbed by the nearest switched-off owner or ancestor"""
+        if not delta:
+            return
+        sums = self._sums
+        sums.add(node, delta)
+        if not self._compensation:
+            return
+        enabled, parent = self.enabled, self.parent
+        while owner >= 0 and enabled[owner]:
+            owner = parent[owner]
+        if owner >= 0:
+            # Keep the switched-off subtree at 0 and everything above it unchanged
+            self._compensation[owner] -= delta
+            sums.add(owner, -delta)
+
+    def _check_task(self, node):
+        if self.effort[node] is None:
+            raise ValueError(f"not a task: {SEPARATOR.join(self.path(node))}")
+
+    def set_effort(self, node, effort):
+        self._check_task(node)
+        before = self._own_value(node)
+        self.effort[node] = effort
+        self._shift(node, self._own_value(node) - before, node)
+
+    def set_ratio(self, node, ratio):
+        self._check_task(node)
+        before = self._own_value(node)
+        self.ratio[node] = ratio
+        self._shift(node, self._own_value(node) - before, node)
+
+    def set_manual_effort(self, node, effort):
+        before = self._own_value(node)
+        self.manual[node] = effort
+        self._shift(node, self._own_value(node) - before, node)
+
+    def set_enabled(self, node, enabled):
+        """Switch a node's subtree on or off: O(log n) at any depth"""
+        if self.enabled[node] == enabled:
+            return
+        if enabled:
+            delta = -self._compensation.pop(node)
+            self.enabled[node] = True
+        else:
+            delta = -self._sums.range_sum(node, node + self.size[node])
+            self.enabled[node] = False
+            self._compensation[node] = delta
+        self._shift(node, delta, self.parent[node])
@@ -0,0 +1,224 @@
+"""Opt-in profiling of the estimator's hot paths
+
+Enable it with the EFFORT_PROFILE environment variable or the --profile
+option of estimator.py, batch.py and server.py, giving the output file:
+
+    EFFORT_PROFILE=profile.json python estimator.py
+    python batch.py scenarios.jsonl --profile profile.trace.json
+
+While enabled, every call of the methods listed in TARGETS (catalog loading,
+get_total_effort and recomputes at module, subsystem and project level, UI
+callbacks, label refreshes, chart updates and rendering) is counted and its
+latency added to a log2 histogram. The file is written at exit: JSON stats
+per call site, or, for names ending in .trace.json, a Chrome trace
+(chrome://tracing, Perfetto) with one event per call and the same stats.
+
+Instrumentation works by wrapping those methods when enable() is called, so
+when it is not enabled the estimator runs its original, unwrapped code.
+Forked batch workers keep their own stats; only the parent's are written.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+ENV_VAR = 'EFFORT_PROFILE'
+MAX_EVENTS = 1000000  # Trace events kept; later calls are counted but not traced
+
+# (class, method, label) of every instrumented call site in estimator.py
+TARGETS = (
+    ('EffortEstimator', 'load_data_from_csv', 'load.csv'),
+    ('EffortEstimator', 'load_rows', 'load.rows'),
+    ('EffortEstimator', 'apply_catalog_changes', 'load.hot_reload'),
+    ('EffortEstimator', 'get_total_effort', 'total.project'),
+    ('EffortEstimator', '_compute_total_effort', 'recompute.project'),
+    ('Subsystem', 'get_total_effort', 'total.subsystem'),
+    ('Subsystem', '_compute_total_effort', 'recompute.subsystem'),
+    ('Module', 'get_total_effort', 'total.module'),
+    ('Module', '_compute_total_effort', 'recompute.module'),
+    ('ScenarioOverlay', 'get_total_effort', 'total.scenario'),
+    ('EffortEstimator', 'toggle_subsystem', 'ui.toggle_subsystem'),
+    ('EffortEstimator', 'toggle_module', 'ui.toggle_module'),
+    ('EffortEstimator', 'toggle_task', 'ui.toggle_task'),
+    ('EffortEstimator', 'edit_other_effort', 'ui.edit_other_effort'),
+    ('EffortEstimator', 'set_manual_effort', 'ui.set_manual_effort'),
+    ('EffortEstimator', '_apply_search', 'ui.search'),
+    ('VirtualTaskList', '_on_ratio', 'ui.ratio'),
+    ('VirtualTaskList', 'render', 'ui.task_list_render'),
+    ('EffortEstimator', 'get_summary', 'ui.get_summary'),
+    ('EffortEstimator', '_flush_refresh', 'ui.label_refresh'),
+    ('EffortEstimator', 'create_ui', 'ui.create'),
+    ('EffortCharts', '__init__', 'charts.build'),
+    ('EffortCharts', 'update', 'charts.update'),
+)
+
+_profiler = None  # Active Profiler, if any
+
+
+class Metric:
+    """Call count, total and maximum latency, and a log2 latency histogram"""
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * 64  # Bucket b counts latencies in [2**(b-1), 2**b) ns
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[elapsed.bit_length()] += 1
+
+    def percentile(self, percentile):
+        """Upper bound in ns of the histogram bucket holding the given percentile"""
+        target = self.count * percentile / 100
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(1 << bucket, self.max)
+        return 0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total / 1e6,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0.0,
+            'p50_us': self.percentile(50) / 1e3,
+            'p95_us': self.percentile(95) / 1e3,
+            'p99_us': self.percentile(99) / 1e3,
+            'max_us': self.max / 1e3,
+            # Upper bound in us -> calls, for the non-empty buckets
+            'histogram_us': {f"{(1 << bucket) / 1e3:g}": count
+                             for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+class Profiler:
+    """Collects metrics, and trace events when trace is set, from the wrapped methods"""
+    def __init__(self, trace=False):
+        self.metrics = {}  # label -> Metric
+        self.trace = trace
+        self.events = []   # (label, start ns, elapsed ns, thread id)
+        self.dropped = 0
+        self.origin = time.perf_counter_ns()
+        self._patched = []  # (class, method name, original attribute)
+
+    def record(self, label, start, elapsed):
+        metric = self.metrics.get(label)
+        if metric is None:
+            metric = self.metrics[label] = Metric()
+        metric.add(elapsed)
+        if self.trace:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append((label, start, elapsed, threading.get_ident()))
+            else:
+                self.dropped += 1
+
+    def wrap(self, label, func):
+        """A wrapper of func that records every call under label"""
+        record = self.record
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, start, clock() - start)
+        timed.__wrapped_by_profiler__ = True
+        return timed
+
+    def patch(self, cls, name, label):
+        original = getattr(cls, name, None)
+        if original is None or getattr(original, '__wrapped_by_profiler__', False):
+            return
+        # Inherited methods are shadowed on cls and removed again by unpatch
+        self._patched.append((cls, name, cls.__dict__.get(name)))
+        setattr(cls, name, self.wrap(label, original))
+
+    def unpatch(self):
+        for cls, name, original in reversed(self._patched):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._patched.clear()
+
+    def stats(self):
+        return {label: metric.as_dict() for label, metric in sorted(self.metrics.items())}
+
+    def chrome_trace(self):
+        """Chrome trace-event JSON object: one complete ('X') event per recorded call"""
+        pid = os.getpid()
+        events = [{'name': label, 'cat': label.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': (start - self.origin) / 1e3, 'dur': elapsed / 1e3}
+                  for label, start, elapsed, tid in self.events]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped}, 'stats': self.stats()}
+
+    def dump(self, path):
+        """Write stats JSON, or a Chrome trace for paths ending in .trace.json"""
+        data = self.chrome_trace() if path.endswith('.trace.json') else {'stats': self.stats()}
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=1 if not self.trace else None)
+
+
+def enable(path=None, module=None):
+    """Wrap the hot paths of an estimator module (default: import estimator); returns the Profiler
+
+    With a path the results are written there when the process exits. Pass
+    the running module when estimator.py is executed as a script.
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    if module is None:
+        import estimator as module
+    _profiler = Profiler(trace=bool(path) and path.endswith('.trace.json'))
+    for class_name, method, label in TARGETS:
+        _profiler.patch(getattr(module, class_name), method, label)
+    _instrument_chart_rendering(module.EffortCharts)
+    if path:
+        atexit.register(_profiler.dump, path)
+    return _profiler
+
+
+def _instrument_chart_rendering(charts_class):
+    """Time the Matplotlib canvas draws of the charts, once the backend has been imported"""
+    build = charts_class.__init__
+
+    @functools.wraps(build)
+    def build_and_instrument(self, *args, **kwargs):
+        build(self, *args, **kwargs)
+        if _profiler is not None:
+            _profiler.patch(type(self.pie_canvas), 'draw', 'charts.render')
+    build_and_instrument.__wrapped_by_profiler__ = True
+    _profiler._patched.append((charts_class, '__init__', build))
+    charts_class.__init__ = build_and_instrument
+
+
+def disable():
+    """Restore the original methods; the collected results are dropped"""
+    global _profiler
+    if _profiler is not None:
+        _profiler.unpatch()
+        _profiler = None
+
+
+def get_profiler():
+    return _profiler
+
+
+def configure(path=None, module=None):
+    """Enable profiling when a path is given or EFFORT_PROFILE is set; for the command-line tools"""
+    path = path or os.environ.get(ENV_VAR)
+    if path:
+        return enable(path, module)
+    return None
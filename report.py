@@ -0,0 +1,150 @@
+"""Streaming effort reports as CSV, JSON Lines or Markdown
+
+Usage: python report.py [--csv effort_data.csv] [--session FILE] [--format csv|jsonl|markdown]
+                        [--levels LEVEL [LEVEL ...]] [--output FILE]
+
+iter_report walks the catalog once and yields one ReportRow per task, per
+"Other" manual entry and per module, subsystem and project total, in
+hierarchy order with every total right after its children:
+
+    task       effort from the catalog, ratio in percent, effective = effort x ratio
+    other      manual effort and comment of a subsystem's "Other" module
+    module     effective = module total
+    subsystem  effective = subsystem total
+    project    effective = project total
+
+Totals are accumulated along the way in the order the estimator sums them,
+so they equal get_total_effort() and friends exactly without computing them
+again. included tells whether a row counts towards the project total, i.e.
+its module and subsystem are switched on. Rows are written as they are
+produced, so memory does not grow with the catalog.
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import namedtuple
+
+LEVELS = ('task', 'other', 'module', 'subsystem', 'project')
+FORMATS = ('csv', 'jsonl', 'markdown')
+
+ReportRow = namedtuple('ReportRow', 'level subsystem module task effort ratio effective included comment')
+
+
+def iter_report(estimator, levels=LEVELS):
+    """Yield the ReportRows of an estimator's catalog and settings, totals after their children"""
+    levels = frozenset(levels)
+    store = estimator.store
+    project_total = 0
+    for subsystem in estimator.subsystems:
+        subsystem_name = subsystem.name
+        subsystem_on = store.subsystem_states.get(subsystem_name, True)
+        module_states = store.module_states.get(subsystem_name, {})
+        subsystem_total = 0
+        for module in subsystem.modules:
+            module_on = module_states.get(module.key, True)
+            included = subsystem_on and module_on
+            ratios = store.ratios[subsystem_name].get(module.key, {})
+            module_total = 0
+            for task in module.tasks:
+                ratio = ratios[task.name]
+                effective = task.effort * (ratio / 100)
+                module_total += effective
+                if 'task' in levels:
+                    yield ReportRow('task', subsystem_name, module.key, task.name, task.effort, ratio,
+                                    effective, included, task.description)
+            if module.key == "Other":
+                module_total += module.manual_effort
+                if 'other' in levels and (module.manual_effort or module.manual_comment):
+                    yield ReportRow('other', subsystem_name, module.key, None, module.manual_effort, None,
+                                    module.manual_effort, included, module.manual_comment)
+            if not module_on:
+                module_total = 0  # A switched-off module totals 0, as in Module.get_total_effort
+            else:
+                subsystem_total += module_total
+            if 'module' in levels:
+                yield ReportRow('module', subsystem_name, module.key, None, None, None,
+                                module_total, included, None)
+        if not module_states:
+            subsystem_total = 0
+        if subsystem_on:
+            project_total += subsystem_total
+        if 'subsystem' in levels:
+            yield ReportRow('subsystem', subsystem_name, None, None, None, None,
+                            subsystem_total, subsystem_on, None)
+    if 'project' in levels:
+        yield ReportRow('project', None, None, None, None, None, project_total, True, None)
+
+
+def write_csv(rows, file):
+    writer = csv.writer(file)
+    writer.writerow(ReportRow._fields)
+    for row in rows:
+        writer.writerow(row)
+
+
+def write_jsonl(rows, file):
+    for row in rows:
+        file.write(json.dumps(row._asdict(), ensure_ascii=False) + "\n")
+
+
+def _markdown_cell(value):
+    """Helper method: one Markdown table cell; numbers with up to two decimals"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, (int, float)):
+        return f"{value:,.2f}".rstrip('0').rstrip('.')
+    return str(value).replace("\\", "\\\\").replace("|", "\\|").replace("\n", " ")
+
+
+def write_markdown(rows, file):
+    """Write a Markdown table; totals are bold"""
+    file.write("| " + " | ".join(ReportRow._fields) + " |\n")
+    file.write("|" + "---|" * len(ReportRow._fields) + "\n")
+    for row in rows:
+        cells = [_markdown_cell(value) for value in row]
+        if row.level in ('module', 'subsystem', 'project'):
+            cells[6] = f"**{cells[6]}**"
+        file.write("| " + " | ".join(cells) + " |\n")
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'markdown': write_markdown}
+
+
+def write_report(estimator, file, format='csv', levels=LEVELS):
+    """Stream a report of the estimator to a text file in one of FORMATS"""
+    if format not in WRITERS:
+        raise ValueError(f"unknown report format: {format} (choose from {', '.join(FORMATS)})")
+    WRITERS[format](iter_report(estimator, levels), file)
+
+
+def main():
+    from estimator import EffortEstimator
+    from instrumentation import configure
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default='effort_data.csv', help="catalog CSV file")
+    parser.add_argument('--session', help="restore the settings saved in this session journal")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--levels', nargs='+', choices=LEVELS, default=list(LEVELS),
+                        help="row levels to include (default: all)")
+    parser.add_argument('--output', help="write the report here instead of stdout")
+    parser.add_argument('--profile', help="write hot-path timings here at exit (.trace.json: Chrome trace)")
+    args = parser.parse_args()
+    configure(args.profile)
+
+    estimator = EffortEstimator(args.csv, cache=True)
+    if args.session:
+        from session import SessionJournal
+        SessionJournal(estimator, args.session).restore()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            write_report(estimator, file, args.format, args.levels)
+    else:
+        write_report(estimator, sys.stdout, args.format, args.levels)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Inverted index over task names and descriptions, for the Task Details search box
+
+Text is lowercased and split into terms: runs of ASCII letters and digits,
+and single characters of other scripts, so Chinese descriptions are
+searchable without a word segmenter. A query matches the tasks containing
+all of its terms; the last term may be a prefix, so results follow the
+user while a word is still being typed ("otp prog" finds "OTP programming").
+
+Postings are sets of task node IDs, intersected smallest first. Prefixes are
+resolved through a sorted vocabulary with bisect. The index follows catalog
+reloads module by module (the store's 'catalog' changes), so it is built
+once and never rebuilt.
+"""
+import re
+from bisect import bisect_left, insort
+
+_TERM = re.compile(r'[0-9a-z]+|[^\W0-9a-z_]')
+
+
+def terms_of(text):
+    return _TERM.findall(text.lower())
+
+
+class TaskIndex:
+    """Term -> task IDs index of an estimator's catalog"""
+    def __init__(self, estimator):
+        self._estimator = estimator
+        self._postings = {}     # Term -> set of task IDs
+        self._vocabulary = []   # Sorted terms, for prefix lookups
+        self._terms = {}        # Task ID -> its distinct terms, to unindex it
+        self._owners = {}       # Task ID -> (subsystem, module) key
+        self._modules = {}      # (subsystem, module) -> IDs of its indexed tasks
+        postings = self._postings
+        for subsystem in estimator.subsystems:
+            for module in subsystem.modules:
+                key = (subsystem.name, module.key)
+                ids = self._modules[key] = []
+                for task in module.tasks:
+                    terms = self._terms[task.id] = frozenset(terms_of(task.name) + terms_of(task.description))
+                    for term in terms:
+                        posting = postings.get(term)
+                        if posting is None:
+                            posting = postings[term] = set()
+                        posting.add(task.id)
+                    self._owners[task.id] = key
+                    ids.append(task.id)
+        self._vocabulary = sorted(postings)
+        estimator.store.add_observer(self._on_model_change)
+
+    def __len__(self):
+        return len(self._terms)
+
+    def close(self):
+        self._estimator.store.remove_observer(self._on_model_change)
+
+    def _add(self, task, key):
+        terms = self._terms[task.id] = frozenset(terms_of(task.name) + terms_of(task.description))
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = set()
+                insort(self._vocabulary, term)
+            posting.add(task.id)
+        self._owners[task.id] = key
+
+    def _remove(self, task_id):
+        for term in self._terms.pop(task_id):
+            posting = self._postings[term]
+            posting.discard(task_id)
+            if not posting:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+        del self._owners[task_id]
+
+    def reindex_module(self, subsystem_name, module_name):
+        """Index the current tasks of a module in place of the ones indexed before"""
+        key = (subsystem_name, module_name)
+        for task_id in self._modules.pop(key, ()):
+            self._remove(task_id)
+        module = self._estimator.find_node(subsystem_name, module_name)
+        if module is None:
+            return
+        self._modules[key] = [task.id for task in module.tasks]
+        for task in module.tasks:
+            self._add(task, key)
+
+    def _on_model_change(self, kind, subsystem_name, *args):
+        """Store observer: follow tasks added, removed or edited by a catalog reload"""
+        if kind != 'catalog':
+            return
+        if args[0] is not None:
+            self.reindex_module(subsystem_name, args[0])
+            return
+        # Whole subsystem added or dropped
+        subsystem = self._estimator.find_node(subsystem_name)
+        stale = [key for key in self._modules if key[0] == subsystem_name]
+        current = [(subsystem_name, module.key) for module in subsystem.modules] if subsystem else []
+        for key in dict.fromkeys(stale + current):
+            self.reindex_module(*key)
+
+    def _prefix_ids(self, prefix):
+        """Helper method: IDs of the tasks with a term starting with prefix"""
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = bisect_left(vocabulary, prefix + '\U0010ffff', start)
+        if end - start == 1:
+            return self._postings[vocabulary[start]]
+        postings = sorted((self._postings[term] for term in vocabulary[start:end]), key=len)
+        if not postings:
+            return ()
+        # Copying a set is far cheaper than inserting into one: start from the largest
+        ids = set(postings.pop())
+        for posting in postings:
+            ids.update(posting)
+        return ids
+
+    def search(self, query):
+        """Set of IDs of the tasks matching every term of query; None for an empty query"""
+        terms = terms_of(query)
+        if not terms:
+            return None
+        last = terms[-1]
+        # A word still being typed matches as a prefix; single characters of other scripts do not
+        postings = [self._postings.get(term, ()) for term in terms[:-1]]
+        postings.append(self._prefix_ids(last) if last.isascii() else self._postings.get(last, ()))
+        postings.sort(key=len)
+        if len(postings) == 1:
+            return set(postings[0])
+        result = postings[0] & postings[1] if postings[0] else set()
+        for posting in postings[2:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def modules_of(self, task_ids):
+        """(subsystem, module) keys of the modules holding the given tasks"""
+        owners = self._owners
+        return {owners[task_id] for task_id in task_ids}
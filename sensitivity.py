@@ -0,0 +1,170 @@
+"""Sensitivity analysis: which ratio choices and toggles move the project total most
+
+Usage: python sensitivity.py [CSV] [--top K] [--all-levels]
+
+For the estimator's current state, the change in the project total is
+computed for every task at every ratio level and for flipping every module
+and subsystem switch. Ratio deltas come from one vectorized (tasks x levels)
+pass; toggle deltas come straight from the estimator's rollup, so nothing is
+recomputed per task.
+
+NumPy is an optional dependency; estimator.py does not import this module.
+"""
+import argparse
+
+import numpy as np
+
+from estimator import EffortEstimator
+
+RATIO_LEVELS = (100, 60, 25, 0)  # The Task Details radio buttons
+
+
+class SensitivityAnalysis:
+    """Project-total deltas for every single-step change to an estimator
+
+    The catalog structure is indexed once; ratios and switch states are read
+    from the estimator on every analyze() call, so one instance can be reused
+    while the user edits the model.
+    """
+    def __init__(self, estimator):
+        self.estimator = estimator
+        self.subsystems = list(estimator.subsystems)
+        self.modules = []
+        module_index = []
+        effort = []
+        for subsystem in self.subsystems:
+            for module in subsystem.modules:
+                for task in module.tasks:
+                    module_index.append(len(self.modules))
+                    effort.append(task.effort)
+                self.modules.append(module)
+        self.module_index = np.asarray(module_index, dtype=np.intp)
+        self.effort = np.asarray(effort, dtype=np.float64)
+
+    def _state(self):
+        """Current ratios, module switches and subsystem switches as arrays"""
+        estimator = self.estimator
+        ratios = estimator.store.ratios
+        ratio = np.fromiter(
+            (ratios[module._subsystem.name][module.key][task.name]
+             for module in self.modules for task in module.tasks),
+            dtype=np.float64, count=len(self.effort))
+        module_enabled = np.fromiter(
+            (estimator._is_module_enabled(module._subsystem.name, module.key) for module in self.modules),
+            dtype=bool, count=len(self.modules))
+        subsystem_enabled = np.fromiter(
+            (estimator.subsystem_states.get(subsystem.name, True) for subsystem in self.subsystems),
+            dtype=bool, count=len(self.subsystems))
+        return ratio, module_enabled, subsystem_enabled
+
+    def analyze(self, levels=RATIO_LEVELS):
+        """Delta arrays: ratios (tasks x levels), modules and subsystems"""
+        ratio, module_enabled, subsystem_enabled = self._state()
+        subsystem_of = {subsystem: s for s, subsystem in enumerate(self.subsystems)}
+        module_subsystem = np.fromiter((subsystem_of[module._subsystem] for module in self.modules),
+                                       dtype=np.intp, count=len(self.modules))
+        # A change only reaches the project total through enabled switches
+        module_live = module_enabled & subsystem_enabled[module_subsystem]
+        levels = np.asarray(levels, dtype=np.float64)
+
+        # Same operation order as Module totals: effort * (ratio / 100)
+        current = self.effort * (ratio / 100)
+        ratio_deltas = self.effort[:, None] * (levels[None, :] / 100) - current[:, None]
+        ratio_deltas[~module_live[self.module_index]] = 0.0
+
+        # Switching a module off removes its rollup total; switching it on adds what it would total
+        module_totals = np.fromiter((module.get_total_effort() for module in self.modules),
+                                    dtype=np.float64, count=len(self.modules))
+        potential = np.bincount(self.module_index, weights=current, minlength=len(self.modules))
+        potential += [module.manual_effort if module.key == "Other" else 0 for module in self.modules]
+        module_deltas = np.where(module_enabled, -module_totals, potential)
+        module_deltas[~subsystem_enabled[module_subsystem]] = 0.0
+
+        subsystem_totals = np.fromiter((subsystem.get_total_effort() for subsystem in self.subsystems),
+                                       dtype=np.float64, count=len(self.subsystems))
+        subsystem_deltas = np.where(subsystem_enabled, -subsystem_totals, subsystem_totals)
+        return {
+            'total': self.estimator.get_total_effort(),
+            'levels': levels,
+            'ratio': ratio,
+            'ratio_deltas': ratio_deltas,
+            'module_enabled': module_enabled,
+            'module_deltas': module_deltas,
+            'subsystem_enabled': subsystem_enabled,
+            'subsystem_deltas': subsystem_deltas,
+        }
+
+    def top_drivers(self, k=10, levels=RATIO_LEVELS, per_task=True):
+        """The k single changes with the largest effect on the project total
+
+        With per_task, each task contributes only its largest-magnitude ratio
+        level. Returns dicts with kind ('ratio', 'module' or 'subsystem'),
+        subsystem, module, task, change and delta, largest |delta| first.
+        """
+        result = self.analyze(levels)
+        ratio_deltas = result['ratio_deltas']
+        if per_task:
+            level_index = np.argmax(np.abs(ratio_deltas), axis=1)
+            task_deltas = ratio_deltas[np.arange(len(ratio_deltas)), level_index]
+        else:
+            level_index = np.tile(np.arange(ratio_deltas.shape[1]), len(ratio_deltas))
+            task_deltas = ratio_deltas.ravel()
+
+        deltas = np.concatenate((task_deltas, result['module_deltas'], result['subsystem_deltas']))
+        k = min(k, len(deltas))
+        if k <= 0:
+            return []
+        candidates = np.argpartition(-np.abs(deltas), k - 1)[:k]
+        order = candidates[np.argsort(-np.abs(deltas[candidates]), kind='stable')]
+
+        tasks = None
+        drivers = []
+        n_ratio = len(task_deltas)
+        n_module = len(result['module_deltas'])
+        for index in order.tolist():
+            delta = float(deltas[index])
+            if delta == 0:
+                break
+            if index < n_ratio:
+                if tasks is None:
+                    tasks = [(module, task) for module in self.modules for task in module.tasks]
+                row = index if per_task else index // ratio_deltas.shape[1]
+                module, task = tasks[row]
+                level = result['levels'][level_index[index]]
+                drivers.append({'kind': 'ratio', 'subsystem': module._subsystem.name,
+                                'module': module.key, 'task': task.name,
+                                'change': f"{result['ratio'][row]:g}% -> {level:g}%", 'delta': delta})
+            elif index < n_ratio + n_module:
+                module = self.modules[index - n_ratio]
+                enabled = result['module_enabled'][index - n_ratio]
+                drivers.append({'kind': 'module', 'subsystem': module._subsystem.name,
+                                'module': module.key, 'task': None,
+                                'change': "off" if enabled else "on", 'delta': delta})
+            else:
+                s = index - n_ratio - n_module
+                drivers.append({'kind': 'subsystem', 'subsystem': self.subsystems[s].name,
+                                'module': None, 'task': None,
+                                'change': "off" if result['subsystem_enabled'][s] else "on",
+                                'delta': delta})
+        return drivers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('csv', nargs='?', default="effort_data.csv", help="catalog CSV")
+    parser.add_argument('--top', type=int, default=20, help="number of drivers to report")
+    parser.add_argument('--all-levels', action='store_true',
+                        help="list every ratio level of a task, not just its largest")
+    args = parser.parse_args(argv)
+
+    estimator = EffortEstimator(args.csv, cache=True)
+    analysis = SensitivityAnalysis(estimator)
+    print(f"Total Project Effort: {estimator.get_total_effort()}")
+    print(f"{'kind':<10}{'subsystem / module / task':<60}{'change':<16}{'delta':>12}")
+    for driver in analysis.top_drivers(args.top, per_task=not args.all_levels):
+        path = " / ".join(name for name in (driver['subsystem'], driver['module'], driver['task']) if name)
+        print(f"{driver['kind']:<10}{path:<60}{driver['change']:<16}{driver['delta']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
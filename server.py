@@ -0,0 +1,161 @@
+"""Local HTTP/JSON estimation service on asyncio
+
+Usage: python server.py [--csv effort_data.csv] [--host 127.0.0.1] [--port 8765]
+
+The catalog is loaded once and shared by every connection. Endpoints:
+
+    GET  /total      project and subsystem totals of the unmodified catalog
+    POST /evaluate   body: one scenario object (see batch.py) or a list of them;
+                     add ?modules=1 for per-module totals
+    GET  /health     liveness check and scenario cache counters
+
+Connections are HTTP/1.1 keep-alive by default and may pipeline requests;
+responses are written back in request order. Each scenario is evaluated as a
+copy-on-write overlay over the shared estimator, so concurrent requests never
+see each other's changes; repeated scenarios are answered from the
+estimator's scenario cache.
+"""
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from batch import evaluate_scenario, loads_scenarios
+from estimator import EffortEstimator
+from instrumentation import configure
+
+MAX_BODY = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class EstimationServer:
+    """Answers scenario evaluations from one in-memory estimator"""
+    def __init__(self, estimator):
+        self.estimator = estimator
+        self.requests = 0
+
+    def handle(self, method, target, body):
+        """Route one request; returns the JSON-serializable response body"""
+        url = urlsplit(target)
+        if url.path == '/health':
+            return {'status': 'ok', 'requests': self.requests, 'cache': self.estimator.scenario_cache.info()}
+        if url.path == '/total':
+            if method != 'GET':
+                raise HTTPError(405, "use GET")
+            return evaluate_scenario(self.estimator, {})
+        if url.path == '/evaluate':
+            if method != 'POST':
+                raise HTTPError(405, "use POST")
+            modules = parse_qs(url.query).get('modules', ['0'])[0] not in ('0', '')
+            try:
+                # NaN, Infinity and numbers beyond float range would make the response invalid JSON
+                scenarios = loads_scenarios(body.decode('utf-8') if body else '{}')
+            except ValueError as e:
+                raise HTTPError(400, f"invalid JSON: {e}")
+            if isinstance(scenarios, list):
+                if not all(isinstance(scenario, dict) for scenario in scenarios):
+                    raise HTTPError(400, "scenarios must be JSON objects")
+                return [evaluate_scenario(self.estimator, scenario, modules) for scenario in scenarios]
+            if not isinstance(scenarios, dict):
+                raise HTTPError(400, "scenario must be a JSON object")
+            return evaluate_scenario(self.estimator, scenarios, modules)
+        raise HTTPError(404, f"no such endpoint: {url.path}")
+
+    async def serve_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive, response = await self._respond(reader, head)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader, head):
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            return False, self._response(400, {'error': "malformed request line"}, False)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        self.requests += 1
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            return False, self._response(400, {'error': "invalid Content-Length"}, False)
+        if length > MAX_BODY:
+            # The body is left unread, so the connection cannot be reused
+            return False, self._response(413, {'error': "request body too large"}, False)
+        try:
+            body = await reader.readexactly(length) if length else b''
+        except asyncio.IncompleteReadError:
+            return False, b''
+
+        try:
+            status, payload = 200, self.handle(method, target, body)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload, keep_alive = 500, {'error': f"internal error: {type(e).__name__}"}, False
+        return keep_alive, self._response(status, payload, keep_alive)
+
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+
+async def serve(estimator, host='127.0.0.1', port=8765):
+    server = EstimationServer(estimator)
+    listener = await asyncio.start_server(server.serve_connection, host, port)
+    print(f"Serving {len(estimator.subsystems)} subsystems on http://{host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default="effort_data.csv", help="catalog CSV")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--profile', help="write hot-path timings here at exit (.trace.json: Chrome trace)")
+    args = parser.parse_args(argv)
+    configure(args.profile)
+
+    estimator = EffortEstimator(args.csv, cache=True)
+    try:
+        asyncio.run(serve(estimator, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
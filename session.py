@@ -0,0 +1,260 @@
+"""Session persistence through an append-only change journal, with undo/redo
+
+The session sits next to the CSV (effort_data.csv -> effort_data.csv.session)
+and is a JSON-lines file:
+
+    ["snapshot", 1, {...}]             every setting that differs from the default
+    ["ratio", s, m, t, 60]             one record per change made after the snapshot
+    ["module", s, m, false]
+    ["subsystem", s, false]
+    ["task", s, m, t, false]
+    ["manual", s, [120.0, "reviews"]]
+
+Every model store change appends one record. Once enough records accumulate
+the file is compacted: the current settings are written as a new snapshot and
+replace the file atomically, so restoring reads one snapshot and replays only
+the changes made since. Records naming subsystems, modules or tasks that are
+no longer in the catalog are skipped.
+
+Undo and redo keep only the (old, new) values of each change, grouped per
+user action, never copies of the whole state.
+"""
+import json
+import os
+from collections import deque
+
+SESSION_SUFFIX = '.session'
+VERSION = 1
+COMPACT_RECORDS = 10000  # Journal records tolerated after the snapshot before compacting
+UNDO_LEVELS = 1000
+
+# Value of a setting that is not stored in the snapshot
+DEFAULTS = {'ratio': 100, 'module': True, 'subsystem': True, 'task': True, 'manual': (0, "")}
+
+
+def session_path_for(csv_file_path):
+    return csv_file_path + SESSION_SUFFIX
+
+
+class SessionJournal:
+    """Journal of an estimator's settings, restored on open and appended on every change
+
+    Changes made inside one action() block, or within one Tk event loop turn
+    once auto_group(root) is set, are undone and redone together; other changes
+    each form their own undo step.
+    """
+    def __init__(self, estimator, path, compact_records=COMPACT_RECORDS, undo_levels=UNDO_LEVELS):
+        self._estimator = estimator
+        self.path = path
+        self.compact_records = compact_records
+        self.state = {}  # (kind, *key) -> value, only settings that differ from the default
+        self.records = 0  # Journal records after the snapshot
+        self._undo = deque(maxlen=undo_levels)
+        self._redo = []
+        self._group = None  # Changes of the action in progress
+        self._depth = 0
+        self._applying = False  # Set while undo/redo write to the store
+        self._root = None
+        self._file = None
+
+    def open(self):
+        """Restore the saved session into the estimator and start journaling; returns self
+
+        Restoring writes the store directly and invalidates the rollup once, so
+        it should run before create_ui builds any widgets.
+        """
+        self.restore()
+        self._estimator.store.add_observer(self._on_model_change)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self.records > self.compact_records:
+            self.compact()
+        return self
+
+    def restore(self):
+        """Restore the saved session into the estimator without journaling later changes; returns self"""
+        if os.path.exists(self.path):
+            self._restore()
+        return self
+
+    def close(self):
+        """Stop journaling and leave a compacted session file behind"""
+        self._estimator.store.remove_observer(self._on_model_change)
+        if self._file is not None:
+            self.compact()
+            self._file.close()
+            self._file = None
+
+    def _restore(self):
+        lines = []
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                # Only the last snapshot and the records after it matter
+                if line.startswith('["snapshot"'):
+                    lines = []
+                lines.append(line)
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn last line of an interrupted write; compact before appending after it
+                self.records = self.compact_records + 1
+                break
+            if record[0] == 'snapshot':
+                entries = record[2]['settings']
+            else:
+                entries = [record]
+                self.records += 1
+            for kind, *key, value in entries:
+                self._restore_setting(kind, tuple(key), tuple(value) if kind == 'manual' else value)
+        self._estimator.rollup.invalidate_all()
+
+    def _restore_setting(self, kind, key, value):
+        """Helper method: write one saved setting straight into the store"""
+        estimator = self._estimator
+        store = estimator.store
+        if estimator.find_node(*key) is None:
+            return
+        if kind == 'ratio':
+            store.ratios[key[0]][key[1]][key[2]] = value
+        elif kind == 'module':
+            store.module_states[key[0]][key[1]] = value
+        elif kind == 'subsystem':
+            store.subsystem_states[key[0]] = value
+        elif kind == 'task':
+            store.task_states[key[0]][key[1]][key[2]] = value
+        elif kind == 'manual':
+            module = estimator.find_node(key[0], "Other")
+            if module is None:
+                return
+            module.manual_effort, module.manual_comment = value
+            module.name = f"Other - {value[1]}" if value[1] else "Other"
+        else:
+            return
+        self._remember(kind, key, value)
+
+    def _remember(self, kind, key, value):
+        if value == DEFAULTS[kind]:
+            self.state.pop((kind,) + key, None)
+        else:
+            self.state[(kind,) + key] = value
+
+    def _on_model_change(self, kind, subsystem_name, *args):
+        """Store observer: journal the change and record it for undo"""
+        if kind not in DEFAULTS:
+            return  # Not a setting, e.g. a catalog reload
+        if kind == 'manual':
+            module = self._estimator.find_node(subsystem_name, args[0])
+            key, value = (subsystem_name,), (module.manual_effort, module.manual_comment)
+        else:
+            key, value = (subsystem_name,) + args[:-1], args[-1]
+        old = self.state.get((kind,) + key, DEFAULTS[kind])
+        if old == value:
+            return
+        self._remember(kind, key, value)
+        self._file.write(json.dumps([kind, *key, value], ensure_ascii=False) + "\n")
+        self.records += 1
+        if self._applying:
+            return
+
+        self._redo.clear()
+        if self._group is None:
+            self._group = []
+            if self._depth == 0 and self._root is not None:
+                # Close the group once the current Tk event has been handled
+                self._depth = 1
+                self._root.after_idle(self._end)
+        self._group.append((kind, key, old, value))
+        if self._depth == 0:
+            self._end()
+
+    def _end(self):
+        """Helper method: close the action in progress as one undo step"""
+        self._depth = max(self._depth - 1, 0)
+        if self._depth or self._group is None:
+            return
+        group, self._group = self._group, None
+        if group:
+            self._undo.append(group)
+        self._file.flush()
+        if self.records > self.compact_records:
+            self.compact()
+
+    def action(self):
+        """Context manager grouping the changes made inside it into one undo step"""
+        from contextlib import contextmanager
+
+        @contextmanager
+        def grouped():
+            if self._group is None:
+                self._group = []
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._end()
+        return grouped()
+
+    def auto_group(self, root):
+        """Group changes per Tk event loop turn, so one click is one undo step"""
+        self._root = root
+
+    def _close_pending(self):
+        """Helper method: close an event-loop group whose idle callback has not run yet"""
+        if self._group is not None and self._depth == 1 and self._root is not None:
+            self._end()
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Revert the last action; returns False when there is nothing to undo"""
+        self._close_pending()
+        if not self._undo:
+            return False
+        group = self._undo.pop()
+        self._apply((kind, key, old) for kind, key, old, new in reversed(group))
+        self._redo.append(group)
+        return True
+
+    def redo(self):
+        """Repeat the last undone action; returns False when there is nothing to redo"""
+        self._close_pending()
+        if not self._redo:
+            return False
+        group = self._redo.pop()
+        self._apply((kind, key, new) for kind, key, old, new in group)
+        self._undo.append(group)
+        return True
+
+    def _apply(self, changes):
+        estimator = self._estimator
+        store = estimator.store
+        setters = {'ratio': store.set_ratio, 'module': store.set_module_state,
+                   'subsystem': store.set_subsystem_state, 'task': store.set_task_state}
+        self._applying = True
+        try:
+            for kind, key, value in changes:
+                if kind == 'manual':
+                    estimator.set_manual_effort(*key, *value)
+                else:
+                    setters[kind](*key, value)
+        finally:
+            self._applying = False
+        self._file.flush()
+
+    def compact(self):
+        """Replace the journal with a snapshot of the current settings"""
+        settings = [[*key, value] for key, value in self.state.items()]
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(['snapshot', VERSION, {'settings': settings}], ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.records = 0
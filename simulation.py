@@ -0,0 +1,274 @@
+"""Monte Carlo three-point (PERT) estimation over a catalog
+
+Usage: python simulation.py [CSV] [--draws N] [--workers W] [--seed S] [--modules]
+
+Tasks may carry optional optimistic, most_likely and pessimistic columns in
+the catalog CSV. Each draw samples every task from its Beta-PERT distribution,
+scales it by the task's ratio and switch state exactly like Module totals do,
+and adds each "Other" module's manual effort. Tasks without estimates keep
+their fixed effort.
+
+Draws are generated in blocks as one (draws x tasks) NumPy array and reduced
+to module, subsystem and project totals per block. Totals are accumulated
+into fixed-bin histograms spanning each node's possible range, so memory does
+not grow with the number of draws and P50/P80/P95 are read from the
+histograms (error below range / bins). Draws are split into jobs of a fixed
+size, each with its own random stream derived from the seed, and jobs can be
+spread over processes; a seeded run gives the same result with any number
+of workers.
+
+NumPy is an optional dependency; estimator.py does not import this module.
+"""
+import argparse
+
+import numpy as np
+
+from columnar import TaskColumns
+from estimator import read_csv_rows
+
+ESTIMATE_COLUMNS = ('optimistic', 'most_likely', 'pessimistic')
+PERCENTILES = (50, 80, 95)
+BLOCK_ELEMENTS = 1 << 21  # Task samples generated per block
+JOB_DRAWS = 10000  # Draws per job; fixed, so results do not depend on the worker count
+QUANTILE_LEVELS = 1024  # Quantiles tabulated per distribution shape
+
+_model = None  # Simulation model of this process, see _init_worker
+
+
+class PertSimulation:
+    """Three-point estimates aligned with the rows of a TaskColumns store"""
+    def __init__(self, columns, optimistic, most_likely, pessimistic):
+        self.columns = columns
+        self.optimistic = np.asarray(optimistic, dtype=np.float64)
+        self.most_likely = np.asarray(most_likely, dtype=np.float64)
+        self.pessimistic = np.asarray(pessimistic, dtype=np.float64)
+        invalid = ~((self.optimistic <= self.most_likely) & (self.most_likely <= self.pessimistic))
+        if invalid.any():
+            row = int(np.flatnonzero(invalid)[0])
+            raise ValueError(f"三点估算无效 (需 optimistic <= most_likely <= pessimistic): "
+                             f"{columns.task_names[row]}")
+
+    @classmethod
+    def from_csv(cls, csv_file_path, columns=None):
+        """Read estimates from a catalog CSV; missing values fall back to the task's effort
+
+        Without columns, a TaskColumns store is built from the same file. With
+        columns (e.g. TaskColumns.from_estimator), estimates are matched to its
+        rows by (subsystem, module, task).
+        """
+        rows = list(read_csv_rows(csv_file_path, extra_columns=ESTIMATE_COLUMNS))
+        if columns is None:
+            columns = TaskColumns(row[:5] for row in rows)
+            order = range(len(rows))
+        else:
+            order = [columns.task_row(*row[:3]) for row in rows]
+
+        estimates = np.array(columns.effort, dtype=np.float64)[:, None].repeat(3, axis=1)
+        for index, row in zip(order, rows):
+            optimistic, most_likely, pessimistic = row[5:]
+            most_likely = row[3] if most_likely is None else most_likely
+            estimates[index] = (
+                most_likely if optimistic is None else optimistic,
+                most_likely,
+                most_likely if pessimistic is None else pessimistic,
+            )
+        return cls(columns, estimates[:, 0], estimates[:, 1], estimates[:, 2])
+
+    def _model(self):
+        """Snapshot of everything a worker needs, taken from the current switch and ratio state"""
+        columns = self.columns
+        weights = np.where(columns.enabled, columns.ratio / 100, 0.0)
+        # Modules are summed in catalog order within each segment
+        order = np.argsort(columns.module_index, kind='stable')
+        uncertain = order[self.pessimistic[order] > self.optimistic[order]]
+        manual = np.where(columns.module_enabled, columns.manual_effort, 0.0)
+        fixed = np.bincount(
+            columns.module_index, minlength=len(columns.module_names),
+            weights=np.where(self.pessimistic > self.optimistic, 0.0, self.most_likely * weights))
+        fixed += manual
+
+        low = self.optimistic[uncertain]
+        span = self.pessimistic[uncertain] - low
+        # Beta-PERT shape parameters (lambda = 4)
+        alpha = 1 + 4 * (self.most_likely[uncertain] - low) / span
+        beta = 1 + 4 * (self.pessimistic[uncertain] - self.most_likely[uncertain]) / span
+        table, shape_index = _quantile_tables(alpha, beta)
+        # The optimistic part of each sample is a constant per module
+        fixed += np.bincount(columns.module_index[uncertain], weights=low * weights[uncertain],
+                             minlength=len(fixed))
+        segments, starts = np.unique(columns.module_index[uncertain], return_index=True)
+        return {
+            # Samples and their per-module sums are float32; all other totals are float64
+            'table': table.astype(np.float32),
+            'offsets': (shape_index * QUANTILE_LEVELS).astype(np.int32),
+            'scale': (span * weights[uncertain]).astype(np.float32),
+            'segments': segments,
+            'starts': starts,
+            'fixed': fixed,
+            # Module -> subsystem indicator matrix, for summing with one matmul
+            'membership': (columns.module_subsystem[:, None]
+                           == np.arange(len(columns.subsystem_names))).astype(np.float64),
+            'subsystem_enabled': columns.subsystem_enabled.astype(np.float64),
+            'bounds': self._bounds(weights, manual),
+        }
+
+    def _bounds(self, weights, manual):
+        """Smallest and largest possible module, subsystem and project totals"""
+        columns = self.columns
+        bounds = []
+        for values in (self.optimistic, self.pessimistic):
+            modules = np.bincount(columns.module_index, weights=values * weights,
+                                  minlength=len(columns.module_names)) + manual
+            subsystems = np.bincount(columns.module_subsystem, weights=modules,
+                                     minlength=len(columns.subsystem_names))
+            project = np.array([subsystems[columns.subsystem_enabled].sum()])
+            bounds.append(np.concatenate((modules, subsystems, project)))
+        return bounds[0], bounds[1]
+
+    def run(self, draws=100000, seed=None, workers=1, bins=2048):
+        """Simulate and return P50/P80/P95 totals per module, subsystem and project"""
+        model = self._model()
+        model['bins'] = bins
+        # Each job gets its own independent random stream; histogram counts add up in any order
+        sizes = [JOB_DRAWS] * (draws // JOB_DRAWS) + ([draws % JOB_DRAWS] if draws % JOB_DRAWS else [])
+        jobs = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+        workers = min(workers, len(jobs))
+        if workers > 1:
+            import multiprocessing
+            # The model is sent to each worker once, not with every job
+            with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(model,)) as pool:
+                counts = sum(pool.imap_unordered(_simulate, jobs))
+        else:
+            _init_worker(model)
+            counts = sum(map(_simulate, jobs))
+        return self._report(model, counts.reshape(-1, bins), draws)
+
+    def _report(self, model, counts, draws):
+        low, high = model['bounds']
+        values = {}
+        cumulative = np.cumsum(counts, axis=1)
+        for percentile in PERCENTILES:
+            target = draws * percentile / 100
+            # First bin reaching the target, interpolated linearly inside the bin
+            bin_index = np.argmax(cumulative >= target, axis=1)
+            rows = np.arange(len(bin_index))
+            before = np.where(bin_index > 0, cumulative[rows, np.maximum(bin_index - 1, 0)], 0)
+            inside = (target - before) / np.maximum(counts[rows, bin_index], 1)
+            width = (high - low) / counts.shape[1]
+            values[percentile] = low + width * (bin_index + np.clip(inside, 0, 1))
+
+        columns = self.columns
+        n_modules = len(columns.module_names)
+        n_subsystems = len(columns.subsystem_names)
+
+        def percentiles(index):
+            return {f"P{percentile}": float(values[percentile][index]) for percentile in PERCENTILES}
+
+        return {
+            'draws': draws,
+            'project': percentiles(n_modules + n_subsystems),
+            'subsystems': {name: percentiles(n_modules + s)
+                           for s, name in enumerate(columns.subsystem_names)},
+            'modules': {(columns.subsystem_names[columns.module_subsystem[m]], name): percentiles(m)
+                        for m, name in enumerate(columns.module_names)},
+        }
+
+
+def _quantile_tables(alpha, beta, grid=4096):
+    """Quantiles of Beta(alpha, beta) at the midpoints of QUANTILE_LEVELS equal-probability bins
+
+    Shapes repeat across tasks (they only depend on where the most likely value
+    sits between the bounds), so one table is built per distinct shape. Returns
+    the flattened tables and each task's shape index. PERT shapes have
+    alpha, beta >= 1, so the density is bounded and the CDF can be integrated on
+    a fixed grid.
+    """
+    shapes, shape_index = np.unique(np.round(np.column_stack((alpha, beta)), 9),
+                                    axis=0, return_inverse=True)
+    x = np.linspace(0, 1, grid + 1)
+    levels = (np.arange(QUANTILE_LEVELS) + 0.5) / QUANTILE_LEVELS
+    table = np.empty((len(shapes), QUANTILE_LEVELS))
+    for index, (a, b) in enumerate(shapes):
+        density = x ** (a - 1) * (1 - x) ** (b - 1)
+        cdf = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2)))
+        table[index] = np.interp(levels, cdf / cdf[-1], x)
+    return table.ravel(), shape_index.reshape(-1)
+
+
+def _init_worker(model):
+    global _model
+    _model = model
+
+
+def _simulate(job):
+    """Histogram counts of module, subsystem and project totals over a number of draws"""
+    draws, seed = job
+    model = _model
+    rng = np.random.default_rng(seed)
+    tasks = len(model['scale'])
+    block = max(1, min(draws, BLOCK_ELEMENTS // max(tasks, 1)))
+    # Block buffers are allocated once and reused
+    uniform = np.empty((block, tasks), dtype=np.float32)
+    levels = np.empty((block, tasks), dtype=np.int32)
+    samples = np.empty((block, tasks), dtype=np.float32)
+    counts = np.zeros(len(model['bounds'][0]) * model['bins'], dtype=np.int64)
+    for start in range(0, draws, block):
+        size = min(block, draws - start)
+        _simulate_block(model, rng, uniform[:size], levels[:size], samples[:size], counts)
+    return counts
+
+
+def _simulate_block(model, rng, uniform, levels, samples, counts):
+    """Add one block of draws to the histogram counts, using the given buffers"""
+    modules = np.broadcast_to(model['fixed'], (len(samples), len(model['fixed']))).copy()
+    if samples.shape[1]:
+        # Inverse-CDF sampling: a random quantile level per task, looked up in its shape's table
+        rng.random(out=uniform, dtype=np.float32)
+        np.multiply(uniform, QUANTILE_LEVELS, out=uniform)
+        np.copyto(levels, uniform, casting='unsafe')
+        np.minimum(levels, QUANTILE_LEVELS - 1, out=levels)
+        np.add(levels, model['offsets'], out=levels)
+        np.take(model['table'], levels, out=samples)
+        np.multiply(samples, model['scale'], out=samples)
+        modules[:, model['segments']] += np.add.reduceat(samples, model['starts'], axis=1)
+
+    subsystems = modules @ model['membership']
+    project = subsystems @ model['subsystem_enabled']
+    totals = np.concatenate((modules, subsystems, project[:, None]), axis=1)
+
+    low, high = model['bounds']
+    bins = model['bins']
+    scale = np.where(high > low, bins / np.where(high > low, high - low, 1), 0.0)
+    bin_index = np.clip(((totals - low) * scale).astype(np.intp), 0, bins - 1)
+    bin_index += np.arange(totals.shape[1]) * bins
+    # Node-major order keeps each scatter within one node's histogram
+    np.add.at(counts, np.ascontiguousarray(bin_index.T).ravel(), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('csv', nargs='?', default="effort_data.csv", help="catalog CSV")
+    parser.add_argument('--draws', type=int, default=100000, help="number of simulated projects")
+    parser.add_argument('--workers', type=int, default=1, help="processes to split draws across")
+    parser.add_argument('--seed', type=int, default=None, help="random seed")
+    parser.add_argument('--modules', action='store_true', help="also report every module")
+    args = parser.parse_args(argv)
+
+    result = PertSimulation.from_csv(args.csv).run(args.draws, args.seed, args.workers)
+    print(f"{'':<40}" + "".join(f"{f'P{p}':>12}" for p in PERCENTILES))
+
+    def show(label, values):
+        print(f"{label:<40}" + "".join(f"{values[f'P{p}']:>12.1f}" for p in PERCENTILES))
+
+    for subsystem_name, values in result['subsystems'].items():
+        show(subsystem_name, values)
+        if args.modules:
+            for (owner, module_name), module_values in result['modules'].items():
+                if owner == subsystem_name:
+                    show(f"  {module_name}", module_values)
+    show("Project", result['project'])
+
+
+if __name__ == "__main__":
+    main()
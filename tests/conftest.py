@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+CATALOG = """subsystem,module,task,effort,description
+Security,SynaProt,ROM Development,11,"ROM development work on FPGA, covers OTP programming"
+Security,SynaProt,QA,13,QA work
+Security,Crypto,Design,20,Cipher design
+Security,Crypto,Review,5,Design review
+Display,Panel,Driver,40,Panel driver
+Display,Panel,QA,8,Panel QA
+Display,Backlight,Control,12,PWM control
+"""
+
+
+def write_catalog(path, text=CATALOG):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write(text)
+    return str(path)
+
+
+def full_total(estimator):
+    """Project total computed straight from the catalog and the store, without any cache"""
+    store = estimator.store
+    total = 0
+    for subsystem in estimator.subsystems:
+        if not store.subsystem_states.get(subsystem.name, True):
+            continue
+        for module in subsystem.modules:
+            if not estimator._is_module_enabled(subsystem.name, module.key):
+                continue
+            for task in module.tasks:
+                total += task.effort * (store.get_ratio(subsystem.name, module.key, task.name) / 100)
+            if module.key == "Other":
+                total += module.manual_effort
+    return total
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return write_catalog(tmp_path / 'effort_data.csv')
+
+
+@pytest.fixture
+def estimator(catalog):
+    from estimator import EffortEstimator
+    return EffortEstimator(catalog)
+
+
+@pytest.fixture
+def ui(estimator):
+    """Estimator with its Tk UI created; skipped where Tk cannot open a display"""
+    tk = pytest.importorskip('tkinter')
+    try:
+        estimator.create_ui()
+    except tk.TclError:
+        pytest.skip("no display")
+    estimator.root.update()
+    yield estimator
+    estimator.root.destroy()
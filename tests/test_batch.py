@@ -0,0 +1,57 @@
+import gc
+import io
+import json
+
+import pytest
+
+from batch import evaluate_scenario, run_batch
+
+GOOD = {'id': "lean", 'ratios': {"Security": {"Crypto": {"Design": 25}}}, 'modules': {"Display": {"Panel": False}}}
+
+MALFORMED = [
+    ('not json', None),
+    ('[1, 2]', None),
+    ('{"id": 1, "ratios": {"Security": {"Crypto": {"Design": 1e400}}}}', None),
+    ('{"id": 2, "ratios": {"Security": {"Crypto": {"Design": NaN}}}}', None),
+    ('[' * 100000, None),
+    ('{"id": 3, "ratios": 5}', 3),
+    ('{"id": 4, "modules": {"Display": 5}}', 4),
+    ('{"id": 5, "other": {"Security": "x"}}', 5),
+    ('{"id": 6, "ratios": {"Security": {"Crypto": {"Design": null}}}}', 6),
+    ('{"id": 7, "subsystems": {"Missing": false}}', 7),
+    ('{"id": 8, "ratios": {"Security": {"Crypto": {"Missing": 25}}}}', 8),
+    ('{"id": 9, "subsystems": [1]}', 9),
+    ('{"id": 10, "ratios": {"Security": {"Crypto": {"Design": 1' + '0' * 400 + '}}}}', 10),
+    ('{"id": 11, "ratios": {"Security": {"Crypto": {"Design": 1e308}}}, '
+     '"other": {"Display": 1.7e308}, "modules": {"Display": {"Other": true}}}', 11),
+]
+
+
+def test_evaluate_scenario(estimator):
+    result = evaluate_scenario(estimator, GOOD)
+    assert result == {'id': "lean", 'total': pytest.approx(109 - 15 - 48),
+                      'subsystems': {"Security": pytest.approx(34), "Display": pytest.approx(12)}}
+    modules = evaluate_scenario(estimator, GOOD, modules=True)['modules']
+    assert modules["Display"] == {"Panel": 0, "Backlight": 12, "Other": 0}
+    assert estimator.get_total_effort() == 109
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_malformed_lines_give_per_line_errors(catalog, workers):
+    lines = [json.dumps(GOOD)]
+    for line, _ in MALFORMED:
+        lines += [line, json.dumps({'id': len(lines)})]
+    output = io.StringIO()
+    try:
+        run_batch(catalog, lines + ["", "   "], output, workers=workers)
+    finally:
+        gc.unfreeze()
+    results = [json.loads(line) for line in output.getvalue().splitlines()]  # Strict JSON throughout
+
+    assert len(results) == len(lines)
+    assert results[0]['total'] == pytest.approx(46)
+    for index, (line, scenario_id) in enumerate(MALFORMED):
+        error, after = results[1 + 2 * index], results[2 + 2 * index]
+        assert 'error' in error and 'total' not in error, line
+        assert error['id'] == scenario_id
+        assert after == {'id': 1 + 2 * index, 'total': 109, 'subsystems': {"Security": 49, "Display": 60}}
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from catalog_cache import HEADER, CatalogCache, cache_path_for, open_catalog_cache
+from conftest import CATALOG, write_catalog
+from estimator import EffortEstimator, read_csv_rows
+
+
+def tasks(estimator):
+    return [(subsystem.name, module.key, task.name, task.effort, task.description)
+            for subsystem in estimator.subsystems for module in subsystem.modules for task in module.tasks]
+
+
+def set_mtime(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class Reader:
+    """read_rows callback that counts the CSV parses"""
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return read_csv_rows(self.path)
+
+
+@pytest.fixture
+def reader(catalog):
+    reader = Reader(catalog)
+    open_catalog_cache(catalog, reader).close()
+    assert reader.calls == 1
+    return reader
+
+
+def test_fresh_cache_is_reused(catalog, reader):
+    cache = open_catalog_cache(catalog, reader)
+    assert reader.calls == 1
+    assert list(cache.rows()) == list(read_csv_rows(catalog))
+    cache.close()
+
+
+def test_cached_load_equals_a_csv_load(catalog):
+    expected = tasks(EffortEstimator(catalog))
+    assert tasks(EffortEstimator(catalog, cache=True)) == expected  # Builds the cache
+    assert os.path.exists(cache_path_for(catalog))
+    assert tasks(EffortEstimator(catalog, cache=True)) == expected  # Reads it
+
+
+def test_changed_size_rebuilds(catalog, reader):
+    write_catalog(catalog, CATALOG.replace("Cipher design", "Block cipher design"))
+    estimator = EffortEstimator(catalog, cache=True)
+    assert estimator.find_node("Security", "Crypto", "Design").description == "Block cipher design"
+
+
+def test_same_size_and_new_mtime_rebuilds_when_the_content_differs(catalog, reader):
+    mtime_ns = os.stat(catalog).st_mtime_ns
+    write_catalog(catalog, CATALOG.replace("Design,20", "Design,29"))
+    set_mtime(catalog, mtime_ns + 1000000)
+    cache = open_catalog_cache(catalog, reader)
+    assert reader.calls == 2
+    assert 29 in list(cache.effort)
+    cache.close()
+
+
+def test_touched_file_with_the_same_content_is_not_rebuilt(catalog, reader):
+    mtime_ns = os.stat(catalog).st_mtime_ns + 1000000
+    set_mtime(catalog, mtime_ns)
+    open_catalog_cache(catalog, reader).close()
+    assert reader.calls == 1
+    # The new mtime is recorded, so the next open skips the content hash
+    cache = CatalogCache(cache_path_for(catalog))
+    assert cache.csv_mtime_ns == mtime_ns
+    cache.close()
+
+
+def test_cache_of_another_path_is_rebuilt(catalog, reader, tmp_path):
+    other = write_catalog(tmp_path / 'other.csv', CATALOG.replace("Cipher design", "Other design "))
+    reader_of_other = Reader(other)
+    cache = open_catalog_cache(other, reader_of_other, cache_path=cache_path_for(catalog))
+    assert reader_of_other.calls == 1
+    assert cache.csv_path == os.path.abspath(other)
+    cache.close()
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: data[:HEADER.size // 2],            # Truncated header
+    lambda data: data[:len(data) - 16],              # Truncated effort column
+    lambda data: b'NOTCACHE' + data[8:],             # Wrong magic
+    lambda data: b'',                                # Empty file
+])
+def test_damaged_cache_is_rebuilt(catalog, reader, damage):
+    path = cache_path_for(catalog)
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path, 'wb') as file:
+        file.write(damage(data))
+    cache = open_catalog_cache(catalog, reader)
+    assert reader.calls == 2
+    assert list(cache.rows()) == list(read_csv_rows(catalog))
+    cache.close()
+    assert tasks(EffortEstimator(catalog, cache=True)) == tasks(EffortEstimator(catalog))
+
+
+def test_lazy_descriptions_are_read_from_the_cache(catalog):
+    expected = tasks(EffortEstimator(catalog))
+    EffortEstimator(catalog, cache=True)
+    lazy = EffortEstimator(catalog, cache=True, lazy_descriptions=True)
+    assert tasks(lazy) == expected
+    task = lazy.find_node("Security", "SynaProt", "ROM Development")
+    assert "__dict__" not in dir(task) and type(task)._descriptions is not None
+    assert task.description == "ROM development work on FPGA, covers OTP programming"
+
+
+def test_lazy_descriptions_after_an_earlier_load(catalog, tmp_path):
+    # Node IDs of a lazy load do not start at 0 when the estimator already holds nodes
+    estimator = EffortEstimator(write_catalog(tmp_path / 'first.csv', "subsystem,module,task,effort,description\n"
+                                                                      "Audio,Codec,Tune,4,Codec tuning\n"))
+    EffortEstimator(catalog, cache=True)
+    estimator.load_data_from_csv(catalog, cache=True, lazy_descriptions=True)
+    assert estimator.find_node("Audio", "Codec", "Tune").description == "Codec tuning"
+    assert estimator.find_node("Display", "Backlight", "Control").description == "PWM control"
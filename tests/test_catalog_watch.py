@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from catalog_watch import CatalogWatcher
+from conftest import CATALOG, full_total, write_catalog
+from estimator import EffortEstimator
+
+
+def rewrite(path, text):
+    """Write a new version of the catalog with a modification time the watcher sees as new"""
+    write_catalog(path, text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+
+def snapshot(estimator):
+    return [(subsystem.name, module.key, task.name, task.effort, task.description)
+            for subsystem in estimator.subsystems for module in subsystem.modules for task in module.tasks]
+
+
+def assert_matches_fresh_load(estimator, path):
+    assert sorted(snapshot(estimator)) == sorted(snapshot(EffortEstimator(path)))
+    assert estimator.get_total_effort() == pytest.approx(full_total(estimator))
+    for key, node in estimator.node_index.items():
+        assert estimator.nodes[node.id] is node
+
+
+@pytest.fixture
+def watched(catalog):
+    estimator = EffortEstimator(catalog)
+    return estimator, CatalogWatcher(estimator, catalog)
+
+
+def test_unchanged_file_is_not_reloaded(watched):
+    estimator, watcher = watched
+    assert watcher.poll() == 0
+    assert watcher.reloads == 0
+
+
+def test_changed_effort_and_description(watched, catalog):
+    estimator, watcher = watched
+    rewrite(catalog, CATALOG.replace("Security,Crypto,Design,20,Cipher design",
+                                     "Security,Crypto,Design,26,New design"))
+    assert watcher.poll() == 1
+    assert not watcher.last_full
+    task = estimator.find_node("Security", "Crypto", "Design")
+    assert (task.effort, task.description) == (26, "New design")
+    assert_matches_fresh_load(estimator, catalog)
+
+
+def test_settings_of_remaining_tasks_are_kept(watched, catalog):
+    estimator, watcher = watched
+    estimator.store.set_ratio("Security", "Crypto", "Review", 25)
+    estimator.set_manual_effort("Display", 10, "extra")
+    estimator.store.set_module_state("Display", "Other", True)
+    rewrite(catalog, CATALOG.replace("Security,Crypto,Design,20,Cipher design\n", ""))
+    watcher.poll()
+    assert estimator.find_node("Security", "Crypto", "Design") is None
+    assert estimator.store.get_ratio("Security", "Crypto", "Review") == 25
+    assert estimator.find_node("Display", "Other").manual_effort == 10
+    assert_matches_fresh_load(estimator, catalog)
+
+
+def test_added_module_and_subsystem(watched, catalog):
+    estimator, watcher = watched
+    changes = []
+    estimator.store.add_observer(lambda kind, *args: changes.append((kind,) + args))
+    rewrite(catalog, CATALOG.replace("Display,Panel,Driver",
+                                     "Security,Fuses,Blow,6,OTP\nAudio,Codec,Tune,4,a\nDisplay,Panel,Driver"))
+    watcher.poll()
+    security = estimator.find_node("Security")
+    assert [module.key for module in security.modules][-2:] == ["Fuses", "Other"]
+    assert estimator.find_node("Audio", "Other") is not None
+    assert ('catalog', "Audio", None) in changes
+    assert ('catalog', "Security", "Fuses") in changes
+    assert_matches_fresh_load(estimator, catalog)
+
+
+def test_emptied_module_and_subsystem_are_dropped(watched, catalog):
+    estimator, watcher = watched
+    text = "".join(line + "\n" for line in CATALOG.splitlines() if not line.startswith("Display"))
+    rewrite(catalog, text.replace("Security,Crypto,Review,5,Design review\n", "")
+                         .replace("Security,Crypto,Design,20,Cipher design\n", ""))
+    watcher.poll()
+    assert estimator.find_node("Display") is None
+    assert estimator.find_node("Security", "Crypto") is None
+    assert estimator.subsystem_names == ["Security"]
+    assert_matches_fresh_load(estimator, catalog)
+
+
+def test_header_change_falls_back_to_a_full_diff(watched, catalog):
+    estimator, watcher = watched
+    lines = CATALOG.splitlines()
+    # Columns in another order
+    reordered = ["effort,subsystem,module,task,description"] + [
+        f"{row[3]},{row[0]},{row[1]},{row[2]},{row[4]}" for row in (line.split(",", 4) for line in lines[1:])]
+    rewrite(catalog, "\n".join(reordered) + "\n")
+    watcher.poll()
+    assert watcher.last_full
+    assert_matches_fresh_load(estimator, catalog)
+
+
+def test_unparsable_file_is_reported_and_skipped(watched, catalog):
+    estimator, watcher = watched
+    errors = []
+    watcher.on_error = errors.append
+    before = snapshot(estimator)
+    rewrite(catalog, CATALOG.replace("Display,Panel,QA,8", "Display,Panel,QA,eight"))
+    assert watcher.poll() == 0
+    assert snapshot(estimator) == before
+    assert len(errors) == 1 and watcher.last_error == errors[0]
+    assert watcher.poll() == 0  # Not reported again until the file changes
+    assert len(errors) == 1
+
+    rewrite(catalog, CATALOG.replace("Display,Panel,QA,8", "Display,Panel,QA,9"))
+    assert watcher.poll() == 1
+    assert watcher.last_error is None
+    assert_matches_fresh_load(estimator, catalog)
+
+
+def test_tracked_columns_follow_a_reload(watched, catalog):
+    pytest.importorskip('numpy')
+    estimator, watcher = watched
+    columns = estimator.to_columns()
+    rewrite(catalog, CATALOG + "Audio,Codec,Tune,4,a\n")
+    watcher.poll()
+    estimator.store.set_ratio("Audio", "Codec", "Tune", 25)
+    assert columns.get_total_effort() == pytest.approx(estimator.get_total_effort())
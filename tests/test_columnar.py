@@ -0,0 +1,86 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from columnar import TaskColumns  # noqa: E402
+
+CHANGES = [
+    lambda e: e.store.set_ratio("Security", "Crypto", "Design", 25),
+    lambda e: e.store.set_ratio("Display", "Panel", "QA", 60),
+    lambda e: e.store.set_module_state("Display", "Panel", False),
+    lambda e: e.store.set_subsystem_state("Security", False),
+    lambda e: e.set_manual_effort("Display", 30, "reviews"),
+    lambda e: e.store.set_module_state("Display", "Other", True),
+    lambda e: e.store.set_module_state("Display", "Other", False),
+    lambda e: e.store.set_subsystem_state("Security", True),
+    lambda e: e.store.set_module_state("Display", "Panel", True),
+    lambda e: e.store.set_ratio("Security", "Crypto", "Design", 0),
+]
+
+
+def assert_totals_match(columns, estimator):
+    assert columns.get_total_effort() == pytest.approx(estimator.get_total_effort())
+    views = columns.subsystems
+    assert [view.name for view in views] == estimator.subsystem_names
+    for view, subsystem in zip(views, estimator.subsystems):
+        assert view.get_total_effort() == pytest.approx(subsystem.get_total_effort())
+        modules = {module.name: module for module in view.modules}
+        assert set(modules) == {module.key for module in subsystem.modules}
+        for module in subsystem.modules:
+            assert modules[module.key].get_total_effort() == pytest.approx(module.get_total_effort())
+
+
+def test_initial_totals(estimator):
+    assert_totals_match(estimator.to_columns(), estimator)
+
+
+def test_tracked_columns_follow_every_change(estimator):
+    columns = estimator.to_columns()
+    for change in CHANGES:
+        change(estimator)
+        assert_totals_match(columns, estimator)
+
+
+def test_columns_built_after_changes(estimator):
+    for change in CHANGES[:6]:
+        change(estimator)
+    assert_totals_match(estimator.to_columns(track=False), estimator)
+
+
+def test_direct_setters_match_the_same_store_changes(catalog, estimator):
+    columns = TaskColumns.from_csv(catalog)
+    columns.set_ratio("Security", "Crypto", "Design", 25)
+    columns.set_module_state("Display", "Panel", False)
+    columns.set_subsystem_state("Security", False)
+    columns.set_manual_effort("Display", 30)
+    columns.set_module_state("Display", "Other", True)
+
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_module_state("Display", "Panel", False)
+    estimator.store.set_subsystem_state("Security", False)
+    estimator.set_manual_effort("Display", 30)
+    estimator.store.set_module_state("Display", "Other", True)
+    assert_totals_match(columns, estimator)
+
+
+def test_untracked_columns_ignore_later_changes(estimator):
+    columns = estimator.to_columns(track=False)
+    total = columns.get_total_effort()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 0)
+    assert columns.get_total_effort() == total
+
+
+def test_columns_over_the_cache(catalog, estimator):
+    from catalog_cache import open_catalog_cache
+    from estimator import read_csv_rows
+
+    cache = open_catalog_cache(catalog, lambda: read_csv_rows(catalog))
+    columns = TaskColumns.from_cache(cache)
+    columns.set_ratio("Display", "Panel", "QA", 60)
+    estimator.store.set_ratio("Display", "Panel", "QA", 60)
+    assert_totals_match(columns, estimator)
+    task = columns.subsystems[0].modules[0].tasks[0]
+    assert (task.name, task.effort, task.description) == (
+        "ROM Development", 11, "ROM development work on FPGA, covers OTP programming")
+    del columns, task
+    cache.close()
@@ -0,0 +1,27 @@
+import pytest
+
+from hierarchy import EffortTree
+
+
+def test_tree_totals_match_the_estimator(estimator):
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_subsystem_state("Display", False)
+    estimator.store.set_module_state("Security", "Other", True)
+    estimator.set_manual_effort("Security", 4)
+    tree = estimator.to_tree()
+    assert tree.total() == pytest.approx(estimator.get_total_effort())
+    for subsystem in estimator.subsystems:
+        # A switched-off subsystem keeps its own total; only the project leaves it out
+        assert tree.total(tree.find((subsystem.name,))) == pytest.approx(subsystem.get_total_effort())
+
+
+def test_edits_below_a_switched_off_node(estimator):
+    tree = estimator.to_tree()
+    display = tree.find("Display")
+    tree.set_enabled(display, False)
+    project = tree.total()
+    tree.set_effort(tree.find("Display/Panel/Driver"), 100)
+    assert tree.total() == pytest.approx(project)
+    assert tree.total(display) == pytest.approx(100 + 8 + 12)
+    tree.set_enabled(display, True)
+    assert tree.total() == pytest.approx(project + 120)
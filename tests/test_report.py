@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+import pytest
+
+from report import ReportRow, iter_report, write_report
+
+
+@pytest.fixture
+def configured(estimator):
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_ratio("Display", "Panel", "QA", 60)
+    estimator.store.set_module_state("Security", "SynaProt", False)
+    estimator.store.set_module_state("Display", "Other", True)
+    estimator.set_manual_effort("Display", 7.5, "reviews | sign-off")
+    return estimator
+
+
+def totals(rows, level):
+    return {(row.subsystem, row.module): row.effective for row in rows if row.level == level}
+
+
+@pytest.mark.parametrize('change', [
+    lambda e: None,
+    lambda e: e.store.set_subsystem_state("Display", False),
+    lambda e: e.store.set_module_state("Display", "Panel", False),
+])
+def test_totals_equal_the_estimator(configured, change):
+    change(configured)
+    rows = list(iter_report(configured))
+    assert rows[-1].level == 'project'
+    assert rows[-1].effective == configured.get_total_effort()
+    for subsystem in configured.subsystems:
+        assert totals(rows, 'subsystem')[(subsystem.name, None)] == subsystem.get_total_effort()
+        for module in subsystem.modules:
+            assert totals(rows, 'module')[(subsystem.name, module.key)] == module.get_total_effort()
+
+
+def test_rows_in_hierarchy_order(configured):
+    rows = list(iter_report(configured))
+    assert [row.level for row in rows if row.subsystem == "Display"] == [
+        'task', 'task', 'module', 'task', 'module', 'other', 'module', 'subsystem']
+    qa = next(row for row in rows if row.level == 'task' and row.module == "Panel" and row.task == "QA")
+    assert (qa.effort, qa.ratio, qa.effective, qa.included) == (8, 60, pytest.approx(4.8), True)
+    assert not any(row.included for row in rows if row.module == "SynaProt")
+
+
+def test_levels(configured):
+    rows = list(iter_report(configured, levels=('subsystem', 'project')))
+    assert [row.level for row in rows] == ['subsystem', 'subsystem', 'project']
+    assert rows[-1].effective == configured.get_total_effort()
+
+
+def parsed(format, text):
+    """(level, subsystem, module, task, effective) of each written row, empty cells as None"""
+    if format == 'csv':
+        records = list(csv.reader(io.StringIO(text)))
+        assert records[0] == list(ReportRow._fields)
+        records = records[1:]
+    elif format == 'jsonl':
+        records = [list(json.loads(line).values()) for line in text.splitlines()]
+    else:
+        lines = text.splitlines()
+        assert lines[0] == "| " + " | ".join(ReportRow._fields) + " |"
+        records = [[cell.strip().replace("\\|", "|") for cell in line[2:-2].split(" | ")] for line in lines[2:]]
+        for record in records:
+            record[6] = record[6].strip("*").replace(",", "")
+    return [tuple(value if value not in ("", None) else None for value in record[:4]) + (float(record[6]),)
+            for record in records]
+
+
+@pytest.mark.parametrize('format', ['csv', 'jsonl', 'markdown'])
+def test_writers_emit_the_same_rows(configured, format):
+    expected = [(row.level, row.subsystem, row.module, row.task, row.effective) for row in iter_report(configured)]
+    file = io.StringIO()
+    write_report(configured, file, format)
+    rows = parsed(format, file.getvalue())
+    assert [row[:4] for row in rows] == [row[:4] for row in expected]
+    assert [row[4] for row in rows] == pytest.approx([row[4] for row in expected], abs=0.005)
+
+
+def test_unknown_format(configured):
+    with pytest.raises(ValueError):
+        write_report(configured, io.StringIO(), 'xml')
+
+
+def test_summary_skips_switched_off_tasks(configured, capsys):
+    configured.store.set_task_state("Display", "Panel", "QA", False)
+    configured.display_summary()
+    output = capsys.readouterr().out
+    assert "任务: Driver" in output
+    assert "任务: QA" not in output  # Switched off here; the one in SynaProt is in a switched-off module
+    assert f"总工作量: {configured.get_total_effort()}" in output
@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import full_total
+
+
+def recomputed(estimator):
+    """Totals after dropping every cached value"""
+    estimator.rollup.invalidate_all()
+    return (estimator.get_total_effort(),
+            {subsystem.name: subsystem.get_total_effort() for subsystem in estimator.subsystems},
+            {(subsystem.name, module.key): module.get_total_effort()
+             for subsystem in estimator.subsystems for module in subsystem.modules})
+
+
+def cached(estimator):
+    return (estimator.get_total_effort(),
+            {subsystem.name: subsystem.get_total_effort() for subsystem in estimator.subsystems},
+            {(subsystem.name, module.key): module.get_total_effort()
+             for subsystem in estimator.subsystems for module in subsystem.modules})
+
+
+def test_initial_total(estimator):
+    assert estimator.get_total_effort() == pytest.approx(109)
+    assert estimator.get_total_effort() == pytest.approx(full_total(estimator))
+
+
+@pytest.mark.parametrize('change', [
+    lambda e: e.store.set_ratio("Security", "Crypto", "Design", 25),
+    lambda e: e.store.set_module_state("Display", "Panel", False),
+    lambda e: e.store.set_subsystem_state("Security", False),
+    lambda e: e.store.set_module_state("Display", "Other", True),
+    lambda e: e.set_manual_effort("Display", 30, "reviews"),
+])
+def test_cached_totals_follow_changes(estimator, change):
+    cached(estimator)  # Fill the cache first
+    change(estimator)
+    totals = cached(estimator)
+    assert totals == recomputed(estimator)
+    assert totals[0] == pytest.approx(full_total(estimator))
+
+
+def test_cached_totals_after_a_series_of_changes(estimator):
+    changes = [
+        lambda: estimator.store.set_ratio("Security", "SynaProt", "QA", 60),
+        lambda: estimator.store.set_module_state("Security", "Crypto", False),
+        lambda: estimator.set_manual_effort("Security", 7),
+        lambda: estimator.store.set_module_state("Security", "Other", True),
+        lambda: estimator.store.set_subsystem_state("Display", False),
+        lambda: estimator.store.set_ratio("Display", "Panel", "Driver", 0),
+        lambda: estimator.store.set_subsystem_state("Display", True),
+        lambda: estimator.store.set_module_state("Security", "Crypto", True),
+    ]
+    for change in changes:
+        change()
+        totals = cached(estimator)
+        assert totals == recomputed(estimator)
+        assert totals[0] == pytest.approx(full_total(estimator))
@@ -0,0 +1,73 @@
+import pytest
+
+from conftest import full_total
+
+
+def test_scenario_leaves_the_estimator_unchanged(estimator):
+    base = estimator.get_total_effort()
+    scenario = estimator.create_scenario({
+        'ratios': {"Security": {"Crypto": {"Design": 25}}},
+        'modules': {"Display": {"Panel": False}},
+    })
+    assert scenario.get_total_effort() == pytest.approx(base - 15 - 48)
+    assert estimator.get_total_effort() == base
+    assert estimator.store.get_ratio("Security", "Crypto", "Design") == 100
+    assert estimator._is_module_enabled("Display", "Panel")
+
+
+def test_scenario_totals_match_the_same_edits_on_the_estimator(estimator):
+    scenario = estimator.create_scenario()
+    scenario.set_ratio("Security", "SynaProt", "QA", 60)
+    scenario.set_subsystem_state("Display", False)
+    scenario.set_module_state("Security", "Other", True)
+    scenario.set_manual_effort("Security", 9, "extra")
+    expected = scenario.get_total_effort()
+    expected_subsystem = scenario.subsystem_total("Security")
+
+    estimator.store.set_ratio("Security", "SynaProt", "QA", 60)
+    estimator.store.set_subsystem_state("Display", False)
+    estimator.store.set_module_state("Security", "Other", True)
+    estimator.set_manual_effort("Security", 9, "extra")
+    assert expected == pytest.approx(estimator.get_total_effort())
+    assert expected == pytest.approx(full_total(estimator))
+    assert expected_subsystem == pytest.approx(estimator.find_node("Security").get_total_effort())
+
+
+def test_scenario_follows_base_changes_it_did_not_edit(estimator):
+    scenario = estimator.create_scenario({'ratios': {"Security": {"Crypto": {"Design": 0}}}})
+    before = scenario.get_total_effort()
+    estimator.store.set_ratio("Display", "Panel", "QA", 0)
+    assert scenario.get_total_effort() == pytest.approx(before - 8)
+
+
+def test_edit_equal_to_the_base_is_kept(estimator):
+    scenario = estimator.create_scenario()
+    scenario.set_ratio("Security", "Crypto", "Design", 100)
+    scenario.set_module_state("Display", "Panel", True)
+    before = scenario.get_total_effort()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 0)
+    estimator.store.set_module_state("Display", "Panel", False)
+    assert scenario.get_ratio("Security", "Crypto", "Design") == 100
+    assert scenario.is_module_enabled("Display", "Panel")
+    assert scenario.get_total_effort() == pytest.approx(before)
+
+
+def test_revert_lets_the_base_show_through(estimator):
+    scenario = estimator.create_scenario()
+    scenario.set_ratio("Security", "Crypto", "Design", 25)
+    scenario.get_total_effort()
+    scenario.revert_ratio("Security", "Crypto", "Design")
+    assert len(scenario) == 0
+    estimator.store.set_ratio("Security", "Crypto", "Design", 60)
+    assert scenario.get_ratio("Security", "Crypto", "Design") == 60
+    assert scenario.get_total_effort() == pytest.approx(estimator.get_total_effort())
+
+
+def test_unknown_names_raise_key_error(estimator):
+    scenario = estimator.create_scenario()
+    with pytest.raises(KeyError):
+        scenario.set_ratio("Security", "Crypto", "Missing", 25)
+    with pytest.raises(KeyError):
+        scenario.set_module_state("Security", "Missing", False)
+    with pytest.raises(KeyError):
+        scenario.set_subsystem_state("Missing", False)
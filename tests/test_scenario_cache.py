@@ -0,0 +1,20 @@
+import pytest
+
+
+def test_cached_results_are_copies(estimator):
+    from batch import evaluate_scenario
+
+    scenario = {'id': 1, 'modules': {"Display": {"Panel": False}}}
+    first = evaluate_scenario(estimator, scenario)
+    first['total'] = -1
+    first['subsystems']["Display"] = -1
+    second = evaluate_scenario(estimator, scenario)
+    assert estimator.scenario_cache.hits == 1
+    assert second['total'] == pytest.approx(109 - 48)
+    assert second['subsystems']["Display"] == pytest.approx(12)
+
+
+def test_equivalent_scenarios_share_a_cache_key(estimator):
+    cache = estimator.scenario_cache
+    explicit = estimator.create_scenario({'ratios': {"Security": {"Crypto": {"Design": 100}}}})
+    assert cache.key(explicit) == cache.key(estimator.create_scenario())
@@ -0,0 +1,170 @@
+import os
+
+import pytest
+
+from conftest import CATALOG, write_catalog
+from search import TaskIndex, terms_of
+
+
+def names(estimator, task_ids):
+    return sorted(estimator.nodes[task_id].name for task_id in task_ids)
+
+
+def assert_matches_a_fresh_index(index, estimator):
+    """The incrementally maintained index equals one built from scratch"""
+    fresh = TaskIndex(estimator)
+    fresh.close()
+    assert index._postings == fresh._postings
+    assert index._vocabulary == sorted(fresh._postings)
+    assert index._owners == fresh._owners
+    assert {key: sorted(ids) for key, ids in index._modules.items() if ids} == \
+           {key: sorted(ids) for key, ids in fresh._modules.items() if ids}
+
+
+@pytest.fixture
+def index(estimator):
+    index = TaskIndex(estimator)
+    yield index
+    index.close()
+
+
+def test_terms():
+    assert terms_of("ROM development work on FPGA, covers OTP programming") == [
+        "rom", "development", "work", "on", "fpga", "covers", "otp", "programming"]
+    assert terms_of("QA2 面板驱动") == ["qa2", "面", "板", "驱", "动"]
+
+
+def test_empty_query_matches_everything(index):
+    assert index.search("") is None
+    assert index.search("  ,; ") is None
+
+
+def test_terms_of_names_and_descriptions(estimator, index):
+    assert names(estimator, index.search("qa")) == ["QA", "QA"]
+    assert names(estimator, index.search("cipher")) == ["Design"]
+    assert names(estimator, index.search("CIPHER")) == ["Design"]
+    assert index.search("missing") == set()
+
+
+def test_all_terms_must_match(estimator, index):
+    assert names(estimator, index.search("design")) == ["Design", "Review"]
+    assert names(estimator, index.search("design review")) == ["Review"]
+    assert names(estimator, index.search("panel qa")) == ["QA"]
+    assert index.search("cipher review") == set()
+    assert index.search("missing qa") == set()
+
+
+def test_last_term_is_a_prefix(estimator, index):
+    assert names(estimator, index.search("otp prog")) == ["ROM Development"]
+    assert names(estimator, index.search("d")) == ["Design", "Driver", "ROM Development", "Review"]
+    # Only the last term: "prog" is not a word of any task
+    assert index.search("prog otp") == set()
+
+
+def test_single_characters_of_other_scripts(tmp_path):
+    from estimator import EffortEstimator
+
+    estimator = EffortEstimator(write_catalog(tmp_path / 'zh.csv', "subsystem,module,task,effort,description\n"
+                                                                   "Display,Panel,Driver,40,面板驱动\n"
+                                                                   "Display,Panel,QA,8,面板测试\n"))
+    index = TaskIndex(estimator)
+    assert names(estimator, index.search("面板")) == ["Driver", "QA"]
+    assert names(estimator, index.search("驱动")) == ["Driver"]
+    assert index.search("驱") and index.search("面板测") == index.search("测试")
+
+
+def test_modules_of(estimator, index):
+    assert index.modules_of(index.search("qa")) == {("Security", "SynaProt"), ("Display", "Panel")}
+    assert index.modules_of(()) == set()
+
+
+def test_reindex_after_catalog_changes(estimator, index):
+    estimator.apply_catalog_changes(
+        added=[(("Security", "Crypto", "Audit"), 3, "Key audit"),
+               (("Security", "Fuses", "Blow"), 6, "OTP fuses"),
+               (("Audio", "Codec", "Tune"), 4, "Codec tuning")],
+        removed=[("Display", "Backlight", "Control"), ("Security", "SynaProt", "QA")],
+        changed=[(("Security", "Crypto", "Design"), 20, "Key schedule")])
+    assert names(estimator, index.search("audit")) == ["Audit"]
+    assert names(estimator, index.search("otp")) == ["Blow", "ROM Development"]
+    assert names(estimator, index.search("codec")) == ["Tune"]
+    assert names(estimator, index.search("key")) == ["Audit", "Design"]
+    assert index.search("cipher") == set()
+    assert index.search("pwm") == set()
+    assert names(estimator, index.search("qa")) == ["QA"]
+    assert index.modules_of(index.search("qa")) == {("Display", "Panel")}
+    assert_matches_a_fresh_index(index, estimator)
+
+
+def test_renamed_task_and_dropped_subsystem(estimator, index):
+    # A hot reload sees a rename as the old task removed and a new one added
+    estimator.apply_catalog_changes(
+        added=[(("Security", "Crypto", "Redesign"), 20, "Cipher design")],
+        removed=[("Security", "Crypto", "Design")] +
+                [("Display", module, task) for module, task in
+                 [("Panel", "Driver"), ("Panel", "QA"), ("Backlight", "Control")]])
+    assert names(estimator, index.search("cipher")) == ["Redesign"]
+    assert index.search("redes") == index.search("cipher")
+    assert index.search("panel") == set()
+    assert "pwm" not in index._vocabulary
+    assert_matches_a_fresh_index(index, estimator)
+
+
+def test_index_follows_a_hot_reload(catalog, estimator, index):
+    from catalog_watch import CatalogWatcher
+
+    watcher = CatalogWatcher(estimator, catalog)
+    write_catalog(catalog, CATALOG.replace("Display,Panel,QA,8,Panel QA", "Display,Panel,Test,8,Panel smoke test")
+                  + "Audio,Codec,Tune,4,Codec tuning\n")
+    stat = os.stat(catalog)
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+    assert watcher.poll()
+    assert names(estimator, index.search("smoke")) == ["Test"]
+    assert names(estimator, index.search("tun")) == ["Tune"]
+    assert names(estimator, index.search("qa")) == ["QA"]
+    assert_matches_a_fresh_index(index, estimator)
+
+
+def test_settings_changes_leave_the_index_alone(estimator, index):
+    before = dict(index._postings)
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_module_state("Display", "Panel", False)
+    assert index._postings == before
+
+
+def test_closed_index_stops_following(estimator):
+    index = TaskIndex(estimator)
+    index.close()
+    estimator.apply_catalog_changes(added=[(("Audio", "Codec", "Tune"), 4, "Codec tuning")])
+    assert index.search("codec") == set()
+
+
+def shown_tasks(task_list):
+    return [task.name for module, task in task_list.rows if task is not None]
+
+
+def test_search_box_filters_the_task_lists(ui):
+    ui.search_var.set("qa")
+    ui.root.update()
+    security = ui.task_lists["Security"]
+    assert shown_tasks(security) == ["QA"]
+    assert [module.key for module, task in security.rows if task is None] == ["SynaProt"]
+    assert ui.search_count_label.cget('text') == "2 tasks"
+    # Other tabs are filtered when they are selected
+    ui.notebook.select(ui.tabs["Display"])
+    ui._build_selected_tab()
+    assert shown_tasks(ui.task_lists["Display"]) == ["QA"]
+
+    ui.search_var.set("")
+    ui.root.update()
+    assert shown_tasks(ui.task_lists["Display"]) == ["Driver", "QA", "Control"]
+    assert ui.search_count_label.cget('text') == ""
+
+
+def test_search_filter_follows_catalog_changes(ui):
+    ui.search_var.set("qa")
+    ui.root.update()
+    ui.apply_catalog_changes(added=[(("Security", "Crypto", "QA"), 3, "Cipher QA")])
+    ui.root.update()
+    assert shown_tasks(ui.task_lists["Security"]) == ["QA", "QA"]
+    assert ui.search_count_label.cget('text') == "3 tasks"
@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from sensitivity import RATIO_LEVELS, SensitivityAnalysis  # noqa: E402
+
+
+def reevaluated(estimator, driver):
+    """Project total change of a driver, by making the change on the estimator and undoing it"""
+    store = estimator.store
+    before = estimator.get_total_effort()
+    if driver['kind'] == 'ratio':
+        previous = store.get_ratio(driver['subsystem'], driver['module'], driver['task'])
+        level = float(driver['change'].split(" -> ")[1].rstrip("%"))
+        store.set_ratio(driver['subsystem'], driver['module'], driver['task'], level)
+        after = estimator.get_total_effort()
+        store.set_ratio(driver['subsystem'], driver['module'], driver['task'], previous)
+    elif driver['kind'] == 'module':
+        enabled = estimator._is_module_enabled(driver['subsystem'], driver['module'])
+        store.set_module_state(driver['subsystem'], driver['module'], not enabled)
+        after = estimator.get_total_effort()
+        store.set_module_state(driver['subsystem'], driver['module'], enabled)
+    else:
+        enabled = store.subsystem_states[driver['subsystem']]
+        store.set_subsystem_state(driver['subsystem'], not enabled)
+        after = estimator.get_total_effort()
+        store.set_subsystem_state(driver['subsystem'], enabled)
+    assert estimator.get_total_effort() == before
+    return after - before
+
+
+@pytest.fixture
+def configured(estimator):
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_module_state("Display", "Backlight", False)
+    estimator.set_manual_effort("Security", 9)
+    estimator.store.set_module_state("Security", "Other", True)
+    return estimator
+
+
+@pytest.mark.parametrize('per_task', [True, False])
+def test_ranked_deltas_match_direct_reevaluation(configured, per_task):
+    drivers = SensitivityAnalysis(configured).top_drivers(k=100, per_task=per_task)
+    assert drivers
+    for driver in drivers:
+        assert driver['delta'] == pytest.approx(reevaluated(configured, driver)), driver
+    magnitudes = [abs(driver['delta']) for driver in drivers]
+    assert magnitudes == sorted(magnitudes, reverse=True)
+
+
+def test_every_nonzero_change_is_ranked(configured):
+    drivers = SensitivityAnalysis(configured).top_drivers(k=100, per_task=False)
+    ratio_drivers = [driver for driver in drivers if driver['kind'] == 'ratio']
+    # Every task of an enabled module at every level other than its current ratio
+    live_tasks = [(subsystem.name, module.key, task.name)
+                  for subsystem in configured.subsystems for module in subsystem.modules for task in module.tasks
+                  if configured._is_module_enabled(subsystem.name, module.key)]
+    assert len(ratio_drivers) == len(live_tasks) * (len(RATIO_LEVELS) - 1)
+    assert {(driver['kind'], driver['module']) for driver in drivers if driver['kind'] == 'module'} == {
+        ('module', module.key) for subsystem in configured.subsystems for module in subsystem.modules
+        if module.get_total_effort() or not configured._is_module_enabled(subsystem.name, module.key)}
+
+
+def test_top_drivers_and_switched_off_subsystem(configured):
+    analysis = SensitivityAnalysis(configured)
+    top = analysis.top_drivers(k=2)
+    # Switching off Display or its only enabled module removes the same 48
+    assert {(driver['kind'], driver['subsystem'], driver['module']) for driver in top} == {
+        ('subsystem', "Display", None), ('module', "Display", "Panel")}
+    assert [driver['delta'] for driver in top] == pytest.approx([-48, -48])
+
+    configured.store.set_subsystem_state("Display", False)
+    drivers = analysis.top_drivers(k=100, per_task=False)
+    # Inside a switched-off subsystem only switching it back on changes the total
+    assert [driver['kind'] for driver in drivers if driver['subsystem'] == "Display"] == ['subsystem']
+    for driver in drivers:
+        assert driver['delta'] == pytest.approx(reevaluated(configured, driver))
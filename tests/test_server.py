@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from server import MAX_BODY, EstimationServer
+
+
+def request(method, target, body=b'', headers=()):
+    lines = [f"{method} {target} HTTP/1.1", "Host: test", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+
+async def read_response(reader):
+    """(status, headers, decoded JSON body) of one response"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers['content-length']))
+    return int(lines[0].split(' ')[1]), headers, json.loads(body)  # Strict JSON: no NaN or Infinity
+
+
+def exchange(server, data, responses=1):
+    """Send raw bytes to a running server; returns the responses and whether it then closed"""
+    async def run():
+        listener = await asyncio.start_server(server.serve_connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(data)
+            await writer.drain()
+            results = [await read_response(reader) for _ in range(responses)]
+            closed = await asyncio.wait_for(reader.read(1), 5) == b''
+            writer.close()
+            return results, closed
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def server(estimator):
+    return EstimationServer(estimator)
+
+
+def test_valid_estimate(server):
+    body = json.dumps({'id': "lean", 'modules': {"Display": {"Panel": False}}}).encode()
+    [(status, headers, payload)], closed = exchange(
+        server, request('POST', '/evaluate', body, ["Connection: close"]))
+    assert status == 200 and closed
+    assert headers['connection'] == 'close'
+    assert payload == {'id': "lean", 'total': 61, 'subsystems': {"Security": 49, "Display": 12}}
+
+
+def test_keep_alive_and_pipelining(server):
+    scenarios = json.dumps([{'id': 1}, {'id': 2, 'subsystems': {"Security": False}}]).encode()
+    data = (request('GET', '/total') + request('POST', '/evaluate?modules=1', scenarios)
+            + request('GET', '/missing') + request('GET', '/health', headers=["Connection: close"]))
+    responses, closed = exchange(server, data, responses=4)
+    assert [status for status, _, _ in responses] == [200, 200, 404, 200]
+    assert [headers['connection'] for _, headers, _ in responses] == ['keep-alive'] * 3 + ['close']
+    assert responses[0][2]['total'] == 109
+    assert [result['total'] for result in responses[1][2]] == [109, 60]
+    assert responses[1][2][1]['modules']["Display"]["Panel"] == 48
+    assert responses[3][2]['requests'] == 4
+    assert closed
+
+
+def test_malformed_request_line(server):
+    [(status, headers, payload)], closed = exchange(server, b"NONSENSE\r\n\r\n")
+    assert status == 400 and payload == {'error': "malformed request line"}
+    assert closed
+
+
+def test_oversized_body_is_refused_unread(server):
+    data = b"POST /evaluate HTTP/1.1\r\nContent-Length: %d\r\n\r\n{}" % (MAX_BODY + 1)
+    [(status, headers, _)], closed = exchange(server, data)
+    assert status == 413 and headers['connection'] == 'close'
+    assert closed
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5'])
+def test_invalid_content_length(server, length):
+    [(status, _, payload)], closed = exchange(server, b"POST /evaluate HTTP/1.1\r\nContent-Length: " + length
+                                                      + b"\r\n\r\n")
+    assert status == 400 and payload == {'error': "invalid Content-Length"}
+    assert closed
+
+
+@pytest.mark.parametrize('body', [
+    b'{"ratios": {"Security": {"Crypto": {"Design": 1e400}}}}',
+    b'{"ratios": {"Security": {"Crypto": {"Design": NaN}}}}',
+    b'{"ratios": {"Security": {"Crypto": {"Design": -Infinity}}}}',
+    b'[' * 100000,
+    b'{"id": "\xff"}',
+], ids=['overflow', 'nan', 'infinity', 'deep', 'not-utf-8'])
+def test_bad_json_is_a_bad_request_on_a_kept_connection(server, body):
+    responses, closed = exchange(server, request('POST', '/evaluate', body)
+                                 + request('GET', '/total', headers=["Connection: close"]), responses=2)
+    assert responses[0][0] == 400 and responses[0][2]['error'].startswith("invalid JSON")
+    assert responses[1][0] == 200
+
+
+def test_scenario_errors_and_overflow_stay_per_scenario(server):
+    scenarios = [{'id': 1, 'ratios': {"Security": {"Crypto": {"Missing": 25}}}},
+                 {'id': 2, 'ratios': {"Security": {"Crypto": {"Design": 1e308}}}, 'other': {"Display": 1.7e308},
+                  'modules': {"Display": {"Other": True}}},
+                 {'id': 3}]
+    [(status, _, payload)], _ = exchange(server, request('POST', '/evaluate', json.dumps(scenarios).encode(),
+                                                          ["Connection: close"]))
+    assert status == 200
+    assert [('error' in result) for result in payload] == [True, True, False]
+    assert payload[1]['error'] == "OverflowError: total out of range"
+
+
+def test_handler_errors_are_not_reported_as_content_length(server, monkeypatch):
+    def broken(method, target, body):
+        raise ValueError("bug")
+    monkeypatch.setattr(server, 'handle', broken)
+    [(status, _, payload)], closed = exchange(server, request('GET', '/total'))
+    assert status == 500 and payload == {'error': "internal error: ValueError"}
+    assert closed
+
+
+def test_wrong_method(server):
+    responses, _ = exchange(server, request('POST', '/total') + request('GET', '/evaluate', headers=[
+        "Connection: close"]), responses=2)
+    assert [status for status, _, _ in responses] == [405, 405]
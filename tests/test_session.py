@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from estimator import EffortEstimator
+from session import SessionJournal
+
+
+@pytest.fixture
+def session_path(tmp_path):
+    return str(tmp_path / 'effort_data.csv.session')
+
+
+def test_settings_survive_a_restart(catalog, session_path):
+    estimator = EffortEstimator(catalog)
+    journal = SessionJournal(estimator, session_path).open()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_module_state("Display", "Panel", False)
+    estimator.set_manual_effort("Security", 12, "reviews")
+    total = estimator.get_total_effort()
+    journal.close()
+
+    restored = EffortEstimator(catalog)
+    SessionJournal(restored, session_path).open()
+    assert restored.store.get_ratio("Security", "Crypto", "Design") == 25
+    assert not restored._is_module_enabled("Display", "Panel")
+    assert restored.find_node("Security", "Other").manual_effort == 12
+    assert restored.get_total_effort() == pytest.approx(total)
+
+
+def test_undo_and_redo(catalog, session_path):
+    estimator = EffortEstimator(catalog)
+    journal = SessionJournal(estimator, session_path).open()
+    base = estimator.get_total_effort()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    with journal.action():
+        estimator.store.set_module_state("Display", "Panel", False)
+        estimator.store.set_ratio("Display", "Backlight", "Control", 0)
+    changed = estimator.get_total_effort()
+
+    assert journal.undo()  # Both changes of the action at once
+    assert estimator._is_module_enabled("Display", "Panel")
+    assert estimator.store.get_ratio("Display", "Backlight", "Control") == 100
+    assert journal.undo()
+    assert estimator.get_total_effort() == pytest.approx(base)
+    assert not journal.undo()
+
+    assert journal.redo()
+    assert journal.redo()
+    assert not journal.redo()
+    assert estimator.get_total_effort() == pytest.approx(changed)
+
+    # A new change clears the redo history
+    journal.undo()
+    estimator.store.set_ratio("Security", "SynaProt", "QA", 60)
+    assert not journal.can_redo()
+
+
+def test_undone_state_is_what_gets_restored(catalog, session_path):
+    estimator = EffortEstimator(catalog)
+    journal = SessionJournal(estimator, session_path).open()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    journal.undo()
+    journal.close()
+
+    restored = EffortEstimator(catalog)
+    SessionJournal(restored, session_path).open()
+    assert restored.store.get_ratio("Security", "Crypto", "Design") == 100
+
+
+def test_torn_last_line_is_skipped_and_compacted(catalog, session_path):
+    estimator = EffortEstimator(catalog)
+    journal = SessionJournal(estimator, session_path).open()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    estimator.store.set_ratio("Display", "Panel", "QA", 60)
+    journal._file.flush()
+    # Simulate a crash in the middle of writing a record
+    with open(session_path, 'a', encoding='utf-8') as file:
+        file.write('["ratio", "Security", "Syna')
+
+    restored = EffortEstimator(catalog)
+    SessionJournal(restored, session_path).open()
+    assert restored.store.get_ratio("Security", "Crypto", "Design") == 25
+    assert restored.store.get_ratio("Display", "Panel", "QA") == 60
+    with open(session_path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])[0] == 'snapshot'
+
+
+def test_settings_of_nodes_no_longer_in_the_catalog_are_skipped(catalog, session_path, tmp_path):
+    estimator = EffortEstimator(catalog)
+    journal = SessionJournal(estimator, session_path).open()
+    estimator.store.set_ratio("Security", "Crypto", "Design", 25)
+    journal.close()
+
+    from conftest import write_catalog
+    smaller = write_catalog(tmp_path / 'smaller.csv', "subsystem,module,task,effort,description\n"
+                                                     "Display,Panel,Driver,40,Panel driver\n")
+    restored = EffortEstimator(smaller)
+    SessionJournal(restored, session_path).open()
+    assert restored.get_total_effort() == pytest.approx(40)
+
+
+def test_undo_keys_leave_text_fields_alone(ui, session_path):
+    from types import SimpleNamespace
+    from tkinter import ttk
+
+    ui.open_session(session_path)
+    ui.store.set_ratio("Security", "Crypto", "Design", 25)
+    entry = ttk.Entry(ui.root)
+    ui._on_undo_key(SimpleNamespace(widget=entry), ui.undo)
+    assert ui.store.get_ratio("Security", "Crypto", "Design") == 25
+    ui._on_undo_key(SimpleNamespace(widget=ui.root), ui.undo)
+    assert ui.store.get_ratio("Security", "Crypto", "Design") == 100
+    ui._on_undo_key(SimpleNamespace(widget=entry), ui.redo)
+    assert ui.store.get_ratio("Security", "Crypto", "Design") == 100
+    ui.session.close()
@@ -0,0 +1,58 @@
+import pytest
+
+from conftest import write_catalog
+from estimator import EffortEstimator
+
+HEADER = "subsystem,module,task,effort,description\n"
+
+
+@pytest.fixture
+def shards(tmp_path):
+    directory = tmp_path / 'shards'
+    directory.mkdir()
+    write_catalog(directory / 'a.csv', HEADER + "Security,Crypto,Design,20,x\nSecurity,Crypto,Review,5,y\n")
+    write_catalog(directory / 'b.csv', HEADER + "Security,Crypto,Audit,3,z\nDisplay,Panel,Driver,40,w\n")
+    return directory
+
+
+@pytest.mark.parametrize('options', [{'workers': 1}, {'workers': 2}, {'workers': 1, 'cache': True}])
+def test_shards_load_in_path_order(shards, options):
+    estimator = EffortEstimator(str(shards), **options)
+    assert estimator.subsystem_names == ["Security", "Display"]
+    crypto = estimator.find_node("Security", "Crypto")
+    assert [task.name for task in crypto.tasks] == ["Design", "Review", "Audit"]
+    assert estimator.get_total_effort() == pytest.approx(68)
+
+
+@pytest.mark.parametrize('options', [{'workers': 1}, {'workers': 2}, {'workers': 1, 'cache': True}])
+def test_conflict_fails_before_anything_is_built(shards, options):
+    write_catalog(shards / 'c.csv', HEADER + "Display,Panel,Driver,1,again\n")
+    estimator = EffortEstimator()
+    with pytest.raises(ValueError, match="Display/Panel/Driver"):
+        estimator.load_data_from_csv(str(shards), **options)
+    assert estimator.subsystems == []
+    assert estimator.node_index == {}
+
+
+def test_duplicates_inside_one_shard_load_as_in_a_single_file(shards, tmp_path):
+    rows = HEADER + "Audio,Codec,Tune,4,a\nAudio,Codec,Tune,9,b\n"
+    write_catalog(shards / 'c.csv', rows)
+    sharded = EffortEstimator(str(shards), workers=1)
+    single = EffortEstimator(write_catalog(tmp_path / 'single.csv', rows))
+    for estimator in (sharded, single):
+        assert [task.effort for task in estimator.find_node("Audio", "Codec").tasks] == [4, 9]
+        assert estimator.find_node("Audio", "Codec", "Tune").effort == 4  # The first row wins lookups
+
+
+def test_glob_pattern_selects_shards(shards):
+    estimator = EffortEstimator(str(shards / 'b*.csv'), workers=1)
+    assert estimator.subsystem_names == ["Security", "Display"]
+    assert estimator.get_total_effort() == pytest.approx(43)
+
+
+def test_file_named_like_a_glob_is_one_catalog(tmp_path):
+    from catalog_shards import is_sharded
+
+    path = write_catalog(tmp_path / 'effort[v2].csv', HEADER + "Display,Panel,Driver,40,w\n")
+    assert not is_sharded(path)
+    assert EffortEstimator(path).get_total_effort() == pytest.approx(40)
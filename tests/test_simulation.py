@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import write_catalog  # noqa: E402
+from estimator import EffortEstimator  # noqa: E402
+from simulation import PertSimulation  # noqa: E402
+
+HEADER = "subsystem,module,task,effort,description,optimistic,most_likely,pessimistic\n"
+
+
+def pert(low, mode, high):
+    """Mean, standard deviation and a quantile function of a Beta-PERT distribution"""
+    alpha = 1 + 4 * (mode - low) / (high - low)
+    beta = 1 + 4 * (high - mode) / (high - low)
+    mean = (low + 4 * mode + high) / 6
+    deviation = (high - low) * np.sqrt(alpha * beta / ((alpha + beta) ** 2 * (alpha + beta + 1)))
+    x = np.linspace(0, 1, 100001)
+    density = x ** (alpha - 1) * (1 - x) ** (beta - 1)
+    cdf = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2)))
+    return mean, deviation, lambda p: low + (high - low) * np.interp(p / 100, cdf / cdf[-1], x)
+
+
+@pytest.fixture
+def single(tmp_path):
+    return write_catalog(tmp_path / 'single.csv', HEADER + "Security,Crypto,Design,20,x,10,20,60\n")
+
+
+@pytest.fixture
+def many(tmp_path):
+    rows = "".join(f"Security,Crypto,T{i},20,x,10,20,60\n" for i in range(40))
+    rows += "Display,Panel,Driver,40,fixed,,,\n"
+    return write_catalog(tmp_path / 'many.csv', HEADER + rows)
+
+
+def test_single_task_percentiles_follow_the_pert_distribution(single):
+    result = PertSimulation.from_csv(single).run(draws=200000, seed=1)
+    _, _, quantile = pert(10, 20, 60)
+    for percentile in (50, 80, 95):
+        assert result['project'][f"P{percentile}"] == pytest.approx(quantile(percentile), abs=0.5)
+    assert result['subsystems']["Security"] == result['project']
+    assert result['modules'][("Security", "Crypto")] == result['project']
+
+
+def test_sum_of_tasks_centres_on_the_pert_mean(many):
+    result = PertSimulation.from_csv(many).run(draws=50000, seed=2)
+    mean, deviation, _ = pert(10, 20, 60)
+    security_mean, security_deviation = 40 * mean, np.sqrt(40) * deviation
+    security = result['subsystems']["Security"]
+    # 40 independent tasks: close to normal around the sum of the PERT means
+    assert security['P50'] == pytest.approx(security_mean, rel=0.01)
+    assert security['P80'] == pytest.approx(security_mean + 0.8416 * security_deviation, rel=0.01)
+    assert security['P95'] == pytest.approx(security_mean + 1.6449 * security_deviation, rel=0.01)
+    # Tasks without estimates keep their effort
+    assert result['subsystems']["Display"] == {'P50': 40, 'P80': 40, 'P95': 40}
+    assert result['project']['P50'] == pytest.approx(security_mean + 40, rel=0.01)
+
+
+def test_ratios_switches_and_manual_effort_apply(many):
+    estimator = EffortEstimator(many)
+    for i in range(40):
+        estimator.store.set_ratio("Security", "Crypto", f"T{i}", 25)
+    estimator.store.set_module_state("Display", "Panel", False)
+    estimator.set_manual_effort("Display", 7)
+    estimator.store.set_module_state("Display", "Other", True)
+    result = PertSimulation.from_csv(many, columns=estimator.to_columns(track=False)).run(draws=20000, seed=3)
+    mean, _, _ = pert(10, 20, 60)
+    assert result['subsystems']["Security"]['P50'] == pytest.approx(0.25 * 40 * mean, rel=0.01)
+    assert result['subsystems']["Display"]['P50'] == pytest.approx(7)
+    assert result['project']['P50'] == pytest.approx(0.25 * 40 * mean + 7, rel=0.01)
+
+
+def test_same_seed_same_result_with_any_number_of_workers(many):
+    simulation = PertSimulation.from_csv(many)
+    one = simulation.run(draws=25000, seed=4, workers=1)
+    assert simulation.run(draws=25000, seed=4, workers=1) == one
+    assert simulation.run(draws=25000, seed=4, workers=2) == one
+
+
+def test_invalid_estimates(tmp_path):
+    path = write_catalog(tmp_path / 'bad.csv', HEADER + "Security,Crypto,Design,20,x,30,20,60\n")
+    with pytest.raises(ValueError, match="Design"):
+        PertSimulation.from_csv(path)
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+LONG = "Cipher design covering key schedules, side-channel countermeasures and test vectors " * 4
+
+
+def security_list(ui):
+    ui.notebook.select(ui.tabs["Security"])
+    ui._build_selected_tab()
+    return ui.task_lists["Security"]
+
+
+def bound_slot(task_list, task_name):
+    task_list.render(force=True)
+    return next(slot for slot in task_list._slots
+                if slot['row'] is not None and task_list.rows[slot['row']][1] is not None
+                and task_list.rows[slot['row']][1].name == task_name)
+
+
+def test_long_description_is_cut_to_its_width(ui):
+    ui.find_node("Security", "Crypto", "Design").description = LONG
+    task_list = security_list(ui)
+    slot = bound_slot(task_list, "Design")
+    task_list._fit_description(slot, 300)
+    text = slot['description'].cget('text')
+    assert text.endswith("…") and LONG.startswith(text[:-1])
+    assert task_list._font.measure(text) <= 300
+    task_list._fit_description(slot, 100000)
+    assert slot['description'].cget('text') == LONG
+
+
+def test_short_description_is_shown_whole(ui):
+    task_list = security_list(ui)
+    slot = bound_slot(task_list, "Review")
+    task_list._fit_description(slot, 300)
+    assert slot['description'].cget('text') == "Design review"
+    task_list._show_description(slot, SimpleNamespace(x_root=0, y_root=0))
+    assert task_list._tooltip is None  # Nothing hidden, nothing to show
+
+
+def test_hover_shows_the_full_description(ui):
+    ui.find_node("Security", "Crypto", "Design").description = LONG
+    task_list = security_list(ui)
+    slot = bound_slot(task_list, "Design")
+    task_list._fit_description(slot, 300)
+    task_list._show_description(slot, SimpleNamespace(x_root=10, y_root=10))
+    assert task_list._tooltip_label.cget('text') == LONG
+    assert task_list._tooltip.winfo_ismapped() or task_list._tooltip.state() == 'normal'
+    task_list._hide_description()
+    assert task_list._tooltip.state() == 'withdrawn'